@@ -0,0 +1,5 @@
+"""Tooling for running and measuring the dayNN.py solutions."""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
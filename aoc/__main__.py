@@ -0,0 +1,453 @@
+import argparse
+import json
+import os
+import sys
+from contextlib import nullcontext, redirect_stdout
+from pathlib import Path
+
+from aoc import client
+from aoc.client import add_source_arguments
+from aoc.lazy import lazy_import
+from aoc.results import format_table
+
+# Only imported once a command uses them, so ask and stop (which go through
+# aoc.client) don't pay for numpy and the rest
+batch = lazy_import("aoc.batch")
+bench = lazy_import("aoc.bench")
+cache = lazy_import("aoc.cache")
+complexity = lazy_import("aoc.complexity")
+counters = lazy_import("aoc.counters")
+daemon = lazy_import("aoc.daemon")
+differential = lazy_import("aoc.differential")
+engines = lazy_import("aoc.engines")
+generate = lazy_import("aoc.generate")
+parallel = lazy_import("aoc.parallel")
+profiling = lazy_import("aoc.profiling")
+render = lazy_import("aoc.render")
+runner = lazy_import("aoc.runner")
+startup = lazy_import("aoc.startup")
+workers = lazy_import("aoc.workers")
+
+ALL_DAYS = list(range(1, 26))
+# the days that hand their work to aoc.workers
+WORKER_DAYS = [6, 7, 19, 21, 22]
+# the days with kernels for aoc.jit
+JIT_DAYS = [6, 15, 17, 22]
+
+
+def positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def input_source(args: argparse.Namespace) -> "runner.InputSource":
+    return runner.InputSource(
+        path=getattr(args, "input", None),
+        use_example=args.example,
+        generate_size=args.generate,
+        seed=args.seed,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time a single day")
+    run.add_argument("day", type=int)
+    run.add_argument("--part", type=int, choices=(1, 2))
+    add_source_arguments(run)
+    run.add_argument("--json", action="store_true", help="print results as JSON")
+    run.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=profiling.DEFAULT_DIRECTORY,
+        metavar="DIR",
+        help="profile each phase, saving pstats, collapsed stacks and allocation "
+        "sites (defaults to profiles/)",
+    )
+    run.add_argument(
+        "--counters",
+        action="store_true",
+        help="count the work each phase does (steps, cache hits, ...)",
+    )
+    run.add_argument(
+        "--render",
+        action="store_true",
+        help="draw the grids the solvers pass to aoc.render (off by default)",
+    )
+    run.add_argument(
+        "--render-to",
+        type=Path,
+        metavar="DIR",
+        help="save those drawings as PNG frames in DIR instead of printing them",
+    )
+    run.add_argument(
+        "--workers",
+        type=int,
+        nargs="?",
+        const=0,
+        metavar="N",
+        help="spread the days that split up their work (6, 7, 19, 21, 22) over N "
+        "threads, or processes without a free-threaded Python (defaults to all CPUs)",
+    )
+    run.add_argument(
+        "--engine",
+        help="solve with one of the day's registered engines, or 'auto' to pick "
+        "by input size (defaults to the reference solvers)",
+    )
+    run.add_argument(
+        "--stream",
+        action="store_true",
+        help="use the day's *_stream solvers over a memory-mapped input",
+    )
+
+    bench_parser = commands.add_parser(
+        "bench", help="time days repeatedly and compare against a baseline"
+    )
+    bench_parser.add_argument("days", type=int, nargs="*", default=ALL_DAYS)
+    bench_parser.add_argument("--trials", type=positive_int, default=5)
+    bench_parser.add_argument("--baseline", type=Path, default=bench.DEFAULT_BASELINE)
+    bench_parser.add_argument(
+        "--save", action="store_true", help="write these results as the new baseline"
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="flag parts that are this much slower than the baseline (0.2 = 20%%)",
+    )
+
+    speedup = commands.add_parser(
+        "speedup",
+        help="time the days that split up their work with and without workers",
+    )
+    speedup.add_argument("days", type=int, nargs="*", default=WORKER_DAYS)
+    speedup.add_argument("--workers", type=int, help="defaults to the number of CPUs")
+    speedup.add_argument("--trials", type=positive_int, default=3)
+    add_source_arguments(speedup, single_day=False)
+
+    jit = commands.add_parser(
+        "jit",
+        help="time the numba kernels against the plain Python solvers",
+    )
+    jit.add_argument("days", type=int, nargs="*", default=JIT_DAYS)
+    jit.add_argument("--trials", type=positive_int, default=3)
+    add_source_arguments(jit, single_day=False)
+
+    growth = commands.add_parser(
+        "complexity",
+        help="fit how a day's time and memory grow with the input's size",
+    )
+    growth.add_argument("day", type=int)
+    growth.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="generator sizes (defaults to 1/16 up to the real puzzle's size)",
+    )
+    growth.add_argument("--seed", type=int, default=0)
+    growth.add_argument("--trials", type=positive_int, default=1)
+    growth.add_argument(
+        "--target",
+        type=float,
+        default=complexity.DEFAULT_TARGET,
+        help="flag exponents over this (default %(default)s)",
+    )
+    growth.add_argument(
+        "--plot",
+        type=Path,
+        default=complexity.DEFAULT_DIRECTORY,
+        metavar="DIR",
+        help="where to save the plot (default %(default)s/)",
+    )
+
+    check = commands.add_parser(
+        "check", help="compare a day's engines on generated inputs"
+    )
+    check.add_argument("day", type=int)
+    check.add_argument(
+        "--engines",
+        nargs="+",
+        metavar="ENGINE",
+        help="defaults to the reference plus every engine that can run here",
+    )
+    check.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="generator sizes (defaults to a quarter of the real puzzle's size)",
+    )
+    check.add_argument("--seeds", type=int, default=3, help="inputs per size")
+
+    gen = commands.add_parser("gen", help="generate an input of any size")
+    gen.add_argument("day", type=int)
+    gen.add_argument(
+        "--size", type=int, help="defaults to roughly the real puzzle's size"
+    )
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("--output", "-o", type=Path, help="defaults to stdout")
+
+    run_all = commands.add_parser(
+        "run-all", help="solve every day at once across worker processes"
+    )
+    run_all.add_argument("days", type=int, nargs="*", default=ALL_DAYS)
+    run_all.add_argument("--workers", type=int, help="defaults to the number of CPUs")
+    add_source_arguments(run_all, single_day=False)
+
+    batch_parser = commands.add_parser(
+        "batch", help="solve one day for every input in a directory"
+    )
+    batch_parser.add_argument("day", type=int)
+    batch_parser.add_argument("directory", type=Path)
+    batch_parser.add_argument(
+        "--pattern", default="*", help="which files in the directory to solve"
+    )
+    batch_parser.add_argument("--output", "-o", type=Path, help="defaults to stdout")
+    batch_parser.add_argument(
+        "--format",
+        choices=("csv", "jsonl"),
+        help="defaults to jsonl for a .jsonl output and csv otherwise",
+    )
+    batch_parser.add_argument(
+        "--workers", type=int, help="defaults to the number of CPUs"
+    )
+    batch_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always solve instead of reusing answers from .aoc_cache",
+    )
+
+    serve = commands.add_parser(
+        "serve", help="keep every day loaded and solve requests from a socket"
+    )
+    serve.add_argument("--socket", type=Path, default=client.DEFAULT_SOCKET)
+
+    imports = commands.add_parser(
+        "imports", help="time importing each day from cold (python -X importtime)"
+    )
+    imports.add_argument("days", type=int, nargs="*", default=ALL_DAYS)
+    imports.add_argument(
+        "--budget",
+        type=float,
+        default=startup.DEFAULT_BUDGET,
+        help="fail if a day takes longer than this many seconds to import",
+    )
+
+    client.add_commands(commands)
+    return parser
+
+
+def run(args: argparse.Namespace) -> int:
+    # keep anything the solvers print out of the JSON
+    with redirect_stdout(sys.stderr if args.json else sys.stdout):
+        counters.enable(args.counters)
+        if args.workers is not None:
+            workers.enable(args.workers)
+        if args.render or args.render_to:
+            render.enable(directory=args.render_to)
+        profiler = None
+        if args.profile is not None:
+            profiler = profiling.Profiler(args.day, args.profile)
+        if args.stream:
+            measurements = runner.run_day_streaming(
+                args.day, input_source(args), args.part, profiler
+            )
+        else:
+            try:
+                measurements = runner.run_day(
+                    args.day,
+                    input_source(args),
+                    args.part,
+                    None if args.no_cache else cache.ResultCache(),
+                    profiler,
+                    args.engine,
+                    None if args.no_cache else cache.ModelCache(),
+                )
+            except engines.EngineError as exc:
+                print(exc, file=sys.stderr)
+                return 1
+    if profiler is not None:
+        print(
+            "\n\n".join(profiler.reports),
+            end="\n\n",
+            file=sys.stderr if args.json else sys.stdout,
+        )
+    if args.json:
+        print(json.dumps([result.as_dict() for result in measurements], indent=2))
+    else:
+        print(format_table(measurements))
+        if args.counters:
+            print("\n" + runner.format_counters(measurements))
+    return int(any(result.error for result in measurements))
+
+
+def run_bench(args: argparse.Namespace) -> int:
+    baseline = bench.load_baseline(args.baseline)
+    results = []
+    # the solvers like to print their grids
+    with redirect_stdout(sys.stderr):
+        for day in args.days:
+            day_results, skipped = bench.bench_day(day, args.trials)
+            results += day_results
+            for reason in skipped:
+                print(f"skipped {reason}")
+    print(bench.format_results(results, baseline))
+    if args.save:
+        bench.save_baseline(results, args.baseline)
+        print(f"saved baseline to {args.baseline}")
+        return 0
+    regressions = bench.find_regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.key}: {regression.baseline:.4f}s -> "
+            f"{regression.current:.4f}s ({regression.slowdown:+.1%})"
+        )
+    return int(bool(regressions))
+
+
+def run_speedup(args: argparse.Namespace) -> int:
+    worker_count = args.workers or os.cpu_count() or 1
+    source = input_source(args)
+    results = {}
+    # the solvers like to print their grids
+    with redirect_stdout(sys.stderr):
+        for day in args.days:
+            results[day] = bench.bench_workers(
+                day, source.read(day), worker_count, args.trials
+            )
+    print(bench.format_worker_results(results, worker_count))
+    return int(not all(same for rows in results.values() for *_, same in rows))
+
+
+def run_jit(args: argparse.Namespace) -> int:
+    source = input_source(args)
+    results = {}
+    # the solvers like to print their grids
+    with redirect_stdout(sys.stderr):
+        for day in args.days:
+            if args.example or args.generate is not None:
+                puzzle = source.read(day)
+            else:
+                # a generated input the size of the real one
+                puzzle = generate.generate(day, seed=args.seed)
+            results[day] = bench.bench_engine(day, puzzle, "numba", args.trials)
+    print(bench.format_jit_results(results))
+    return int(not all(row[-1] for rows in results.values() for row in rows))
+
+
+def run_complexity(args: argparse.Namespace) -> int:
+    sizes = args.sizes or complexity.default_sizes(args.day)
+    # the solvers like to print their grids
+    with redirect_stdout(sys.stderr):
+        samples = complexity.sample_day(args.day, sizes, args.seed, args.trials)
+    fits = complexity.fit(samples)
+    print(complexity.format_fits(fits, args.target))
+    path = complexity.plot(args.day, fits, args.plot / f"day{args.day:02}.png")
+    print(f"plot saved to {path}", file=sys.stderr)
+    return int(any(phase_fit.worse_than(args.target) for phase_fit in fits))
+
+
+def run_check(args: argparse.Namespace) -> int:
+    sizes = args.sizes or [max(1, generate.DEFAULT_SIZES[args.day] // 4)]
+    # the solvers like to print their grids
+    with redirect_stdout(sys.stderr):
+        comparisons = differential.compare_engines(
+            args.day, args.engines, sizes, args.seeds
+        )
+    if not comparisons:
+        print(f"day {args.day} doesn't have two engines to compare", file=sys.stderr)
+        return 1
+    print(differential.format_comparisons(comparisons))
+    return int(not all(comparison.agree for comparison in comparisons))
+
+
+def run_gen(args: argparse.Namespace) -> int:
+    puzzle = generate.generate(args.day, args.size, args.seed)
+    if args.output:
+        args.output.write_text(puzzle)
+    else:
+        print(puzzle)
+    return 0
+
+
+def run_run_all(args: argparse.Namespace) -> int:
+    results, wall_time = parallel.run_all(
+        args.days, input_source(args), args.workers, use_cache=not args.no_cache
+    )
+    print(parallel.format_summary(results, wall_time))
+    return int(any(result.error for result in results.values()))
+
+
+def run_imports(args: argparse.Namespace) -> int:
+    reports = [startup.import_report(day) for day in args.days]
+    print(startup.format_reports(reports, args.budget))
+    over = [report for report in reports if report.cumulative > args.budget]
+    for report in over:
+        print(
+            f"OVER BUDGET day {report.day}: {report.cumulative:.4f}s > "
+            f"{args.budget:.4f}s"
+        )
+    return int(bool(over))
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    paths = batch.list_inputs(args.directory, args.pattern)
+    if not paths:
+        print(f"no inputs in {args.directory} match {args.pattern}", file=sys.stderr)
+        return 1
+    output_format = args.format or (
+        "jsonl" if args.output and args.output.suffix == ".jsonl" else "csv"
+    )
+    # don't close stdout on the way out
+    output_file = args.output.open("w", newline="") if args.output else None
+    with output_file or nullcontext(sys.stdout) as output:
+        solved, failed, wall_time = batch.run_batch(
+            args.day,
+            paths,
+            batch.row_writer(output, output_format),
+            args.workers,
+            use_cache=not args.no_cache,
+        )
+    print(batch.format_throughput(solved, failed, wall_time), file=sys.stderr)
+    return int(bool(failed))
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in client.COMMANDS:
+        return client.main(argv)
+    args = build_parser().parse_args(argv)
+    match args.command:
+        case "run":
+            return run(args)
+        case "bench":
+            return run_bench(args)
+        case "speedup":
+            return run_speedup(args)
+        case "jit":
+            return run_jit(args)
+        case "complexity":
+            return run_complexity(args)
+        case "check":
+            return run_check(args)
+        case "gen":
+            return run_gen(args)
+        case "run-all":
+            return run_run_all(args)
+        case "batch":
+            return run_batch(args)
+        case "serve":
+            daemon.serve(args.socket)
+            return 0
+        case "imports":
+            return run_imports(args)
+    raise ValueError(f"Unknown command {args.command}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Solve one day for every input in a directory.
+
+The inputs are split into shards that a pool of worker processes works through,
+so each worker imports the day once and keeps its caches warm from one input to
+the next instead of paying for a fresh interpreter per file. Rows come back a
+shard at a time and are written out as soon as they arrive, so a long batch can
+be watched (or killed) part way through without losing what's done.
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable, TextIO
+
+from aoc.cache import ResultCache
+from aoc.results import format_answer
+from aoc.runner import WRITES_FILES, find_parts, load_day, solve_phase
+
+# shards per worker, so one slow shard doesn't leave the others idle at the end
+SHARDS_PER_WORKER = 4
+
+
+@dataclass
+class BatchRow:
+    input: str
+    part1: str | None
+    part2: str | None
+    # seconds spent solving both parts
+    time: float
+    error: str | None = None
+
+
+FIELDS = [field.name for field in fields(BatchRow)]
+
+
+def list_inputs(directory: Path, pattern: str = "*") -> list[Path]:
+    return sorted(path for path in directory.glob(pattern) if path.is_file())
+
+
+def shard(paths: list[Path], workers: int) -> list[list[Path]]:
+    size = max(1, -(-len(paths) // (workers * SHARDS_PER_WORKER)))
+    return [paths[start : start + size] for start in range(0, len(paths), size)]
+
+
+def solve_input(day: int, path: Path, cache: ResultCache | None) -> BatchRow:
+    row = BatchRow(str(path), None, None, 0.0)
+    try:
+        puzzle = path.read_text()
+    except OSError as exc:
+        row.error = f"{type(exc).__name__}: {exc}"
+        return row
+    module = load_day(day)
+    for phase, solve in find_parts(module).items():
+        if (day, phase) in WRITES_FILES:
+            continue
+        result = solve_phase(module, phase, solve, puzzle, None, cache)
+        row.time += result.wall_time
+        if result.error:
+            row.error = result.error
+        elif phase == "parts 1+2":
+            row.part1, row.part2 = (format_answer(part) for part in result.answer)
+        elif phase == "part 1":
+            row.part1 = format_answer(result.answer)
+        else:
+            row.part2 = format_answer(result.answer)
+    return row
+
+
+def solve_shard(day: int, paths: list[Path], use_cache: bool = True) -> list[BatchRow]:
+    cache = ResultCache() if use_cache else None
+    # nobody is going to see what the workers print
+    with redirect_stdout(io.StringIO()):
+        return [solve_input(day, path, cache) for path in paths]
+
+
+def run_batch(
+    day: int,
+    paths: list[Path],
+    write_row: Callable[[BatchRow], None],
+    workers: int | None = None,
+    use_cache: bool = True,
+) -> tuple[int, int, float]:
+    """Solve every input, handing each row to write_row as it comes in.
+
+    Returns how many inputs were solved, how many of those failed and the total
+    wall time.
+    """
+    workers = workers or os.cpu_count() or 1
+    solved = failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(solve_shard, day, paths, use_cache)
+            for paths in shard(paths, workers)
+        ]
+        for future in as_completed(futures):
+            for row in future.result():
+                write_row(row)
+                solved += 1
+                failed += bool(row.error)
+    return solved, failed, time.perf_counter() - start
+
+
+def row_writer(file: TextIO, format: str) -> Callable[[BatchRow], None]:
+    """Write rows to the file as CSV (with a header) or JSON lines"""
+    if format == "jsonl":
+
+        def write_json(row: BatchRow) -> None:
+            file.write(json.dumps(asdict(row)) + "\n")
+            file.flush()
+
+        return write_json
+    writer = csv.DictWriter(file, FIELDS)
+    writer.writeheader()
+
+    def write_csv(row: BatchRow) -> None:
+        writer.writerow(asdict(row))
+        file.flush()
+
+    return write_csv
+
+
+def format_throughput(solved: int, failed: int, wall_time: float) -> str:
+    rate = solved / wall_time if wall_time else 0.0
+    return (
+        f"{solved} inputs ({failed} failed) in {wall_time:.2f}s: "
+        f"{rate:.1f} inputs/s"
+    )
@@ -0,0 +1,270 @@
+"""Repeated timing runs with a stored JSON baseline to compare against"""
+
+import json
+import math
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+from aoc import ROOT, engines, jit, workers
+from aoc.results import tabulate
+from aoc.runner import (
+    WRITES_FILES,
+    default_input_path,
+    example_input,
+    find_parts,
+    load_day,
+    measure,
+    reset_caches,
+)
+
+DEFAULT_BASELINE = ROOT / "bench_baseline.json"
+
+
+@dataclass
+class BenchResult:
+    key: str
+    trials: int
+    median: float
+    p95: float
+    peak_rss: int
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BenchResult":
+        return cls(**data)
+
+
+@dataclass
+class Regression:
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.current / self.baseline - 1
+
+
+def p95(times: list[float]) -> float:
+    # nearest-rank percentile so it's always a value we actually measured
+    ordered = sorted(times)
+    return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+
+def bench_inputs(day: int) -> dict[str, str]:
+    """The example input plus the real one if it has been downloaded"""
+    module = load_day(day)
+    inputs = {"example": example_input(module)}
+    if (real_path := default_input_path(day)).exists():
+        inputs["real"] = real_path.read_text()
+    return inputs
+
+
+def bench_day(day: int, trials: int = 5) -> tuple[list[BenchResult], list[str]]:
+    """Time each part of a day over several trials.
+
+    Returns the results plus the keys that were skipped because they errored
+    (some examples only work for one part).
+    """
+    if trials < 1:
+        raise ValueError(f"need at least one trial, not {trials}")
+    module = load_day(day)
+    results = []
+    skipped = []
+    for input_name, puzzle in bench_inputs(day).items():
+        for phase, solve in find_parts(module).items():
+            if (day, phase) in WRITES_FILES:
+                continue
+            key = f"day{day:02}.{phase}.{input_name}"
+            measurements = []
+            for _ in range(trials):
+                reset_caches(module)
+                measurement = measure(phase, solve, puzzle)
+                if measurement.error:
+                    break
+                measurements.append(measurement)
+            if len(measurements) < trials:
+                skipped.append(f"{key}: {measurement.error}")
+                continue
+            times = [measurement.wall_time for measurement in measurements]
+            results.append(
+                BenchResult(
+                    key=key,
+                    trials=trials,
+                    median=statistics.median(times),
+                    p95=p95(times),
+                    peak_rss=max(measurement.peak_rss for measurement in measurements),
+                )
+            )
+    return results, skipped
+
+
+def save_baseline(results: list[BenchResult], path: Path = DEFAULT_BASELINE) -> None:
+    existing = load_baseline(path)
+    existing.update({result.key: result for result in results})
+    path.write_text(
+        json.dumps(
+            {key: asdict(result) for key, result in sorted(existing.items())},
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE) -> dict[str, BenchResult]:
+    if not path.exists():
+        return {}
+    return {
+        key: BenchResult.from_dict(data)
+        for key, data in json.loads(path.read_text()).items()
+    }
+
+
+def find_regressions(
+    results: list[BenchResult],
+    baseline: dict[str, BenchResult],
+    threshold: float = 0.2,
+    min_time: float = 0.001,
+) -> list[Regression]:
+    """Parts whose median got slower than the baseline by more than threshold.
+
+    Anything that runs faster than min_time in both runs is ignored since
+    it's mostly timer noise at that point.
+    """
+    regressions = []
+    for result in results:
+        if (previous := baseline.get(result.key)) is None:
+            continue
+        if max(result.median, previous.median) < min_time:
+            continue
+        if result.median > previous.median * (1 + threshold):
+            regressions.append(Regression(result.key, previous.median, result.median))
+    return regressions
+
+
+def format_results(results: list[BenchResult], baseline: dict[str, BenchResult]) -> str:
+    rows = [("benchmark", "median (s)", "p95 (s)", "baseline (s)", "change")]
+    for result in results:
+        if (previous := baseline.get(result.key)) is not None:
+            baseline_median = f"{previous.median:.4f}"
+            change = f"{result.median / previous.median - 1:+.1%}"
+        else:
+            baseline_median = change = "-"
+        rows.append(
+            (
+                result.key,
+                f"{result.median:.4f}",
+                f"{result.p95:.4f}",
+                baseline_median,
+                change,
+            )
+        )
+    return tabulate(rows)
+
+
+def best_time(
+    module: ModuleType, solve: Callable[[str], Any], puzzle: str, trials: int
+) -> tuple[Any, float]:
+    """The answer and the fastest of several runs.
+
+    Every run starts cold, caches and pool both, so a process pool's answer
+    includes what it costs to start the workers: that's the price of
+    falling back to processes.
+    """
+    if trials < 1:
+        raise ValueError(f"need at least one trial, not {trials}")
+    times = []
+    for _ in range(trials):
+        reset_caches(module)
+        workers.shutdown()
+        start = time.perf_counter()
+        answer = solve(puzzle)
+        times.append(time.perf_counter() - start)
+    return answer, min(times)
+
+
+def bench_workers(
+    day: int, puzzle: str, worker_count: int, trials: int = 3
+) -> list[tuple[str, float, float, bool]]:
+    """(phase, serial time, time with the workers, whether the answers match)
+    for each part of a day that hands its work to aoc.workers"""
+    module = load_day(day)
+    rows = []
+    for phase, solve in find_parts(module).items():
+        workers.enable(1)
+        serial_answer, serial_time = best_time(module, solve, puzzle, trials)
+        workers.enable(worker_count)
+        answer, parallel_time = best_time(module, solve, puzzle, trials)
+        rows.append((phase, serial_time, parallel_time, answer == serial_answer))
+    workers.enable(1)
+    return rows
+
+
+def format_worker_results(
+    results: dict[int, list[tuple[str, float, float, bool]]], worker_count: int
+) -> str:
+    build = "free-threaded" if workers.free_threaded() else "GIL"
+    pool = "threads" if workers.free_threaded() else "processes"
+    table = [("day", "phase", "serial (s)", f"{worker_count} {pool} (s)", "speedup")]
+    for day, rows in results.items():
+        for phase, serial_time, parallel_time, same in rows:
+            table.append(
+                (
+                    f"{day:02}",
+                    phase,
+                    f"{serial_time:.4f}",
+                    f"{parallel_time:.4f}",
+                    f"{serial_time / parallel_time:.2f}x"
+                    + ("" if same else "  ANSWERS DIFFER"),
+                )
+            )
+    return f"Python {sys.version.split()[0]}, {build} build\n" + tabulate(table)
+
+
+def bench_engine(
+    day: int, puzzle: str, name: str, trials: int = 3
+) -> list[tuple[str, float, float, float, bool]]:
+    """(phase, reference time, the engine's first run, its fastest run, whether
+    the answers match) for each part of a day that has the named engine. The
+    first run is kept apart since that's when a JIT compiles."""
+    module = load_day(day)
+    rows = []
+    for phase, solve in find_parts(module).items():
+        registered = engines.engines_for(module.__name__, phase)
+        if name not in registered:
+            continue
+        reference_answer, reference_time = best_time(module, solve, puzzle, trials)
+        _, first_time = best_time(module, registered[name].solve, puzzle, 1)
+        answer, engine_time = best_time(module, registered[name].solve, puzzle, trials)
+        rows.append(
+            (phase, reference_time, first_time, engine_time, answer == reference_answer)
+        )
+    return rows
+
+
+def format_jit_results(
+    results: dict[int, list[tuple[str, float, float, float, bool]]],
+) -> str:
+    if (version := jit.version()) is not None:
+        heading = f"numba {version}"
+    else:
+        heading = "numba isn't installed, so the kernels ran as plain Python"
+    table = [("day", "phase", "python (s)", "first run (s)", "numba (s)", "speedup")]
+    for day, rows in results.items():
+        for phase, reference_time, first_time, engine_time, same in rows:
+            table.append(
+                (
+                    f"{day:02}",
+                    phase,
+                    f"{reference_time:.4f}",
+                    f"{first_time:.4f}",
+                    f"{engine_time:.4f}",
+                    f"{reference_time / engine_time:.2f}x"
+                    + ("" if same else "  ANSWERS DIFFER"),
+                )
+            )
+    return heading + "\n" + tabulate(table)
@@ -0,0 +1,305 @@
+"""On-disk caches of answers and of parsed inputs.
+
+ResultCache keeps answers keyed by the input and the solver's source code.
+Each entry is a small JSON file named after the day, a fingerprint of the
+day's source (plus any local modules it uses) and a hash of the input. Editing
+the day changes the fingerprint, so its old entries are never hit again and are
+cleared out the next time that day misses. Once the directory grows past
+max_bytes the least recently used entries are evicted.
+
+ModelCache keeps what a day's parse_input() returned, keyed by the input and a
+fingerprint of just parse_input() and what it uses, so editing a solver still
+skips the parse. Each entry is a directory holding the model pickled with its
+NumPy arrays (grids included) taken out and saved as .npy files next to it,
+which are memory-mapped back in read-only rather than read.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from types import ModuleType
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from aoc import ROOT
+from aoc.grid import Grid
+
+DEFAULT_DIRECTORY = ROOT / ".aoc_cache"
+DEFAULT_MAX_BYTES = 64 * 2**20
+DEFAULT_MODEL_DIRECTORY = DEFAULT_DIRECTORY / "models"
+DEFAULT_MODEL_MAX_BYTES = 256 * 2**20
+
+MISS = object()
+
+
+def local_modules(module: ModuleType) -> list[ModuleType]:
+    """The module plus anything from this repo it imports directly"""
+    found = {module.__name__: module}
+    for value in vars(module).values():
+        if not isinstance(value, ModuleType):
+            value = inspect.getmodule(value)
+        if value is None or value.__name__ in found:
+            continue
+        if (filename := getattr(value, "__file__", None)) is None:
+            continue
+        # the day files and the aoc package, not a virtualenv that happens to
+        # live in the repo
+        if Path(filename).resolve().parent in (ROOT, ROOT / "aoc"):
+            found[value.__name__] = value
+    return [found[name] for name in sorted(found)]
+
+
+def local_file(value: Any) -> Path | None:
+    """The file in this repo that defines value (a module, class or function)"""
+    module = value if isinstance(value, ModuleType) else inspect.getmodule(value)
+    if (filename := getattr(module, "__file__", None)) is None:
+        return None
+    path = Path(filename).resolve()
+    return path if path.parent in (ROOT, ROOT / "aoc") else None
+
+
+def parser_fingerprint(module: ModuleType) -> str:
+    """A hash of module.parse_input()'s source, the day's own functions it
+    calls, the constants it reads and the files of anything else from this
+    repo it uses (like aoc.grid)"""
+    digest = hashlib.sha256(module.__name__.encode())
+    pending = [module.parse_input]
+    seen: set[str] = set()
+    while pending:
+        func = pending.pop()
+        digest.update(inspect.getsource(func).encode())
+        for name in func.__code__.co_names:
+            if name in seen or (value := vars(module).get(name)) is None:
+                continue
+            seen.add(name)
+            if inspect.isfunction(value) and value.__module__ == module.__name__:
+                pending.append(value)
+            elif isinstance(value, ModuleType) or callable(value):
+                if (path := local_file(value)) is not None:
+                    digest.update(path.read_bytes())
+            elif isinstance(value, (set, frozenset)):
+                # sets of strings come out in a different order every run
+                digest.update(f"{name}={sorted(value, key=repr)!r}".encode())
+            else:
+                digest.update(f"{name}={value!r}".encode())
+    return digest.hexdigest()[:16]
+
+
+def solver_fingerprint(module: ModuleType) -> str:
+    digest = hashlib.sha256()
+    for local in local_modules(module):
+        digest.update(local.__name__.encode())
+        digest.update(Path(local.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    def __init__(
+        self, directory: Path = DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(
+        self,
+        module: ModuleType,
+        phase: str,
+        puzzle: str,
+        kwargs: dict[str, Any] | None = None,
+    ) -> Path:
+        digest = hashlib.sha256(puzzle.encode())
+        digest.update(phase.encode())
+        digest.update(json.dumps(kwargs or {}, sort_keys=True).encode())
+        return self.directory / (
+            f"{module.__name__}-{solver_fingerprint(module)}-{digest.hexdigest()}.json"
+        )
+
+    def get(
+        self,
+        module: ModuleType,
+        phase: str,
+        puzzle: str,
+        kwargs: dict[str, Any] | None = None,
+    ) -> Any:
+        """The cached answer, or MISS"""
+        path = self.path(module, phase, puzzle, kwargs)
+        try:
+            answer = json.loads(path.read_text())["answer"]
+        except (OSError, ValueError, KeyError):
+            self.purge_stale(module)
+            return MISS
+        # bump the modification time so eviction knows it was used recently
+        os.utime(path)
+        return answer
+
+    def put(
+        self,
+        module: ModuleType,
+        phase: str,
+        puzzle: str,
+        answer: Any,
+        kwargs: dict[str, Any] | None = None,
+    ) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(module, phase, puzzle, kwargs)
+        # write then rename so a reader in another process never sees half a file
+        try:
+            entry = json.dumps({"phase": phase, "answer": answer})
+        except TypeError:
+            # not something we know how to store, just solve it next time too
+            return
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(entry)
+        os.replace(temporary, path)
+        self.evict()
+
+    def purge_stale(self, module: ModuleType) -> None:
+        """Remove entries written by an older version of the module"""
+        current = f"{module.__name__}-{solver_fingerprint(module)}-"
+        for path in self.directory.glob(f"{module.__name__}-*.json"):
+            if not path.name.startswith(current):
+                path.unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # another process got to it first
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+class StoredArray(NamedTuple):
+    """Where an array went while its model was pickled"""
+
+    index: int
+
+
+class StoredGrid(NamedTuple):
+    array: StoredArray
+
+
+class StoredTuple(NamedTuple):
+    """A tuple that had arrays in it, so loading only has to look through
+    these rather than every tuple of ints"""
+
+    items: tuple[Any, ...]
+
+
+def take_arrays(model: Any, arrays: list[np.ndarray]) -> Any:
+    """The model with its arrays (anywhere inside its tuples) moved to arrays"""
+    if isinstance(model, Grid):
+        return StoredGrid(take_arrays(model.array, arrays))
+    if isinstance(model, np.ndarray):
+        arrays.append(model)
+        return StoredArray(len(arrays) - 1)
+    if isinstance(model, tuple):
+        items = tuple(take_arrays(item, arrays) for item in model)
+        if any(new is not old for new, old in zip(items, model)):
+            return StoredTuple(items)
+    return model
+
+
+def put_arrays(model: Any, arrays: list[np.ndarray]) -> Any:
+    if isinstance(model, StoredGrid):
+        return Grid(put_arrays(model.array, arrays))
+    if isinstance(model, StoredArray):
+        return arrays[model.index]
+    if isinstance(model, StoredTuple):
+        return tuple(put_arrays(item, arrays) for item in model.items)
+    return model
+
+
+class ModelCache:
+    def __init__(
+        self,
+        directory: Path = DEFAULT_MODEL_DIRECTORY,
+        max_bytes: int = DEFAULT_MODEL_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, module: ModuleType, puzzle: str) -> Path:
+        digest = hashlib.sha256(puzzle.encode()).hexdigest()
+        return self.directory / (
+            f"{module.__name__}-{parser_fingerprint(module)}-{digest}"
+        )
+
+    def get(self, module: ModuleType, puzzle: str) -> Any:
+        """The model parse_input() made from this puzzle last time, or MISS"""
+        path = self.path(module, puzzle)
+        try:
+            stored = pickle.loads((path / "model.pickle").read_bytes())
+            arrays = [
+                # a plain read-only array that happens to be backed by the file
+                np.load(path / f"{index}.npy", mmap_mode="r").view(np.ndarray)
+                for index in range(stored["arrays"])
+            ]
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+            self.purge_stale(module)
+            return MISS
+        os.utime(path)
+        return put_arrays(stored["model"], arrays)
+
+    def put(self, module: ModuleType, puzzle: str, model: Any) -> None:
+        path = self.path(module, puzzle)
+        arrays: list[np.ndarray] = []
+        try:
+            stored = pickle.dumps(
+                {"model": take_arrays(model, arrays), "arrays": len(arrays)},
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # not something we know how to store, just parse it next time too
+            return
+        # build the entry off to the side and rename it into place, so a reader
+        # in another process never sees half of one
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.mkdir(parents=True, exist_ok=True)
+        for index, array in enumerate(arrays):
+            np.save(temporary / f"{index}.npy", array)
+        (temporary / "model.pickle").write_bytes(stored)
+        try:
+            os.replace(temporary, path)
+        except OSError:
+            # someone else stored it first
+            shutil.rmtree(temporary, ignore_errors=True)
+        self.evict()
+
+    def purge_stale(self, module: ModuleType) -> None:
+        """Remove models made by an older version of parse_input()"""
+        current = f"{module.__name__}-{parser_fingerprint(module)}-"
+        for path in self.directory.glob(f"{module.__name__}-*"):
+            if not path.name.startswith(current) and not path.name.endswith(".tmp"):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.directory.iterdir():
+            if path.name.endswith(".tmp"):
+                continue
+            try:
+                size = sum(item.stat().st_size for item in path.iterdir())
+                entries.append((path.stat().st_mtime, size, path))
+            except FileNotFoundError:
+                # another process got to it first
+                continue
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,106 @@
+"""The client side of aoc.daemon: `python -m aoc ask` and `python -m aoc stop`.
+
+All these do is send a line of JSON over a socket and print what comes back,
+so they get a parser of their own and import nothing but the standard library
+and aoc.results. The rest of the CLI pulls in numpy and every day's tooling,
+which would cost the client more than the daemon saves it.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from aoc import ROOT
+from aoc.results import Measurement, format_table
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / f"aoc-{os.getuid()}.sock"
+
+COMMANDS = ("ask", "stop")
+
+
+def request(
+    payload: dict[str, Any], socket_path: Path = DEFAULT_SOCKET
+) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(payload).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def add_source_arguments(
+    parser: argparse.ArgumentParser, single_day: bool = True
+) -> None:
+    source = parser.add_mutually_exclusive_group()
+    if single_day:
+        source.add_argument("--input", type=Path, help="defaults to dayXX.txt")
+    source.add_argument(
+        "--example", action="store_true", help="use the day's TEST_INPUT"
+    )
+    source.add_argument(
+        "--generate",
+        type=int,
+        metavar="SIZE",
+        help="use a generated input of this size (see aoc.generate)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for --generate")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always solve instead of reusing answers from .aoc_cache",
+    )
+
+
+def add_commands(commands: Any) -> None:
+    """Add ask and stop to the subparsers of a parser"""
+    ask = commands.add_parser("ask", help="have a running daemon solve a day")
+    ask.add_argument("day", type=int)
+    ask.add_argument("--part", type=int, choices=(1, 2))
+    ask.add_argument("--socket", type=Path, default=DEFAULT_SOCKET)
+    ask.add_argument("--json", action="store_true", help="print results as JSON")
+    add_source_arguments(ask)
+
+    stop = commands.add_parser("stop", help="stop a running daemon")
+    stop.add_argument("--socket", type=Path, default=DEFAULT_SOCKET)
+
+
+def run_ask(args: argparse.Namespace) -> int:
+    payload = {
+        "command": "solve",
+        "day": args.day,
+        "part": args.part,
+        "no_cache": args.no_cache,
+    }
+    if args.example:
+        payload["example"] = True
+    elif args.generate is not None:
+        payload |= {"generate": args.generate, "seed": args.seed}
+    else:
+        # read it here since the daemon may not share our working directory
+        path = args.input or ROOT / f"day{args.day:02}.txt"
+        payload["input"] = path.read_text()
+    response = request(payload, args.socket)
+    if "error" in response:
+        print(response["error"], file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(response["results"], indent=2))
+    else:
+        print(format_table([Measurement(**result) for result in response["results"]]))
+    return int(any(result["error"] for result in response["results"]))
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    add_commands(parser.add_subparsers(dest="command", required=True))
+    args = parser.parse_args(argv)
+    if args.command == "stop":
+        request({"command": "stop"}, args.socket)
+        return 0
+    return run_ask(args)
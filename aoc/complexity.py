@@ -0,0 +1,259 @@
+"""How a day's running time and memory grow with the size of its input.
+
+Each part is run on generated inputs at a series of sizes, and a power law
+(cost = c * n ** k, with n the input's length in characters) is fitted to the
+timings and to the peak memory allocated, by least squares on a log-log
+scale. The exponent k is what to look at: around 1 is linear, 2 is something
+quadratic hiding in there, and anything over the target gets flagged. Since n
+counts characters, a grid's exponents are per square, not per side.
+
+Time and memory are measured on separate runs, since tracemalloc slows the
+solver down a lot, and the plot (log-log, one color per part, with the fitted
+lines) is drawn with PIL.
+"""
+
+import math
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+import numpy as np
+
+from aoc import ROOT, generate
+from aoc.bench import best_time
+from aoc.lazy import lazy_import
+from aoc.results import tabulate
+from aoc.runner import WRITES_FILES, find_parts, load_day, reset_caches
+
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+
+# exponents over this get flagged (a bit of headroom over linear for sorting,
+# heaps and the noise in small timings)
+DEFAULT_TARGET = 1.3
+# fractions of each day's DEFAULT_SIZES to run at
+DEFAULT_SCALES = (1 / 16, 1 / 8, 1 / 4, 1 / 2, 1)
+DEFAULT_DIRECTORY = ROOT / "complexity"
+
+PLOT_WIDTH, PLOT_HEIGHT, MARGIN = 480, 360, 50
+COLORS = [(31, 119, 180), (255, 127, 14), (44, 160, 44), (214, 39, 40)]
+
+
+@dataclass
+class Sample:
+    phase: str
+    size: int
+    # the input's length in characters
+    n: int
+    seconds: float = math.nan
+    peak_bytes: int = 0
+    error: str | None = None
+
+
+@dataclass
+class Fit:
+    phase: str
+    samples: list[Sample] = field(default_factory=list)
+    time_exponent: float = math.nan
+    memory_exponent: float = math.nan
+
+    def worse_than(self, target: float) -> list[str]:
+        """What grows faster than n ** target"""
+        return [
+            name
+            for name, exponent in (
+                ("time", self.time_exponent),
+                ("memory", self.memory_exponent),
+            )
+            if exponent > target
+        ]
+
+
+def default_sizes(day: int) -> list[int]:
+    full = generate.DEFAULT_SIZES[day]
+    return sorted({max(1, round(full * scale)) for scale in DEFAULT_SCALES})
+
+
+def peak_memory(module: ModuleType, solve: Callable[[str], Any], puzzle: str) -> int:
+    """The most memory the solver had allocated at once, in bytes"""
+    reset_caches(module)
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    try:
+        solve(puzzle)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    return max(0, peak - before)
+
+
+def sample_day(
+    day: int, sizes: list[int], seed: int = 0, trials: int = 1
+) -> list[Sample]:
+    module = load_day(day)
+    samples = []
+    for size in sizes:
+        puzzle = generate.generate(day, size, seed)
+        parts = find_parts(module, generate.solver_kwargs(day, size))
+        for phase, solve in parts.items():
+            if (day, phase) in WRITES_FILES or (day, phase) in generate.UNSCALED:
+                continue
+            sample = Sample(phase, size, len(puzzle))
+            try:
+                _, sample.seconds = best_time(module, solve, puzzle, trials)
+                sample.peak_bytes = peak_memory(module, solve, puzzle)
+            except Exception as exc:
+                sample.error = f"{type(exc).__name__}: {exc}"
+            samples.append(sample)
+    return samples
+
+
+def power_law(xs: list[float], ys: list[float]) -> float:
+    """k in y = c * x ** k, fitted to the points that can go on a log scale"""
+    points = [(x, y) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len({x for x, _ in points}) < 2:
+        return math.nan
+    logs = np.log(np.array(points, dtype=float))
+    exponent, _ = np.polyfit(logs[:, 0], logs[:, 1], 1)
+    return float(exponent)
+
+
+def fit(samples: list[Sample]) -> list[Fit]:
+    fits: dict[str, Fit] = {}
+    for sample in samples:
+        fits.setdefault(sample.phase, Fit(sample.phase)).samples.append(sample)
+    for phase_fit in fits.values():
+        good = [sample for sample in phase_fit.samples if sample.error is None]
+        ns = [sample.n for sample in good]
+        phase_fit.time_exponent = power_law(ns, [sample.seconds for sample in good])
+        phase_fit.memory_exponent = power_law(
+            ns, [sample.peak_bytes for sample in good]
+        )
+    return list(fits.values())
+
+
+def format_fits(fits: list[Fit], target: float = DEFAULT_TARGET) -> str:
+    rows = [
+        (
+            "phase",
+            "n",
+            "largest (s)",
+            "time ~ n^k",
+            "largest (MiB)",
+            "memory ~ n^k",
+            "",
+        )
+    ]
+    for phase_fit in fits:
+        good = [sample for sample in phase_fit.samples if sample.error is None]
+        errors = [sample for sample in phase_fit.samples if sample.error is not None]
+        if not good:
+            rows.append((phase_fit.phase, "", "", "", "", "", errors[0].error or ""))
+            continue
+        largest = max(good, key=lambda sample: sample.n)
+        notes = [
+            f"{name} worse than n^{target:g}" for name in phase_fit.worse_than(target)
+        ]
+        if errors:
+            notes.append(f"{len(errors)} sizes failed")
+        rows.append(
+            (
+                phase_fit.phase,
+                f"{min(sample.n for sample in good)}-{largest.n}",
+                f"{largest.seconds:.4f}",
+                f"{phase_fit.time_exponent:.2f}",
+                f"{largest.peak_bytes / 2**20:.1f}",
+                f"{phase_fit.memory_exponent:.2f}",
+                ", ".join(notes),
+            )
+        )
+    return tabulate(rows)
+
+
+def draw_panel(
+    draw: "ImageDraw.ImageDraw",
+    left: int,
+    title: str,
+    fits: list[Fit],
+    value: Callable[[Sample], float],
+    exponent: Callable[[Fit], float],
+) -> None:
+    """One log-log chart, with its top left corner at (left, 0)"""
+    points = [
+        (index, math.log10(sample.n), math.log10(value(sample)))
+        for index, phase_fit in enumerate(fits)
+        for sample in phase_fit.samples
+        if sample.error is None and value(sample) > 0
+    ]
+    draw.text((left + MARGIN, 10), title, fill="black")
+    box = (left + MARGIN, MARGIN, left + PLOT_WIDTH - 10, PLOT_HEIGHT - MARGIN)
+    draw.rectangle(box, outline="black")
+    if not points:
+        return
+    x_low = min(x for _, x, _ in points)
+    x_high = max(max(x for _, x, _ in points), x_low + 1e-9)
+    y_low = min(y for _, _, y in points)
+    y_high = max(max(y for _, _, y in points), y_low + 1e-9)
+
+    def position(x: float, y: float) -> tuple[float, float]:
+        return (
+            box[0] + 10 + (x - x_low) / (x_high - x_low) * (box[2] - box[0] - 20),
+            box[3] - 10 - (y - y_low) / (y_high - y_low) * (box[3] - box[1] - 20),
+        )
+
+    draw.text((box[0], box[3] + 5), f"n = 10^{x_low:.1f}", fill="black")
+    draw.text((box[2] - 70, box[3] + 5), f"10^{x_high:.1f}", fill="black")
+    draw.text((left + 5, box[1]), f"10^{y_high:.1f}", fill="black")
+    draw.text((left + 5, box[3] - 10), f"10^{y_low:.1f}", fill="black")
+    for index, phase_fit in enumerate(fits):
+        color = COLORS[index % len(COLORS)]
+        mine = [(x, y) for which, x, y in points if which == index]
+        for x, y in mine:
+            cx, cy = position(x, y)
+            draw.ellipse((cx - 3, cy - 3, cx + 3, cy + 3), fill=color)
+        if len(mine) >= 2 and not math.isnan(exponent(phase_fit)):
+            # the fitted line, through the middle of the points
+            k = exponent(phase_fit)
+            x_mid = sum(x for x, _ in mine) / len(mine)
+            y_mid = sum(y for _, y in mine) / len(mine)
+            ends = [min(x for x, _ in mine), max(x for x, _ in mine)]
+            draw.line(
+                [position(x, y_mid + k * (x - x_mid)) for x in ends],
+                fill=color,
+                width=2,
+            )
+        draw.text(
+            (box[0] + 10, box[1] + 5 + 12 * index),
+            f"{phase_fit.phase}: k = {exponent(phase_fit):.2f}",
+            fill=color,
+        )
+
+
+def plot(day: int, fits: list[Fit], path: Path) -> Path:
+    image = Image.new("RGB", (PLOT_WIDTH * 2, PLOT_HEIGHT), "white")
+    draw = ImageDraw.Draw(image)
+    draw_panel(
+        draw,
+        0,
+        f"day {day}: time (s)",
+        fits,
+        lambda sample: sample.seconds,
+        lambda phase_fit: phase_fit.time_exponent,
+    )
+    draw_panel(
+        draw,
+        PLOT_WIDTH,
+        f"day {day}: peak memory (bytes)",
+        fits,
+        lambda sample: sample.peak_bytes,
+        lambda phase_fit: phase_fit.memory_exponent,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image.save(path)
+    return path
@@ -0,0 +1,41 @@
+"""Count the work a solver does, not just how long it takes.
+
+Counting is off unless the runner turns it on (run --counters). Hot loops keep
+their tallies in local variables and hand them over once at the end behind an
+ENABLED check, so with counting off the cost is a single attribute lookup per
+call rather than per step:
+
+    if counters.ENABLED:
+        counters.add("day06.steps", steps)
+
+Adding takes a lock, since with free-threaded workers (see aoc.workers) two
+threads can hand theirs over at once.
+
+Names are "<where>.<what>", e.g. "day07.combinations" or "search.dijkstra.pops".
+"""
+
+import threading
+
+ENABLED = False
+
+_counts: dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def enable(enabled: bool = True) -> None:
+    global ENABLED
+    ENABLED = enabled
+
+
+def add(name: str, amount: int = 1) -> None:
+    if ENABLED:
+        with _lock:
+            _counts[name] = _counts.get(name, 0) + amount
+
+
+def reset() -> None:
+    _counts.clear()
+
+
+def snapshot() -> dict[str, int]:
+    return dict(sorted(_counts.items()))
@@ -0,0 +1,111 @@
+"""A long-running solver process that clients talk to over a Unix socket.
+
+Starting Python and importing networkx, numpy and PIL costs far more than
+solving a small input, so the daemon pays for that once and keeps every day
+loaded. Each request is one line of JSON and gets one line of JSON back:
+
+    {"command": "solve", "day": 6, "part": 2, "input": "...", "no_cache": false}
+    {"command": "solve", "day": 6, "example": true}
+    {"command": "solve", "day": 6, "generate": 500, "seed": 1}
+    {"command": "ping"}
+    {"command": "stop"}
+
+Days whose source changes while the daemon is running are reloaded before
+they're next used.
+"""
+
+import importlib
+import io
+import json
+import os
+import socketserver
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any
+
+from aoc import lazy
+from aoc.cache import ModelCache, ResultCache
+from aoc.client import DEFAULT_SOCKET
+from aoc.runner import InputSource, load_day, run_day
+
+ALL_DAYS = range(1, 26)
+
+
+class SolverServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: Path):
+        self.cache = ResultCache()
+        self.models = ModelCache()
+        self.loaded_at: dict[int, float] = {}
+        for day in ALL_DAYS:
+            self.load(day)
+        # the days put off importing PIL and networkx, but the daemon is here so
+        # that nothing gets imported while a request waits
+        lazy.load_all()
+        super().__init__(str(socket_path), SolverHandler)
+
+    def load(self, day: int) -> None:
+        module = load_day(day)
+        modified = Path(module.__file__).stat().st_mtime
+        if day in self.loaded_at and modified != self.loaded_at[day]:
+            importlib.reload(module)
+        self.loaded_at[day] = modified
+
+    def solve(self, request: dict[str, Any]) -> dict[str, Any]:
+        day = int(request["day"])
+        self.load(day)
+        # anything the solvers print would otherwise end up in the daemon's log
+        with redirect_stdout(io.StringIO()):
+            measurements = run_day(
+                day,
+                InputSource(
+                    use_example=request.get("example", False),
+                    generate_size=request.get("generate"),
+                    seed=request.get("seed", 0),
+                    text=request.get("input"),
+                ),
+                request.get("part"),
+                None if request.get("no_cache") else self.cache,
+                models=None if request.get("no_cache") else self.models,
+            )
+        return {"results": [result.as_dict() for result in measurements]}
+
+
+class SolverHandler(socketserver.StreamRequestHandler):
+    server: SolverServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                match request.get("command", "solve"):
+                    case "solve":
+                        response = self.server.solve(request)
+                    case "ping":
+                        response = {"pid": os.getpid()}
+                    case "stop":
+                        # shutdown() waits for serve_forever() to return, which
+                        # won't happen until this handler does
+                        threading.Thread(target=self.server.shutdown).start()
+                        response = {"stopping": True}
+                    case command:
+                        raise ValueError(f"Unknown command {command}")
+            except Exception as exc:
+                response = {"error": f"{type(exc).__name__}: {exc}"}
+            self.respond(response)
+
+    def respond(self, response: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+        self.wfile.flush()
+
+
+def serve(socket_path: Path = DEFAULT_SOCKET) -> None:
+    socket_path.unlink(missing_ok=True)
+    with SolverServer(socket_path) as server:
+        print(f"listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
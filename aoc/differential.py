@@ -0,0 +1,86 @@
+"""Run two engines over the same generated inputs and compare their answers"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from aoc import engines, generate
+from aoc.results import format_answer, tabulate
+from aoc.runner import WRITES_FILES, find_parts, load_day, reset_caches
+
+
+@dataclass
+class Comparison:
+    phase: str
+    size: int
+    seed: int
+    # engine name -> answer (or the error it raised)
+    answers: dict[str, str]
+
+    @property
+    def agree(self) -> bool:
+        return len(set(self.answers.values())) == 1
+
+
+def run_engine(module: Any, solve: Any, puzzle: str) -> str:
+    # a warm cache could hide a wrong answer
+    reset_caches(module)
+    try:
+        return format_answer(solve(puzzle))
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+
+
+def compare_engines(
+    day: int, names: list[str] | None, sizes: list[int], seeds: int
+) -> list[Comparison]:
+    """Every phase that has more than one of the engines, over seeds inputs of
+    each size. Without names, that's the reference plus every engine that can
+    run here."""
+    module = load_day(day)
+    comparisons = []
+    for phase, reference in find_parts(module).items():
+        if (day, phase) in WRITES_FILES:
+            continue
+        registered = engines.engines_for(module.__name__, phase)
+        solvers = {engines.REFERENCE: reference} | {
+            name: engine.solve for name, engine in registered.items()
+        }
+        wanted = names
+        if wanted is None:
+            wanted = [engines.REFERENCE] + [
+                name for name, engine in registered.items() if engine.available()
+            ]
+        # engines asked for by name run even if they wouldn't be picked here
+        # (the numba ones still work without numba, just slowly)
+        solvers = {name: solvers[name] for name in wanted if name in solvers}
+        if len(solvers) < 2:
+            continue
+        for size in sizes:
+            if generate.solver_kwargs(day, size).get(phase):
+                # the engines only take the puzzle text
+                continue
+            for seed in range(seeds):
+                puzzle = generate.generate(day, size, seed)
+                answers = {
+                    name: run_engine(module, solve, puzzle)
+                    for name, solve in solvers.items()
+                }
+                comparisons.append(Comparison(phase, size, seed, answers))
+    return comparisons
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    rows = [("phase", "size", "seed", "answers", "")]
+    for comparison in comparisons:
+        rows.append(
+            (
+                comparison.phase,
+                str(comparison.size),
+                str(comparison.seed),
+                ", ".join(
+                    f"{name}={answer}" for name, answer in comparison.answers.items()
+                ),
+                "ok" if comparison.agree else "DIFFERENT",
+            )
+        )
+    return tabulate(rows)
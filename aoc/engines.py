@@ -0,0 +1,90 @@
+"""Several implementations of the same part, kept side by side.
+
+A day's plain part_one()/part_two() is always the "reference" engine: the
+straightforward version that the others have to agree with. Faster versions
+register themselves alongside it:
+
+    @engine("part 2", "parallel", min_size=10_000, available=workers.can_help)
+    def part_two_parallel(puzzle: str) -> int:
+        with workers.using():
+            return part_two(puzzle)
+
+`run --engine NAME` picks one by name, and `run --engine auto` takes the
+available engine with the biggest min_size that the input (in characters)
+reaches, so small inputs stay on the reference code where a fast engine's
+setup would cost more than it saves. `python -m aoc check` runs two engines
+over generated inputs and compares their answers, which is what lets a new
+engine be trusted.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+REFERENCE = "reference"
+AUTO = "auto"
+
+
+class EngineError(ValueError):
+    """An engine that doesn't exist or can't run here was asked for"""
+
+
+@dataclass(frozen=True)
+class Engine:
+    name: str
+    solve: Callable[[str], Any]
+    # the smallest input (in characters) that auto picks this engine for
+    min_size: int = 0
+    # whether it can run here at all (an optional dependency, more than one CPU)
+    available: Callable[[], bool] = lambda: True
+
+
+# module name -> phase -> engine name -> engine
+_registry: dict[str, dict[str, dict[str, Engine]]] = {}
+
+
+def engine(
+    phase: str,
+    name: str,
+    min_size: int = 0,
+    available: Callable[[], bool] = lambda: True,
+) -> Callable[[Callable[[str], Any]], Callable[[str], Any]]:
+    """Register the decorated function as another engine for the phase"""
+
+    def register(solve: Callable[[str], Any]) -> Callable[[str], Any]:
+        phases = _registry.setdefault(solve.__module__, {})
+        phases.setdefault(phase, {})[name] = Engine(name, solve, min_size, available)
+        return solve
+
+    return register
+
+
+def engines_for(module_name: str, phase: str) -> dict[str, Engine]:
+    """Every engine registered for the phase, not counting the reference"""
+    return _registry.get(module_name, {}).get(phase, {})
+
+
+def names(module_name: str) -> set[str]:
+    """Every engine the day has for any of its phases, the reference included"""
+    phases = _registry.get(module_name, {}).values()
+    return {REFERENCE, AUTO}.union(*phases)
+
+
+def choose(module_name: str, phase: str, name: str, size: int) -> Engine | None:
+    """The engine to use, or None for the reference one (which is also what a
+    phase without an engine of that name gets)"""
+    engines = engines_for(module_name, phase)
+    if name == AUTO:
+        candidates = [
+            engine
+            for engine in engines.values()
+            if engine.min_size <= size and engine.available()
+        ]
+        return max(candidates, key=lambda engine: engine.min_size, default=None)
+    if name not in engines:
+        return None
+    if not engines[name].available():
+        raise EngineError(
+            f"the {name} engine for {module_name} {phase} can't run here "
+            f"(`check --engines {REFERENCE} {name}` runs it anyway)"
+        )
+    return engines[name]
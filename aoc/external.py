@@ -0,0 +1,125 @@
+"""Sorting more numbers than fit in memory.
+
+A RunWriter takes the numbers a chunk at a time and, whenever run_length of
+them have built up, sorts them and writes them out as a run: a .npy file in a
+temporary directory. merge() then memory-maps the runs and streams all of them
+back in order, in blocks, so at any one time memory only holds a block's worth
+of each run, however big the input was. counted() turns a sorted stream into
+(value, count) pairs, which is what joining two of them needs.
+
+    with tempfile.TemporaryDirectory() as directory:
+        runs = RunWriter(Path(directory))
+        for chunk in chunks:
+            runs.add(chunk)
+        for block in merge(runs.finish()):
+            ...
+
+Everything here works a block at a time with NumPy rather than a value at a
+time with heapq, which is what makes it quick enough to bother with.
+"""
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+# values per run, which is what has to fit in memory (32 MiB of int64)
+DEFAULT_RUN_LENGTH = 2**22
+# values read from each run at a time while merging
+DEFAULT_BLOCK_LENGTH = 2**16
+
+
+class RunWriter:
+    def __init__(
+        self,
+        directory: Path,
+        name: str = "run",
+        run_length: int = DEFAULT_RUN_LENGTH,
+    ):
+        self.directory = directory
+        self.name = name
+        self.run_length = run_length
+        self.pending: list[np.ndarray] = []
+        self.pending_length = 0
+        self.paths: list[Path] = []
+
+    def add(self, values: np.ndarray) -> None:
+        self.pending.append(values)
+        self.pending_length += len(values)
+        if self.pending_length >= self.run_length:
+            self.spill()
+
+    def spill(self) -> None:
+        """Sort what's built up and write it out as a run"""
+        run = np.concatenate(self.pending)
+        run.sort()
+        path = self.directory / f"{self.name}-{len(self.paths)}.npy"
+        np.save(path, run)
+        self.paths.append(path)
+        self.pending = []
+        self.pending_length = 0
+
+    def finish(self) -> list[np.ndarray]:
+        """Every run, each sorted. If nothing had to be written out, there's
+        one run and it never left memory."""
+        if not self.paths:
+            run = np.concatenate(self.pending) if self.pending else np.zeros(0, int)
+            run.sort()
+            return [run]
+        if self.pending_length:
+            self.spill()
+        return [np.load(path, mmap_mode="r") for path in self.paths]
+
+
+def merge(
+    runs: list[np.ndarray], block_length: int = DEFAULT_BLOCK_LENGTH
+) -> Iterator[np.ndarray]:
+    """Every value in the sorted runs, in order, in blocks of block_length
+    (apart from the last one)"""
+    positions = [0] * len(runs)
+    carried = np.zeros(0, dtype=runs[0].dtype if runs else int)
+    while True:
+        windows = [
+            run[position : position + block_length]
+            for run, position in zip(runs, positions)
+        ]
+        if not any(len(window) for window in windows):
+            break
+        # nothing past the end of any run's window can be smaller than the
+        # smallest of those ends, so everything up to it can go out now
+        bound = min(window[-1] for window in windows if len(window))
+        pieces = [carried]
+        for index, window in enumerate(windows):
+            taken = int(np.searchsorted(window, bound, side="right"))
+            pieces.append(window[:taken])
+            positions[index] += taken
+        merged = np.concatenate(pieces)
+        # the carried values are all smaller, but sorting the lot is simpler
+        # than merging the pieces and still only touches a few blocks
+        merged.sort(kind="stable")
+        whole = len(merged) - len(merged) % block_length
+        for start in range(0, whole, block_length):
+            yield merged[start : start + block_length]
+        carried = merged[whole:]
+    if len(carried):
+        yield carried
+
+
+def counted(blocks: Iterable[np.ndarray]) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """A sorted stream of blocks as the distinct values and how many times each
+    turns up, with a value that runs across blocks only counted once"""
+    values = counts = None
+    for block in blocks:
+        if not len(block):
+            continue
+        block_values, block_counts = np.unique(block, return_counts=True)
+        if values is not None:
+            if block_values[0] == values[-1]:
+                # the last value carries on into this block
+                block_counts[0] += counts[-1]
+                values, counts = values[:-1], counts[:-1]
+            if len(values):
+                yield values, counts
+        values, counts = block_values, block_counts
+    if values is not None and len(values):
+        yield values, counts
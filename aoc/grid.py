@@ -0,0 +1,113 @@
+"""A character grid stored as a compact uint8 NumPy array.
+
+Cells are addressed by their flat index (y * width + x), so positions are plain
+ints that can go in arrays, sets or dict keys without building tuples or complex
+numbers. The same memory is available as a 2D array (grid.array[y, x]) for
+vectorized work like shifting the whole grid by an offset.
+"""
+
+from functools import cached_property
+
+import numpy as np
+
+# clockwise starting from north, so turning right is (direction + 1) % 4
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+NORTH, EAST, SOUTH, WEST = range(4)
+
+
+def shift(array: np.ndarray, dx: int, dy: int, fill: int = 0) -> np.ndarray:
+    """result[y, x] == array[y + dy, x + dx], or fill where that's off the edge"""
+    height, width = array.shape
+    result = np.full_like(array, fill)
+    if abs(dx) >= width or abs(dy) >= height:
+        return result
+    result[max(-dy, 0) : height - max(dy, 0), max(-dx, 0) : width - max(dx, 0)] = array[
+        max(dy, 0) : height + min(dy, 0), max(dx, 0) : width + min(dx, 0)
+    ]
+    return result
+
+
+class Grid:
+    def __init__(self, array: np.ndarray):
+        self.array = array.astype(np.uint8, copy=False)
+        self.height, self.width = self.array.shape
+        # a view, so writes to either one show up in both
+        self.cells = self.array.reshape(-1)
+        self.offsets = np.array([dx + dy * self.width for dx, dy in DIRECTIONS])
+
+    @classmethod
+    def from_str(cls, puzzle: str) -> "Grid":
+        lines = puzzle.strip("\n").splitlines()
+        data = np.frombuffer("".join(lines).encode(), dtype=np.uint8)
+        return cls(data.reshape(len(lines), len(lines[0])).copy())
+
+    @classmethod
+    def blank(cls, width: int, height: int, char: str = ".") -> "Grid":
+        return cls(np.full((height, width), ord(char), dtype=np.uint8))
+
+    def __str__(self) -> str:
+        return "\n".join(row.tobytes().decode() for row in self.array)
+
+    def copy(self) -> "Grid":
+        return Grid(self.array.copy())
+
+    def freeze(self) -> "Grid":
+        """A read-only view, for parsed models that both parts share"""
+        array = self.array.view()
+        array.flags.writeable = False
+        return Grid(array)
+
+    @property
+    def size(self) -> int:
+        return self.width * self.height
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def coords(self, index: int) -> tuple[int, int]:
+        y, x = divmod(int(index), self.width)
+        return x, y
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def char(self, index: int) -> str:
+        return chr(self.cells[index])
+
+    def mask(self, chars: str) -> np.ndarray:
+        """Flat boolean array of the cells holding any of the given characters"""
+        return np.isin(self.cells, np.frombuffer(chars.encode(), dtype=np.uint8))
+
+    def find(self, chars: str) -> np.ndarray:
+        return np.flatnonzero(self.mask(chars))
+
+    def find_one(self, char: str) -> int:
+        (index,) = self.find(char)
+        return int(index)
+
+    @cached_property
+    def can_step(self) -> np.ndarray:
+        """can_step[direction, index] is whether that step stays on the grid"""
+        ys, xs = np.divmod(np.arange(self.size), self.width)
+        return np.array(
+            [
+                (0 <= xs + dx)
+                & (xs + dx < self.width)
+                & (0 <= ys + dy)
+                & (ys + dy < self.height)
+                for dx, dy in DIRECTIONS
+            ]
+        )
+
+    @cached_property
+    def step_targets(self) -> np.ndarray:
+        """step_targets[direction, index] is the cell one step away, clamped onto
+        the grid so it can always be used as an index (check can_step first)"""
+        targets = np.arange(self.size)[None, :] + self.offsets[:, None]
+        return np.clip(targets, 0, self.size - 1)
+
+    def step(self, index: int, direction: int) -> int | None:
+        """The neighboring index in that direction, or None off the edge"""
+        if not self.can_step[direction, index]:
+            return None
+        return index + int(self.offsets[direction])
@@ -0,0 +1,73 @@
+"""Read puzzle inputs without holding a decoded copy of the whole file.
+
+read_text() followed by splitlines() or split("\\n\\n") keeps the file in
+memory two or three times over. mapped() memory-maps the file instead, and the
+InputBuffer it hands back walks the mapping in place: lines(), records() and
+chunks() only ever copy the piece they're currently yielding, and the raw
+bytes can go straight to re or numpy.frombuffer. The days with *_stream
+solvers use these to work through an input of any size in bounded memory.
+"""
+
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+DEFAULT_CHUNK_SIZE = 2**20
+
+
+class InputBuffer:
+    def __init__(self, data: bytes | mmap.mmap):
+        self.data = data
+
+    @classmethod
+    def from_str(cls, puzzle: str) -> "InputBuffer":
+        """For running a streaming solver on an example"""
+        return cls(puzzle.encode())
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _split(self, separator: bytes) -> Iterator[bytes]:
+        start = 0
+        end = len(self.data)
+        while start < end:
+            stop = self.data.find(separator, start)
+            if stop == -1:
+                stop = end
+            yield self.data[start:stop]
+            start = stop + len(separator)
+
+    def lines(self) -> Iterator[bytes]:
+        """Each line without its newline"""
+        return self._split(b"\n")
+
+    def records(self) -> Iterator[bytes]:
+        """Each blank-line-separated group of lines"""
+        for record in self._split(b"\n\n"):
+            if record := record.strip(b"\n"):
+                yield record
+
+    def chunks(self, size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Pieces of roughly size bytes that always end at the end of a line"""
+        start = 0
+        end = len(self.data)
+        while start < end:
+            stop = self.data.find(b"\n", min(start + size, end) - 1)
+            stop = end if stop == -1 else stop + 1
+            yield self.data[start:stop]
+            start = stop
+
+
+@contextmanager
+def mapped(path: Path) -> Iterator[InputBuffer]:
+    with path.open("rb") as file:
+        # mmap can't map an empty file
+        if not path.stat().st_size:
+            yield InputBuffer(b"")
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # we only ever read front to back
+            if hasattr(data, "madvise"):
+                data.madvise(mmap.MADV_SEQUENTIAL)
+            yield InputBuffer(data)
@@ -0,0 +1,61 @@
+"""Optional numba compilation for the few loops that are plain integer code.
+
+A kernel is written once, against NumPy arrays and ints only, and decorated
+with njit():
+
+    @jit.njit
+    def walk_kernel(can_step: np.ndarray, offsets: np.ndarray, ...) -> int: ...
+
+With numba installed it's compiled to machine code the first time it's called
+(and cached in __pycache__ for the next run); without it the same function
+just runs as Python. Either way the answers are the same, so the days register
+their kernels as "numba" engines that are only available when numba is, and
+`python -m aoc check DAY --engines reference numba` can compare them even on
+a machine without it.
+
+numba takes most of a second to import, so nothing here imports it until a
+kernel actually runs.
+"""
+
+import importlib.util
+from functools import cache, wraps
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@cache
+def available() -> bool:
+    return importlib.util.find_spec("numba") is not None
+
+
+def version() -> str | None:
+    if not available():
+        return None
+    from importlib.metadata import version
+
+    return version("numba")
+
+
+def jit_compile(func: F) -> F:
+    if not available():
+        return func
+    import numba
+
+    return numba.njit(cache=True)(func)
+
+
+def njit(func: F) -> F:
+    """func, compiled on its first call if numba is installed"""
+    kernel = None
+
+    @wraps(func)
+    def call(*args: Any) -> Any:
+        nonlocal kernel
+        if kernel is None:
+            kernel = jit_compile(func)
+        return kernel(*args)
+
+    # the uncompiled version, like numba's own dispatchers have
+    call.py_func = func  # type: ignore[attr-defined]
+    return call  # type: ignore[return-value]
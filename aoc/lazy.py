@@ -0,0 +1,47 @@
+"""Put off importing a heavy module until something actually uses it.
+
+    Image = lazy_import("PIL.Image")
+
+gives back a stand-in for the module straight away, and the real import only
+happens the first time an attribute is looked up on it (Image.new(...)), so a
+day that only needs PIL or networkx on one code path doesn't pay for it just by
+being imported. Anything touched at import time, like an annotation, defeats
+the point, so keep those as strings.
+
+A long-running process like the daemon wants the opposite, and calls load_all()
+once everything is imported so no request pays for an import.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    if (module := sys.modules.get(name)) is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def pending() -> list[str]:
+    """The lazy modules that haven't been loaded yet"""
+    return sorted(
+        name
+        for name, module in list(sys.modules.items())
+        if isinstance(module, importlib.util._LazyModule)  # type: ignore[attr-defined]
+    )
+
+
+def load_all() -> None:
+    """Load every lazy module that hasn't been yet"""
+    for name in pending():
+        # looking up any attribute finishes the import
+        getattr(sys.modules[name], "__dict__")
@@ -0,0 +1,162 @@
+"""Memoization with a memory budget, for solvers that get called over and over.
+
+functools.cache keeps everything forever, which is fine for one puzzle but
+not for a daemon or a batch run that goes through thousands of inputs. A
+memoized function here has a rough budget in bytes (keys and values measured
+with sys.getsizeof, which doesn't follow references, so treat it as a lower
+bound), and once it's over, the oldest quarter of the entries go.
+
+A cache whose answers depend on the puzzle can name the argument that
+identifies it as its scope, e.g. the towels in day 19:
+
+    @memoize(scope="towels")
+    def possible_combos(pattern: str, towels: frozenset[str]) -> int: ...
+
+The scope is left out of the key, so it isn't hashed on every call, and the
+cache empties itself whenever it's called with a different one. Arguments
+have to be passed positionally.
+
+Memoized functions keep functools' cache_info() and cache_clear(), so the
+runner resets and counts them like any other cache (run --counters shows the
+hit rates), and stats() reports on all of them at once. Lookups don't take a
+lock, so with free-threaded workers the hit and miss counts can come out
+slightly low.
+"""
+
+import sys
+import threading
+from functools import update_wrapper
+from itertools import islice
+from typing import Any, Callable, NamedTuple
+
+DEFAULT_BUDGET = 64 * 2**20
+# roughly what a dict entry costs on top of its key and value
+ENTRY_OVERHEAD = 64
+# how much of the cache goes when it's over budget
+EVICT_FRACTION = 0.25
+
+REGISTRY: dict[str, "Memo"] = {}
+_NO_SCOPE = object()
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    nbytes: int
+    budget: int
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class Memo:
+    """The entries and statistics behind one memoized function"""
+
+    def __init__(self, name: str, budget: int = DEFAULT_BUDGET):
+        self.name = name
+        self.budget = budget
+        self.entries: dict[Any, Any] = {}
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.scope: Any = _NO_SCOPE
+        self.lock = threading.Lock()
+
+    def store(self, key: Any, value: Any) -> None:
+        size = sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = value
+            self.nbytes += size
+            if self.nbytes > self.budget:
+                self.evict()
+
+    def evict(self) -> None:
+        """Drop the oldest entries, which were put there first"""
+        count = max(1, int(len(self.entries) * EVICT_FRACTION))
+        for key in list(islice(self.entries, count)):
+            value = self.entries.pop(key)
+            self.nbytes -= sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD
+        self.evictions += count
+
+    def rescope(self, scope: Any) -> None:
+        if scope != self.scope:
+            self.cache_clear()
+        # hold on to this one so the next call can compare identities
+        self.scope = scope
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self.entries),
+            self.nbytes,
+            self.budget,
+        )
+
+    def cache_clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+            self.scope = _NO_SCOPE
+
+
+def memoize(
+    name: str | None = None, budget: int = DEFAULT_BUDGET, scope: str | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        memo = Memo(name or f"{func.__module__}.{func.__qualname__}", budget)
+        REGISTRY[memo.name] = memo
+        entries = memo.entries
+
+        # a plain function rather than a __call__ method, since this is on the
+        # hot path and calling an instance costs noticeably more
+        if scope is None:
+
+            def memoized(*args: Any) -> Any:
+                # always the whole tuple, since f((a, b)) and f(a, b) are
+                # different calls
+                value = entries.get(args, _MISSING)
+                if value is _MISSING:
+                    memo.misses += 1
+                    value = func(*args)
+                    memo.store(args, value)
+                else:
+                    memo.hits += 1
+                return value
+
+        else:
+            # the parameters come first in the code object's local names
+            index = func.__code__.co_varnames.index(scope)
+
+            def memoized(*args: Any) -> Any:
+                if args[index] is not memo.scope:
+                    memo.rescope(args[index])
+                key = args[:index] + args[index + 1 :]
+                value = entries.get(key, _MISSING)
+                if value is _MISSING:
+                    memo.misses += 1
+                    value = func(*args)
+                    memo.store(key, value)
+                else:
+                    memo.hits += 1
+                return value
+
+        update_wrapper(memoized, func)
+        memoized.memo = memo  # type: ignore[attr-defined]
+        memoized.cache_info = memo.cache_info  # type: ignore[attr-defined]
+        memoized.cache_clear = memo.cache_clear  # type: ignore[attr-defined]
+        return memoized
+
+    return decorate
+
+
+def stats() -> dict[str, CacheInfo]:
+    return {name: memo.cache_info() for name, memo in sorted(REGISTRY.items())}
@@ -0,0 +1,147 @@
+"""Run every day at once across a pool of worker processes"""
+
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from pathlib import Path
+
+from aoc import cache
+from aoc.cache import ResultCache
+from aoc.results import Measurement, format_answer, tabulate
+from aoc.runner import WRITES_FILES, InputSource, find_parts, load_day, solve_phase
+
+DEFAULT_TIMINGS = cache.DEFAULT_DIRECTORY / "run_all_timings.json"
+
+# until we have timings from an earlier run, these are the ones to start first
+HEAVY_DAYS = [6, 16, 20, 22]
+
+
+@dataclass(frozen=True)
+class Task:
+    day: int
+    phase: str
+
+    @property
+    def key(self) -> str:
+        return f"day{self.day:02}.{self.phase}"
+
+
+def list_tasks(days: list[int]) -> list[Task]:
+    """One task per part, since the parts don't share any state"""
+    return [
+        Task(day, phase)
+        for day in days
+        for phase in find_parts(load_day(day))
+        if (day, phase) not in WRITES_FILES
+    ]
+
+
+def schedule(tasks: list[Task], timings: dict[str, float]) -> list[Task]:
+    """Slowest first so a long part doesn't get started last"""
+
+    def expected_time(task: Task) -> tuple[float, bool, int]:
+        return (
+            timings.get(task.key, 0.0),
+            task.day in HEAVY_DAYS,
+            -task.day,
+        )
+
+    return sorted(tasks, key=expected_time, reverse=True)
+
+
+def solve_task(task: Task, source: InputSource, use_cache: bool = True) -> Measurement:
+    try:
+        puzzle = source.read(task.day)
+    except OSError as exc:
+        return Measurement(
+            task.phase, None, 0.0, 0.0, 0, f"{type(exc).__name__}: {exc}"
+        )
+    module = load_day(task.day)
+    kwargs = source.solver_kwargs(task.day) or {}
+    solve = find_parts(module, kwargs)[task.phase]
+    cache = ResultCache() if use_cache else None
+    # nobody is going to see what the workers print
+    with redirect_stdout(io.StringIO()):
+        return solve_phase(
+            module, task.phase, solve, puzzle, kwargs.get(task.phase), cache
+        )
+
+
+def run_all(
+    days: list[int],
+    source: InputSource = InputSource(),
+    workers: int | None = None,
+    timings_path: Path = DEFAULT_TIMINGS,
+    use_cache: bool = True,
+) -> tuple[dict[Task, Measurement], float]:
+    """Solve every part of the given days, returning the results and total wall time"""
+    # an example or a generated input takes nothing like as long as the real
+    # one, so each source keeps its own timings
+    saved = load_timings(timings_path)
+    timings = saved.setdefault(source.name, {})
+    tasks = schedule(list_tasks(days), timings)
+    results = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(solve_task, task, source, use_cache): task for task in tasks
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    wall_time = time.perf_counter() - start
+    timings.update(
+        {
+            task.key: result.wall_time
+            for task, result in results.items()
+            if not result.error and not result.cached
+        }
+    )
+    timings_path.parent.mkdir(parents=True, exist_ok=True)
+    timings_path.write_text(json.dumps(saved, indent=2, sort_keys=True) + "\n")
+    return (
+        dict(sorted(results.items(), key=lambda item: (item[0].day, item[0].phase))),
+        wall_time,
+    )
+
+
+def load_timings(path: Path = DEFAULT_TIMINGS) -> dict[str, dict[str, float]]:
+    """Seconds per task, for each input source"""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def format_summary(results: dict[Task, Measurement], wall_time: float) -> str:
+    rows = [("day", "phase", "answer", "wall (s)")]
+    for task, result in results.items():
+        rows.append(
+            (
+                f"{task.day:02}",
+                task.phase,
+                result.error
+                or format_answer(result.answer)
+                + (" (cached)" if result.cached else ""),
+                f"{result.wall_time:.4f}",
+            )
+        )
+    # Running the same tasks one after another would take about this long. CPU
+    # time rather than wall time since the workers slow each other down when
+    # there are more of them than cores. It's only an estimate, and answers
+    # from the cache didn't run at all, so they're left out.
+    solved = [result for result in results.values() if not result.cached]
+    serial_time = sum(result.cpu_time for result in solved)
+    cached = len(results) - len(solved)
+    lines = [
+        tabulate(rows),
+        "",
+        f"total wall time:  {wall_time:.2f}s",
+        f"estimated serial: {serial_time:.2f}s (sum of worker CPU"
+        + (f", leaving out {cached} cached)" if cached else ")"),
+    ]
+    if solved and wall_time:
+        lines.append(f"speedup:          {serial_time / wall_time:.2f}x")
+    return "\n".join(lines)
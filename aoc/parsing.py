@@ -0,0 +1,118 @@
+"""Pull every integer out of a puzzle input in one pass.
+
+Most inputs are numbers with some punctuation in between, so rather than
+splitting and calling int() on each piece, the text is scanned as a byte array:
+runs of digits are found with a diff, and each run's value is the sum of its
+digits times their place values. A "-" directly in front of a run makes it
+negative, so "p=0,4 v=3,-3" gives 0, 4, 3, -3 and "X+94" gives 94.
+"""
+
+import numpy as np
+
+ZERO = ord("0")
+MINUS = ord("-")
+NEWLINE = ord("\n")
+# the most that always fits in an int64
+MAX_DIGITS = 18
+
+
+def _scan(text: str | bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The integers in the text plus where each one starts in the raw bytes"""
+    data = np.frombuffer(text.encode() if isinstance(text, str) else text, np.uint8)
+    digits = (data >= ZERO) & (data <= ZERO + 9)
+    edges = np.diff(digits.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    if not len(starts):
+        return data, starts, np.zeros(0, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    # each digit's position within its number, counting from the left
+    run = np.repeat(np.arange(len(starts)), lengths)
+    positions = np.arange(len(run)) - offsets[run]
+    digit_values = (data[starts[run] + positions] - ZERO).astype(np.int64)
+    places = lengths[run] - positions - 1
+    values = np.add.reduceat(digit_values * 10**places, offsets)
+    if (lengths > MAX_DIGITS).any():
+        # too big for int64 (day 7 answers can get there), so fall back to
+        # Python ints for the whole lot
+        values = values.astype(object)
+        for index in np.flatnonzero(lengths > MAX_DIGITS):
+            start = starts[index]
+            values[index] = int(data[start : start + lengths[index]].tobytes())
+    negative = starts > 0
+    negative[negative] = data[starts[negative] - 1] == MINUS
+    values[negative] *= -1
+    return data, starts, values
+
+
+def ints(text: str | bytes, columns: int | None = None) -> np.ndarray:
+    """Every integer in the text, in order.
+
+    With columns, the result is reshaped into one row per record, e.g.
+    columns=2 for the "left right" pairs in day 1.
+    """
+    _, _, values = _scan(text)
+    if columns is None:
+        return values
+    if len(values) % columns:
+        raise ValueError(f"{len(values)} numbers won't split into rows of {columns}")
+    return values.reshape(-1, columns)
+
+
+def fixed_columns(text: str | bytes, columns: int) -> np.ndarray | None:
+    """Like ints(text, columns) for a table whose lines are all laid out the
+    same way ("12345   67890" in day 1), or None if it isn't one.
+
+    The bytes are viewed as one row per line, so each number is read straight
+    off its columns of digits, a column at a time, without the per-digit
+    arrays ints() needs. The result is in column-major order, so each column
+    is contiguous.
+    """
+    data = np.frombuffer(text.encode() if isinstance(text, str) else text, np.uint8)
+    if not len(data) or (data == MINUS).any():
+        return None
+    width = int(np.argmax(data == NEWLINE)) + 1
+    # the last line doesn't have to end in a newline
+    if width < 2 or (len(data) + (data[-1] != NEWLINE)) % width:
+        return None
+    if (data[width - 1 :: width] != NEWLINE).any():
+        return None
+    # a view of each line without its newline, so nothing's copied
+    lines = np.lib.stride_tricks.as_strided(
+        data,
+        shape=((len(data) + 1) // width, width - 1),
+        strides=(width, 1),
+        writeable=False,
+    )
+    # which characters of the first line are digits, as runs of columns
+    first = (lines[0] - ZERO) < 10
+    edges = np.diff(first.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) != columns or (ends - starts > MAX_DIGITS).any():
+        return None
+    values = np.zeros((len(lines), columns), dtype=np.int64, order="F")
+    for column, is_digit in enumerate(first):
+        # every line has to have a digit (or not) in the same place
+        digits = lines[:, column] - ZERO
+        if ((digits < 10) != is_digit).any():
+            return None
+    for index, (start, end) in enumerate(zip(starts, ends)):
+        number = values[:, index]
+        for column in range(start, end):
+            number *= 10
+            number += lines[:, column] - ZERO
+    return values
+
+
+def int_lines(text: str | bytes) -> list[list[int]]:
+    """The integers on each line, for records that aren't all the same length.
+
+    Lines without any numbers on them are left out.
+    """
+    data, starts, values = _scan(text)
+    # which line each number starts on
+    lines = np.searchsorted(np.flatnonzero(data == ord("\n")), starts)
+    edges = [0, *(np.flatnonzero(np.diff(lines)) + 1).tolist(), len(values)]
+    flat = values.tolist()
+    return [flat[start:end] for start, end in zip(edges, edges[1:]) if end > start]
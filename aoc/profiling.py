@@ -0,0 +1,238 @@
+"""Profile each phase of a day with cProfile and tracemalloc.
+
+Every phase leaves three files behind in the output directory:
+
+    day20.part2.pstats       load with pstats or snakeviz
+    day20.part2.folded       collapsed stacks for flamegraph.pl or speedscope
+    day20.part2.memory.txt   peak traced memory and what was allocated at the peak
+
+cProfile only records caller/callee pairs, not whole stacks, so the collapsed
+stacks are rebuilt by walking the call graph down from the top and splitting a
+function's time between its callers in proportion to how much of it each one
+was responsible for. That's exact for code that's only reached one way, which
+covers most of what the days do.
+
+The allocation sites are what's live at the phase's peak, which is when the
+short-lived sets and arrays that make a solver hungry are around, rather than
+what's left once it returns. tracemalloc can't stop at the peak by itself, so a
+thread polls it and takes a snapshot each time memory use tops the last one by
+a good margin. Each allocation goes to the innermost line of the repo's own
+code that led to it, so a set built by a day's helper shows up there and not
+in numpy's or the import system's internals.
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import tracemalloc
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable
+
+from aoc import ROOT
+
+DEFAULT_DIRECTORY = ROOT / "profiles"
+TOP_ALLOCATIONS = 15
+TOP_FUNCTIONS = 8
+# frames kept per allocation, enough to get from numpy or the stdlib back out
+# to the solver that called it
+TRACEBACK_FRAMES = 32
+# how often to check on memory use, and how far it has to grow past the last
+# snapshot (which costs time in proportion to what's allocated) to take another
+SAMPLE_SECONDS = 0.005
+SAMPLE_GROWTH = 1.1
+
+# (filename, line number, function name), as pstats keys them
+FunctionKey = tuple[str, int, str]
+
+
+def function_label(key: FunctionKey) -> str:
+    filename, line, name = key
+    if filename == "~":
+        # builtins like {method 'sort' of 'list' objects}
+        return name
+    module = Path(filename).stem
+    return f"{module}.{name}:{line}"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, int]:
+    """Microseconds spent in each call stack, keyed by "outer;inner;innermost" """
+    entries = stats.stats  # type: ignore[attr-defined]
+    callees: dict[FunctionKey, list[FunctionKey]] = {}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(function)
+    stacks: dict[str, int] = {}
+
+    def walk(function: FunctionKey, path: list[str], share: float) -> None:
+        _, _, own_time, _, _ = entries[function]
+        label = function_label(function)
+        stack = path + [label]
+        if own_time * share:
+            key = ";".join(stack)
+            stacks[key] = stacks.get(key, 0) + round(own_time * share * 1e6)
+        for callee in callees.get(function, []):
+            if function_label(callee) in stack:
+                # recursion, which is already counted where it started
+                continue
+            _, _, _, callee_total, callee_callers = entries[callee]
+            # the share of the callee's time that came from this caller
+            # (and, below that, from this particular path to the caller)
+            *_, edge_total = callee_callers[function]
+            if callee_total and edge_total:
+                walk(callee, stack, share * edge_total / callee_total)
+
+    roots = [
+        function
+        for function, entry in entries.items()
+        # the profiler switching itself off shows up as a root of its own
+        if not entry[4] and "_lsprof.Profiler" not in function[2]
+    ]
+    for root in roots:
+        walk(root, [], 1.0)
+    return stacks
+
+
+def is_solver_code(filename: str) -> bool:
+    """Whether a frame is in the days or aoc, rather than a library, the
+    standard library, the import system or this module"""
+    return (
+        filename.startswith(str(ROOT))
+        and "site-packages" not in filename
+        and filename != __file__
+    )
+
+
+def allocation_sites(snapshot: tracemalloc.Snapshot) -> Counter[tuple[str, int]]:
+    """Bytes allocated at each line of solver code, counting an allocation
+    against the innermost line of solver code in its traceback"""
+    sites: Counter[tuple[str, int]] = Counter()
+    for trace in snapshot.traces:
+        # the frames run from the outermost in
+        for frame in reversed(trace.traceback):
+            if is_solver_code(frame.filename):
+                sites[frame.filename, frame.lineno] += trace.size
+                break
+    return sites
+
+
+class PeakSampler(threading.Thread):
+    """Keeps a snapshot from close to the highest memory use while it runs"""
+
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self.finished = threading.Event()
+        self.size = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+
+    def run(self) -> None:
+        while not self.finished.wait(SAMPLE_SECONDS):
+            self.sample()
+
+    def sample(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.size * SAMPLE_GROWTH:
+            self.size = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        self.finished.set()
+        self.join()
+        # in case the peak was right at the end, or the phase was over before
+        # the first sample
+        self.sample()
+
+
+class Profiler:
+    def __init__(self, day: int, directory: Path = DEFAULT_DIRECTORY):
+        self.day = day
+        self.directory = directory
+        self.reports: list[str] = []
+
+    def prefix(self, phase: str) -> Path:
+        return self.directory / f"day{self.day:02}.{phase.replace(' ', '')}"
+
+    def wrap(self, phase: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """func, but profiled and reported on as the given phase"""
+
+        @wraps(func)
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            profile = cProfile.Profile()
+            already_tracing = tracemalloc.is_tracing()
+            if not already_tracing:
+                tracemalloc.start(TRACEBACK_FRAMES)
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            sampler = PeakSampler()
+            sampler.start()
+            try:
+                return profile.runcall(func, *args, **kwargs)
+            finally:
+                _, peak = tracemalloc.get_traced_memory()
+                sampler.stop()
+                if not already_tracing:
+                    tracemalloc.stop()
+                self.save(phase, profile, before, sampler.snapshot or before, peak)
+
+        return profiled
+
+    def save(
+        self,
+        phase: str,
+        profile: cProfile.Profile,
+        before: tracemalloc.Snapshot,
+        at_peak: tracemalloc.Snapshot,
+        peak: int,
+    ) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        prefix = self.prefix(phase)
+        stats = pstats.Stats(profile)
+        stats.dump_stats(prefix.with_suffix(prefix.suffix + ".pstats"))
+        prefix.with_suffix(prefix.suffix + ".folded").write_text(
+            "".join(
+                f"{stack} {microseconds}\n"
+                for stack, microseconds in sorted(collapsed_stacks(stats).items())
+            )
+        )
+        # only what the phase allocated itself
+        growth = allocation_sites(at_peak)
+        growth.subtract(allocation_sites(before))
+        sites = [
+            f"{filename}:{line}: {size / 2**20:.1f} MiB"
+            for (filename, line), size in growth.most_common(TOP_ALLOCATIONS)
+            if size > 0
+        ]
+        memory = [
+            f"peak traced memory: {peak / 2**20:.1f} MiB",
+            "",
+            "allocated by the phase and still live at its peak, by line:",
+            *sites,
+        ]
+        prefix.with_suffix(prefix.suffix + ".memory.txt").write_text(
+            "\n".join(memory) + "\n"
+        )
+        self.reports.append(self.summarize(phase, stats, peak, sites))
+
+    def summarize(
+        self,
+        phase: str,
+        stats: pstats.Stats,
+        peak: int,
+        sites: list[str],
+    ) -> str:
+        table = io.StringIO()
+        stats.stream = table  # type: ignore[attr-defined]
+        stats.sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+        # skip pstats' preamble down to the column headings
+        lines = table.getvalue().splitlines()
+        start = next(i for i, line in enumerate(lines) if "ncalls" in line)
+        top_site = sites[0] if sites else "none in solver code"
+        return "\n".join(
+            [
+                f"== {phase} (saved to {self.prefix(phase)}.*)",
+                *lines[start:],
+                f"peak traced memory {peak / 2**20:.1f} MiB, top site: {top_site}",
+            ]
+        ).rstrip()
@@ -0,0 +1,95 @@
+"""Draw grids for people to look at, but only when someone asked to see them.
+
+Nothing is drawn unless rendering has been switched on, either by `run
+--render` or by setting AOC_RENDER=1 when running a day's script directly, so
+the solvers can call show() unconditionally and pay for a single comparison
+when it's off. When it's on, each frame is built as one buffer and written out
+in one go:
+
+    render.show(grid, {"#": antinodes, "@": robot})
+
+draws the grid with each overlay's cells (a boolean mask or some flat indices)
+replaced by its character. With a directory, frames are saved as PNGs there
+instead of going to the terminal, which is the only sensible way to look at a
+full-size maze.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from aoc.grid import Grid
+from aoc.lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
+
+# 0 draws nothing; the days only use level 1 for now, but leave room for chattier
+LEVEL = int(os.environ.get("AOC_RENDER", "0") or 0)
+# where to save PNG frames, or None to print text ones
+DIRECTORY: Path | None = None
+# pixels per cell in saved frames
+SCALE = 4
+COLORS = {
+    "#": (40, 40, 40),
+    ".": (255, 255, 255),
+    "@": (200, 30, 30),
+    "O": (180, 120, 40),
+    "[": (180, 120, 40),
+    "]": (180, 120, 40),
+    "S": (30, 160, 30),
+    "E": (30, 30, 200),
+}
+
+_frames: dict[str, int] = {}
+
+
+def enable(level: int = 1, directory: Path | None = None) -> None:
+    global LEVEL, DIRECTORY
+    LEVEL = level
+    DIRECTORY = directory
+
+
+def draw(grid: Grid, overlays: dict[str, np.ndarray | int] | None = None) -> Grid:
+    """A copy of the grid with each overlay's cells set to its character"""
+    drawn = grid.copy()
+    for char, where in (overlays or {}).items():
+        where = np.asarray(where)
+        drawn.cells[where.reshape(-1) if where.dtype == bool else where] = ord(char)
+    return drawn
+
+
+def text(grid: Grid) -> str:
+    # a column of newlines on the right turns the whole thing into one buffer
+    newlines = np.full((grid.height, 1), ord("\n"), dtype=np.uint8)
+    return np.hstack([grid.array, newlines]).tobytes().decode()
+
+
+def image(grid: Grid, scale: int = SCALE) -> "Image.Image":
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    codes = np.arange(256)
+    # anything without a color of its own still gets a distinct one
+    palette[:] = np.stack([codes * 67 % 256, codes * 151 % 256, codes * 211 % 256], 1)
+    for char, color in COLORS.items():
+        palette[ord(char)] = color
+    pixels = palette[grid.array].repeat(scale, axis=0).repeat(scale, axis=1)
+    return Image.fromarray(pixels, "RGB")
+
+
+def show(
+    grid: Grid,
+    overlays: dict[str, np.ndarray | int] | None = None,
+    name: str = "frame",
+    level: int = 1,
+) -> None:
+    if LEVEL < level:
+        return
+    drawn = draw(grid, overlays)
+    if DIRECTORY is None:
+        sys.stdout.write(text(drawn))
+        sys.stdout.flush()
+        return
+    number = _frames[name] = _frames.get(name, 0) + 1
+    DIRECTORY.mkdir(parents=True, exist_ok=True)
+    image(drawn).save(DIRECTORY / f"{name}.{number:05}.png")
@@ -0,0 +1,60 @@
+"""What timing a phase gives back, and the tables it's printed as.
+
+This is kept apart from aoc.runner, which imports the solvers' dependencies,
+so that `python -m aoc ask` can print the daemon's answers without importing
+any of them.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class Measurement:
+    phase: str
+    answer: Any
+    wall_time: float
+    cpu_time: float
+    peak_rss: int
+    error: str | None = None
+    cached: bool = False
+    # only filled in when aoc.counters is switched on
+    counters: dict[str, int] | None = None
+    # None for the reference solver
+    engine: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        result = asdict(self)
+        result["answer"] = format_answer(self.answer)
+        return result
+
+
+def format_answer(answer: Any) -> str:
+    if isinstance(answer, (list, tuple)):
+        return ",".join(str(i) for i in answer)
+    return str(answer)
+
+
+def format_table(measurements: list[Measurement]) -> str:
+    rows = [("phase", "answer", "wall (s)", "cpu (s)", "peak rss (MiB)")]
+    for result in measurements:
+        rows.append(
+            (
+                result.phase + (f" ({result.engine})" if result.engine else ""),
+                result.error
+                or format_answer(result.answer)
+                + (" (cached)" if result.cached else ""),
+                f"{result.wall_time:.4f}",
+                f"{result.cpu_time:.4f}",
+                f"{result.peak_rss / 2**20:.1f}",
+            )
+        )
+    return tabulate(rows)
+
+
+def tabulate(rows: list[tuple[str, ...]]) -> str:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
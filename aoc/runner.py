@@ -0,0 +1,413 @@
+"""Find a day's solvers and time them without going through its main()"""
+
+import hashlib
+import importlib
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+from aoc import ROOT, counters, engines, generate, workers
+from aoc.cache import MISS, ModelCache, ResultCache
+from aoc.inputs import InputBuffer, mapped
+from aoc.profiling import Profiler
+from aoc.results import Measurement
+
+# Days whose parts don't follow the plain part_one(puzzle)/part_two(puzzle) shape.
+ADAPTERS: dict[int, dict[str, Callable[[ModuleType, str], Any]]] = {
+    6: {
+        "part 1": lambda module, puzzle: module.part_one(puzzle)[0],
+        # part two needs the squares the guard walked through in part one
+        "part 2": lambda module, puzzle: module.part_two(
+            puzzle, module.part_one(puzzle)[1]
+        ),
+    },
+    # main() strips the trailing newline before handing over the disk map
+    9: {
+        "part 1": lambda module, puzzle: module.part_one(puzzle.strip()),
+        "part 2": lambda module, puzzle: module.part_two(puzzle.strip()),
+    },
+    11: {"part 2": lambda module, puzzle: module.part_one(puzzle, 75)},
+    13: {"part 2": lambda module, puzzle: module.part_one(puzzle, True)},
+}
+
+# day 14 part two writes 10,000 PNG frames into the current directory, so
+# only run it when someone asks for it by name
+WRITES_FILES = {(14, "part 2")}
+
+# how many parsed inputs parse_model() holds on to
+MODEL_CACHE_SIZE = 8
+_models: dict[tuple[Callable[[str], Any], str], Any] = {}
+
+PART_NAMES = (
+    ("part 1", ("part_one", "part1")),
+    ("part 2", ("part_two", "part2")),
+)
+
+
+def load_day(day: int) -> ModuleType:
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    return importlib.import_module(f"day{day:02}")
+
+
+def default_input_path(day: int) -> Path:
+    return ROOT / f"day{day:02}.txt"
+
+
+def example_input(module: ModuleType) -> str:
+    # day 6 spells it TEST_IHPUT
+    for name in ("TEST_INPUT", "TEST_IHPUT"):
+        if (puzzle := getattr(module, name, None)) is not None:
+            return puzzle
+    raise ValueError(f"{module.__name__} has no test input")
+
+
+def find_parts(
+    module: ModuleType, kwargs: dict[str, dict[str, Any]] | None = None
+) -> dict[str, Callable[[str], Any]]:
+    """Map phase names to solvers that take the raw puzzle text.
+
+    Days that solve both parts in a single run_puzzle() call get a single
+    "parts 1+2" phase since there is no way to time the parts separately.
+    Any kwargs for a phase get passed along to its solver.
+    """
+    day = int(module.__name__.removeprefix("day"))
+    overrides = ADAPTERS.get(day, {})
+    if hasattr(module, "run_puzzle"):
+        return {"parts 1+2": module.run_puzzle}
+    parts = {}
+    for phase, names in PART_NAMES:
+        if phase in overrides:
+            parts[phase] = lambda puzzle, solve=overrides[phase]: solve(module, puzzle)
+            continue
+        for name in names:
+            if (func := getattr(module, name, None)) is not None:
+                parts[phase] = partial(func, **(kwargs or {}).get(phase, {}))
+                break
+    if not parts:
+        raise ValueError(f"{module.__name__} has no solvers")
+    return parts
+
+
+def stream_parts(module: ModuleType) -> dict[str, Callable[[InputBuffer], Any]]:
+    """Like find_parts() but for the *_stream solvers that take an InputBuffer"""
+    if hasattr(module, "run_puzzle_stream"):
+        return {"parts 1+2": module.run_puzzle_stream}
+    parts = {}
+    for phase, names in PART_NAMES:
+        for name in names:
+            if (func := getattr(module, f"{name}_stream", None)) is not None:
+                parts[phase] = func
+                break
+    if not parts:
+        raise ValueError(f"{module.__name__} has no streaming solvers")
+    return parts
+
+
+def parsed_parts(module: ModuleType) -> dict[str, Callable[[Any], Any]]:
+    """The *_parsed solvers, which take what parse_input() returns instead of
+    the puzzle text so both parts can share one parse"""
+    if not hasattr(module, "parse_input"):
+        return {}
+    parts = {}
+    for phase, names in PART_NAMES:
+        for name in names:
+            if (func := getattr(module, f"{name}_parsed", None)) is not None:
+                parts[phase] = func
+                break
+    return parts
+
+
+def parse_model(
+    module: ModuleType,
+    puzzle: str,
+    reuse: bool = True,
+    models: ModelCache | None = None,
+) -> Any:
+    """module.parse_input(puzzle), remembered for the last few inputs, and
+    saved to models (if given) for the next run to load.
+
+    Models are shared, so the *_parsed solvers mustn't change them (the days
+    freeze their grids to make sure, and the arrays from models are read-only).
+    """
+    if not reuse:
+        return module.parse_input(puzzle)
+    # keyed on the function itself so reloading the day starts afresh
+    key = (module.parse_input, hashlib.sha256(puzzle.encode()).hexdigest())
+    if key not in _models:
+        if len(_models) >= MODEL_CACHE_SIZE:
+            del _models[next(iter(_models))]
+        model = MISS if models is None else models.get(module, puzzle)
+        if model is MISS:
+            model = module.parse_input(puzzle)
+            if models is not None:
+                models.put(module, puzzle, model)
+        _models[key] = model
+    return _models[key]
+
+
+def only_part(
+    day: int, parts: dict[str, Callable[..., Any]], part: int | None
+) -> dict[str, Callable[..., Any]]:
+    if part is None:
+        # anything that writes files has to be asked for by name
+        return {
+            phase: solve
+            for phase, solve in parts.items()
+            if (day, phase) not in WRITES_FILES
+        }
+    parts = {phase: solve for phase, solve in parts.items() if str(part) in phase}
+    if not parts:
+        raise ValueError(f"day {day} has no part {part}")
+    return parts
+
+
+def reset_caches(module: ModuleType) -> None:
+    """Clear any functools caches so a rerun doesn't get a head start"""
+    for value in vars(module).values():
+        if callable(cache_clear := getattr(value, "cache_clear", None)):
+            cache_clear()
+
+
+def cache_counts(module: ModuleType) -> dict[str, int]:
+    """Hits and misses for the module's functools caches"""
+    counts = {}
+    for name, value in vars(module).items():
+        if callable(cache_info := getattr(value, "cache_info", None)):
+            info = cache_info()
+            counts[f"{module.__name__}.{name}.hits"] = info.hits
+            counts[f"{module.__name__}.{name}.misses"] = info.misses
+            if (evictions := getattr(info, "evictions", None)) is not None:
+                # aoc.memo caches have a budget
+                counts[f"{module.__name__}.{name}.evictions"] = evictions
+    return counts
+
+
+def _reset_peak_rss() -> None:
+    # Linux lets us reset the high water mark so each phase gets its own peak
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def _peak_rss() -> int:
+    """Peak resident set size in bytes"""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, everyone else reports KiB
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(phase: str, func: Callable[..., Any], *args: Any) -> Measurement:
+    counters.reset()
+    _reset_peak_rss()
+    error = None
+    answer = None
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        answer = func(*args)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    cpu_time = time.process_time() - cpu_start
+    wall_time = time.perf_counter() - wall_start
+    result = Measurement(phase, answer, wall_time, cpu_time, _peak_rss(), error)
+    if counters.ENABLED:
+        result.counters = counters.snapshot()
+    return result
+
+
+@dataclass(frozen=True)
+class InputSource:
+    """Where a day's puzzle text comes from: a file, the example, a generator or
+    text that has already been read (e.g. sent over by a client)"""
+
+    path: Path | None = None
+    use_example: bool = False
+    generate_size: int | None = None
+    seed: int = 0
+    text: str | None = None
+
+    @property
+    def name(self) -> str:
+        """Which source this is, to keep what's learned from different ones apart"""
+        if self.text is not None:
+            return "text"
+        if self.use_example:
+            return "example"
+        if self.generate_size is not None:
+            return f"generated size {self.generate_size} seed {self.seed}"
+        if self.path is not None:
+            return str(self.path)
+        return "input"
+
+    def read(self, day: int) -> str:
+        if self.text is not None:
+            return self.text
+        if self.use_example:
+            return example_input(load_day(day))
+        if self.generate_size is not None:
+            return generate.generate(day, self.generate_size, self.seed)
+        return (self.path or default_input_path(day)).read_text()
+
+    @contextmanager
+    def open(self, day: int) -> Iterator[InputBuffer]:
+        """The input as an InputBuffer, memory-mapping it if it's a file"""
+        if self.text is not None or self.use_example or self.generate_size is not None:
+            yield InputBuffer.from_str(self.read(day))
+            return
+        with mapped(self.path or default_input_path(day)) as buffer:
+            yield buffer
+
+    def solver_kwargs(self, day: int) -> dict[str, dict[str, Any]] | None:
+        if self.generate_size is None:
+            return None
+        return generate.solver_kwargs(day, self.generate_size)
+
+
+def solve_phase(
+    module: ModuleType,
+    phase: str,
+    solve: Callable[[str], Any],
+    puzzle: str,
+    kwargs: dict[str, Any] | None = None,
+    cache: ResultCache | None = None,
+) -> Measurement:
+    """Time one phase, going to the cache first if there is one"""
+    day = int(module.__name__.removeprefix("day"))
+    if cache is None or (day, phase) in WRITES_FILES:
+        return measure(phase, solve, puzzle)
+    result = measure(phase, cache.get, module, phase, puzzle, kwargs)
+    if result.answer is not MISS:
+        result.cached = True
+        return result
+    result = measure(phase, solve, puzzle)
+    if not result.error:
+        cache.put(module, phase, puzzle, result.answer, kwargs)
+    return result
+
+
+def run_day(
+    day: int,
+    source: InputSource = InputSource(),
+    part: int | None = None,
+    cache: ResultCache | None = None,
+    profiler: Profiler | None = None,
+    engine: str | None = None,
+    models: ModelCache | None = None,
+) -> list[Measurement]:
+    """Time reading + parsing the input and then each part of the given day.
+
+    engine picks one of the day's registered engines by name, or "auto" to go by
+    the size of the input (see aoc.engines). With models, a day that parses its
+    input once for both parts loads the model from an earlier run instead.
+    """
+    module = load_day(day)
+    parts = only_part(day, find_parts(module, source.solver_kwargs(day)), part)
+    parsed = parsed_parts(module)
+    if engine is not None and engine not in engines.names(module.__name__):
+        choices = ", ".join(sorted(engines.names(module.__name__)))
+        raise engines.EngineError(f"day {day} has no {engine} engine (try {choices})")
+    if profiler is not None or counters.ENABLED:
+        # a cached answer wouldn't tell us anything
+        cache = None
+        models = None
+    model = None
+
+    def read_input() -> str:
+        nonlocal model
+        puzzle = source.read(day)
+        if parsed:
+            # reusing a parse from earlier is as much a cache hit as an answer
+            model = parse_model(module, puzzle, cache is not None, models)
+        elif (parse_input := getattr(module, "parse_input", None)) is not None:
+            parse_input(puzzle)
+        return puzzle
+
+    if profiler is not None:
+        read_input = profiler.wrap("parse", read_input)
+    parsing = measure("parse", read_input)
+    results = [parsing]
+    if parsing.error:
+        return results
+    puzzle = parsing.answer
+    parsing.answer = f"{len(puzzle)} chars"
+    kwargs = source.solver_kwargs(day) or {}
+    for phase, solve in parts.items():
+        chosen = None
+        if engine is not None and not kwargs.get(phase):
+            chosen = engines.choose(module.__name__, phase, engine, len(puzzle))
+        if chosen is not None:
+            solve = chosen.solve
+        elif phase in parsed and not kwargs.get(phase):
+            solve = partial(lambda puzzle, solve: solve(model), solve=parsed[phase])
+        if profiler is not None:
+            solve = profiler.wrap(phase, solve)
+        if counters.ENABLED:
+            # start cold so the hit and miss counts belong to this phase
+            reset_caches(module)
+        # a cached answer could have come from any engine, which would make
+        # asking for one pointless
+        phase_cache = None if chosen is not None else cache
+        result = solve_phase(
+            module, phase, solve, puzzle, kwargs.get(phase), phase_cache
+        )
+        if chosen is not None:
+            result.engine = chosen.name
+        if result.counters is not None:
+            result.counters.update(cache_counts(module))
+        results.append(result)
+    return results
+
+
+def run_day_streaming(
+    day: int,
+    source: InputSource = InputSource(),
+    part: int | None = None,
+    profiler: Profiler | None = None,
+) -> list[Measurement]:
+    """Time the day's streaming solvers over a memory-mapped input.
+
+    There's no parse phase since the streaming solvers parse as they go, and
+    no cache since looking an answer up means hashing the whole input.
+    """
+    module = load_day(day)
+    parts = only_part(day, stream_parts(module), part)
+    if profiler is not None:
+        parts = {phase: profiler.wrap(phase, solve) for phase, solve in parts.items()}
+    with source.open(day) as buffer:
+        return [measure(phase, solve, buffer) for phase, solve in parts.items()]
+
+
+def format_counters(measurements: list[Measurement]) -> str:
+    lines = []
+    for result in measurements:
+        if not result.counters:
+            continue
+        lines.append(f"{result.phase}: {json.dumps(result.counters)}")
+        for name, hits in result.counters.items():
+            if not name.endswith(".hits"):
+                continue
+            cache = name.removesuffix(".hits")
+            if calls := hits + result.counters.get(f"{cache}.misses", 0):
+                lines.append(f"  {cache}: {hits / calls:.1%} hit rate")
+    if lines and workers.mode() == "processes":
+        # counters come back from the workers, but their caches stay there
+        lines.append(
+            "cache hits and misses only cover this process, not the process-pool "
+            "workers"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+"""Graph searches that run straight off grid arrays instead of a networkx graph.
+
+A graph here is a neighbor table: an (n, k) int array where row i lists the
+nodes reachable in one step from node i and -1 marks a missing edge. Grid days
+use flat cell indices as nodes, so building the table is a handful of array
+operations, and days with extra state (like the way a reindeer is facing) pack
+it into the node number themselves.
+"""
+
+import numpy as np
+
+from aoc import counters
+from aoc.grid import Grid
+
+
+def neighbor_table(grid: Grid, allowed: np.ndarray) -> np.ndarray:
+    """(size, 4) table of single steps, where allowed[direction, index] says
+    whether that step may be taken (steps off the grid never can)"""
+    return np.where(allowed & grid.can_step, grid.step_targets, -1).T
+
+
+def open_neighbors(grid: Grid, open_cells: np.ndarray) -> np.ndarray:
+    """Neighbor table for moving between open cells"""
+    return neighbor_table(grid, open_cells[None, :] & open_cells[grid.step_targets])
+
+
+def bfs(neighbors: np.ndarray, sources: int | np.ndarray) -> np.ndarray:
+    """Steps from the nearest source to every node, or -1 if it can't be reached"""
+    distances = np.full(len(neighbors), -1, dtype=np.int64)
+    frontier = np.unique(np.atleast_1d(sources))
+    distances[frontier] = 0
+    level = 0
+    # one whole ring of the search at a time
+    while frontier.size:
+        level += 1
+        reached = neighbors[frontier].ravel()
+        reached = reached[reached >= 0]
+        frontier = np.unique(reached[distances[reached] < 0])
+        distances[frontier] = level
+    if counters.ENABLED:
+        # every node reached gets expanded exactly once
+        counters.add("search.bfs.pops", int((distances >= 0).sum()))
+        counters.add("search.bfs.levels", level)
+    return distances
+
+
+def dijkstra(neighbors: np.ndarray, costs: np.ndarray, source: int) -> np.ndarray:
+    """Cheapest cost to every node, or -1 if it can't be reached.
+
+    costs has the same shape as neighbors and must be small positive ints. With
+    those a ring of buckets (one per possible distance mod the biggest cost)
+    does the job of a heap without any comparisons.
+    """
+    neighbor_lists = neighbors.tolist()
+    cost_lists = costs.tolist()
+    bucket_count = int(costs.max()) + 1
+    buckets: list[list[int]] = [[] for _ in range(bucket_count)]
+    best = [-1] * len(neighbor_lists)
+    done = bytearray(len(neighbor_lists))
+    best[source] = 0
+    buckets[0].append(source)
+    pending = 1
+    pops = 0
+    distance = 0
+    while pending:
+        bucket = buckets[distance % bucket_count]
+        while bucket:
+            node = bucket.pop()
+            pending -= 1
+            pops += 1
+            # a node can be queued more than once when a cheaper way turns up
+            if done[node] or best[node] != distance:
+                continue
+            done[node] = 1
+            for neighbor, cost in zip(neighbor_lists[node], cost_lists[node]):
+                if neighbor < 0:
+                    continue
+                new_distance = distance + cost
+                if best[neighbor] < 0 or new_distance < best[neighbor]:
+                    best[neighbor] = new_distance
+                    buckets[new_distance % bucket_count].append(neighbor)
+                    pending += 1
+        distance += 1
+    if counters.ENABLED:
+        counters.add("search.dijkstra.pops", pops)
+    return np.array(best, dtype=np.int64)
+
+
+def connected_components(neighbors: np.ndarray) -> np.ndarray:
+    """Label each node with its component, numbered from 1.
+
+    The table has to be symmetric (an undirected graph) for these to be real
+    components.
+    """
+    neighbor_lists = neighbors.tolist()
+    labels = [0] * len(neighbor_lists)
+    label = 0
+    for seed in range(len(neighbor_lists)):
+        if labels[seed]:
+            continue
+        label += 1
+        labels[seed] = label
+        stack = [seed]
+        while stack:
+            node = stack.pop()
+            for neighbor in neighbor_lists[node]:
+                if neighbor >= 0 and not labels[neighbor]:
+                    labels[neighbor] = label
+                    stack.append(neighbor)
+    return np.array(labels, dtype=np.int64)
+
+
+def shortest_path_dag(
+    neighbors: np.ndarray, costs: np.ndarray | int, distances: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """The (from, to) edges that lie on some shortest path from the source.
+
+    distances is what bfs() or dijkstra() returned for that source; pass
+    costs=1 for a bfs() result.
+    """
+    sources = np.repeat(np.arange(len(neighbors)), neighbors.shape[1])
+    targets = neighbors.ravel()
+    edge_costs = np.broadcast_to(costs, neighbors.shape).ravel()
+    real = (targets >= 0) & (distances[sources] >= 0)
+    sources, targets, edge_costs = sources[real], targets[real], edge_costs[real]
+    tight = distances[sources] + edge_costs == distances[targets]
+    return sources[tight], targets[tight]
+
+
+def on_shortest_paths(
+    neighbors: np.ndarray,
+    costs: np.ndarray | int,
+    distances: np.ndarray,
+    goals: int | np.ndarray,
+) -> np.ndarray:
+    """Boolean array of the nodes on any shortest path from the source to the goals"""
+    sources, targets = shortest_path_dag(neighbors, costs, distances)
+    # walk the DAG backwards from the goals
+    order = np.argsort(targets, kind="stable")
+    sources, targets = sources[order], targets[order]
+    starts = np.searchsorted(targets, np.arange(len(neighbors) + 1))
+    seen = np.zeros(len(neighbors), dtype=bool)
+    frontier = np.unique(np.atleast_1d(goals))
+    frontier = frontier[distances[frontier] >= 0]
+    seen[frontier] = True
+    while frontier.size:
+        previous = np.concatenate(
+            [sources[starts[node] : starts[node + 1]] for node in frontier]
+        )
+        frontier = np.unique(previous[~seen[previous]])
+        seen[frontier] = True
+    return seen
@@ -0,0 +1,130 @@
+"""Hand a parsed model to process-pool workers through shared memory.
+
+Pickling a day's model into every task means copying its grid over and over:
+day 6 would send the whole lab along with each chunk of candidate obstacles.
+Instead, sharing() copies every NumPy array in the model (a Grid's cells, or a
+bare array, anywhere inside its tuples) into multiprocessing.shared_memory
+once, and hands back the same model with each array swapped for a handle of a
+few dozen bytes. Workers call attach() on that to get the model back, with
+read-only arrays over the same memory, so a task costs its handle and its own
+chunk of work to send.
+
+The segments are unlinked when the sharing() block ends, however it ends, and
+anything still around when the interpreter exits goes too. If the process is
+killed outright, multiprocessing's resource tracker unlinks them (and warns).
+"""
+
+import atexit
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Iterator, NamedTuple
+
+import numpy as np
+
+from aoc.grid import Grid
+
+# attached models each worker holds on to, so a worker that gets several
+# chunks of the same model only maps it once (their memory isn't freed until
+# they're dropped from here, or the pool shuts down)
+ATTACHED_LIMIT = 8
+
+
+class SharedArray(NamedTuple):
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class SharedGrid(NamedTuple):
+    array: SharedArray
+
+
+# segments this process created, by name
+_owned: dict[str, shared_memory.SharedMemory] = {}
+# handle -> (the segments it's mapped from, the model rebuilt from them)
+_attached: dict[Any, tuple[list[shared_memory.SharedMemory], Any]] = {}
+
+
+def share_array(array: np.ndarray, created: list[str]) -> SharedArray:
+    # a zero-byte segment isn't allowed
+    segment = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    _owned[segment.name] = segment
+    created.append(segment.name)
+    copy = np.ndarray(array.shape, array.dtype, buffer=segment.buf)
+    copy[...] = array
+    return SharedArray(segment.name, array.shape, array.dtype.str)
+
+
+def share(model: Any, created: list[str]) -> Any:
+    """The model with its arrays moved into shared memory, adding the names of
+    the segments it made to created"""
+    if isinstance(model, Grid):
+        return SharedGrid(share_array(model.array, created))
+    if isinstance(model, np.ndarray):
+        return share_array(model, created)
+    if isinstance(model, tuple):
+        return tuple(share(item, created) for item in model)
+    # ints, strings and the like are small enough to pickle
+    return model
+
+
+def release(names: list[str]) -> None:
+    for name in names:
+        if (segment := _owned.pop(name, None)) is not None:
+            segment.close()
+            segment.unlink()
+
+
+@atexit.register
+def release_all() -> None:
+    release(list(_owned))
+
+
+@contextmanager
+def sharing(model: Any) -> Iterator[Any]:
+    """A handle for the model, which workers can attach() to until the block ends"""
+    created: list[str] = []
+    try:
+        yield share(model, created)
+    finally:
+        # including whatever share() made before failing partway
+        release(created)
+
+
+def rebuild(handle: Any, segments: list[shared_memory.SharedMemory]) -> Any:
+    if isinstance(handle, SharedGrid):
+        return Grid(rebuild(handle.array, segments))
+    if isinstance(handle, SharedArray):
+        segment = shared_memory.SharedMemory(name=handle.name)
+        segments.append(segment)
+        array = np.ndarray(handle.shape, np.dtype(handle.dtype), buffer=segment.buf)
+        array.flags.writeable = False
+        return array
+    if isinstance(handle, tuple):
+        return tuple(rebuild(item, segments) for item in handle)
+    return handle
+
+
+def attach(handle: Any) -> Any:
+    """The model behind a handle from share(), read-only"""
+    if (attached := _attached.get(handle)) is not None:
+        return attached[1]
+    if len(_attached) >= ATTACHED_LIMIT:
+        detach(next(iter(_attached)))
+    segments: list[shared_memory.SharedMemory] = []
+    model = rebuild(handle, segments)
+    _attached[handle] = segments, model
+    return model
+
+
+def detach(handle: Any) -> None:
+    segments, model = _attached.pop(handle)
+    # the arrays have to go before the memory under them can be unmapped
+    del model
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            # something still has hold of an array, so leave it mapped until
+            # that's gone
+            pass
@@ -0,0 +1,74 @@
+"""How long each day takes to import from cold.
+
+Every day is imported in a fresh interpreter under python -X importtime, which
+writes one line per module to stderr:
+
+    import time: self [us] | cumulative | imported package
+
+The day's own line carries the cumulative time for everything it pulled in, and
+the heaviest of the rest say where that time went. Anything over the budget
+fails `python -m aoc imports`, which is how a top-level `import networkx`
+sneaking back into a day gets caught.
+"""
+
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+from aoc import ROOT
+
+# numpy on its own is most of this
+DEFAULT_BUDGET = 0.2
+TOP_MODULES = 5
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+@dataclass
+class ImportReport:
+    day: int
+    # seconds, including everything the day imports
+    cumulative: float
+    # (module, seconds) for the most expensive top-level imports underneath it
+    heaviest: list[tuple[str, float]] = field(default_factory=list)
+
+
+def import_report(day: int) -> ImportReport:
+    module = f"day{day:02}"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = 0.0
+    children: dict[str, float] = {}
+    for line in process.stderr.splitlines():
+        if not (match := IMPORT_TIME_LINE.match(line)):
+            continue
+        _, total, indent, name = match.groups()
+        if name == module:
+            cumulative = int(total) / 1e6
+            break
+        if len(indent) == 1:
+            # a module's imports are listed just before it, so anything so far
+            # belonged to interpreter startup
+            children.clear()
+        elif len(indent) == 3:
+            children[name] = int(total) / 1e6
+    heaviest = sorted(children.items(), key=lambda item: -item[1])[:TOP_MODULES]
+    return ImportReport(day, cumulative, heaviest)
+
+
+def format_reports(reports: list[ImportReport], budget: float) -> str:
+    lines = [f"{'day':<5}  {'import (s)':>10}  heaviest imports"]
+    for report in reports:
+        heaviest = ", ".join(
+            f"{name} {seconds:.3f}" for name, seconds in report.heaviest
+        )
+        flag = "  OVER BUDGET" if report.cumulative > budget else ""
+        lines.append(
+            f"{report.day:<5}  {report.cumulative:>10.4f}  {heaviest or '-'}{flag}"
+        )
+    return "\n".join(lines)
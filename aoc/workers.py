@@ -0,0 +1,172 @@
+"""Spread independent pieces of a day's work across threads or processes.
+
+Some days do the same thing to every item in a list: every candidate obstacle
+in day 6, every line in day 7, every buyer in day 22. map_chunks() splits the
+items into chunks and runs a function on each one, and the caller combines the
+results (usually by adding them up).
+
+It's serial unless more than one worker has been asked for (run --workers, or
+AOC_WORKERS when running a day's script directly). Then on a free-threaded
+interpreter (python3.13t) the chunks go to a thread pool, which shares the
+day's data with no copying at all; with the GIL in the way threads wouldn't
+help, so they go to a process pool instead, at the cost of pickling each chunk
+and its arguments over to the workers. map_shared() avoids most of that for a
+parsed model that every chunk needs, like day 6's grid: the model goes into
+shared memory once (see aoc.shared) and each chunk only carries a handle to it.
+
+With counting on (see aoc.counters), each process-pool worker sends back what
+it counted along with its chunk's result, and the counts are added up here.
+"""
+
+import atexit
+import os
+import sys
+from contextlib import contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, TypeVar
+
+from aoc import counters
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+T = TypeVar("T")
+R = TypeVar("R")
+M = TypeVar("M")
+
+WORKERS = int(os.environ.get("AOC_WORKERS", "1") or 1)
+# more chunks than workers so one slow chunk doesn't hold everyone up
+CHUNKS_PER_WORKER = 4
+# inputs (in characters) below about this size are over before a process pool
+# has finished starting, so the parallel engines leave them alone
+MIN_PARALLEL_SIZE = 10_000
+
+_executor: "Executor | None" = None
+
+
+def free_threaded() -> bool:
+    # sys._is_gil_enabled() is new in 3.13, and anything older has a GIL
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def mode() -> str:
+    if WORKERS <= 1:
+        return "serial"
+    return "threads" if free_threaded() else "processes"
+
+
+def enable(workers: int | None = None) -> None:
+    """Use this many workers from now on (all the CPUs if not given)"""
+    global WORKERS
+    shutdown()
+    WORKERS = workers or os.cpu_count() or 1
+
+
+@contextmanager
+def using(workers: int | None = None) -> Iterator[None]:
+    """Use this many workers (all the CPUs if not given) just for a while"""
+    previous = WORKERS
+    enable(workers)
+    try:
+        yield
+    finally:
+        enable(previous)
+
+
+def can_help() -> bool:
+    return (os.cpu_count() or 1) > 1
+
+
+# while the modules are all still there, since a process pool that's left to
+# be garbage collected during interpreter shutdown complains about it
+@atexit.register
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def executor() -> "Executor":
+    global _executor
+    if _executor is None:
+        # imported here so that importing a day doesn't pay for it
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor if free_threaded() else ProcessPoolExecutor
+        _executor = pool(max_workers=WORKERS)
+    return _executor
+
+
+def map_chunks(func: Callable[[list[T]], R], items: Iterable[T]) -> list[R]:
+    """func applied to chunks of the items, in order.
+
+    Running serially, func gets the items just as they were passed in, so a
+    generator stays a generator.
+    """
+    if WORKERS <= 1:
+        return [func(items)]  # type: ignore[arg-type]
+    items = list(items)
+    chunks = chunks_of(items)
+    if len(chunks) <= 1:
+        return [func(items)]
+    return run_chunks(func, chunks)
+
+
+def map_shared(
+    func: Callable[[M, list[T]], R], model: M, items: Iterable[T]
+) -> list[R]:
+    """func(model, chunk) for chunks of the items, in order, with a process
+    pool's workers getting the model through shared memory"""
+    if mode() != "processes":
+        # threads share it anyway
+        return map_chunks(partial(func, model), items)
+    items = list(items)
+    chunks = chunks_of(items)
+    if len(chunks) <= 1:
+        return [func(model, items)]
+    # imported here so that importing a day doesn't pay for it
+    from aoc import shared
+
+    with shared.sharing(model) as handle:
+        # every chunk has to be done before the block ends and takes the
+        # memory away
+        return run_chunks(partial(call_attached, func, handle), chunks)
+
+
+def run_chunks(func: Callable[[list[T]], R], chunks: list[list[T]]) -> list[R]:
+    """func applied to each chunk on the pool, in order"""
+    if mode() != "processes" or not counters.ENABLED:
+        # threads count straight into this process's counters
+        return list(executor().map(func, chunks))
+    results = []
+    for result, counts in executor().map(partial(call_counted, func), chunks):
+        for name, amount in counts.items():
+            counters.add(name, amount)
+        results.append(result)
+    return results
+
+
+def call_counted(
+    func: Callable[[list[T]], R], chunk: list[T]
+) -> tuple[R, dict[str, int]]:
+    """Runs in a worker process: func(chunk) and what it counted"""
+    counters.enable()
+    counters.reset()
+    try:
+        return func(chunk), counters.snapshot()
+    finally:
+        counters.enable(False)
+
+
+def chunks_of(items: list[T]) -> list[list[T]]:
+    size = max(1, -(-len(items) // (WORKERS * CHUNKS_PER_WORKER)))
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def call_attached(func: Callable[[M, list[T]], R], handle: object, chunk: list[T]) -> R:
+    """Runs in a worker, with the model a handle from aoc.shared stands for"""
+    from aoc import shared
+
+    return func(shared.attach(handle), chunk)
@@ -1,5 +1,17 @@
+import math
+import tempfile
 from collections import Counter
+from contextlib import contextmanager
+from functools import reduce
 from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from aoc import external
+from aoc.engines import engine
+from aoc.inputs import InputBuffer
+from aoc.parsing import fixed_columns, ints
 
 TEST_INPUT = """3   4
 4   3
@@ -9,29 +21,129 @@ TEST_INPUT = """3   4
 3   3"""
 
 
-def parse_input(puzzle: str) -> tuple[list[int], list[int]]:
-    list0 = []
-    list1 = []
-    for line in puzzle.splitlines():
-        entries = line.split()
-        list0.append(int(entries[0]))
-        list1.append(int(entries[1]))
-    return list0, list1
+def parse_input(puzzle: str) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    pairs = ints(puzzle, columns=2)
+    return tuple(pairs[:, 0].tolist()), tuple(pairs[:, 1].tolist())
 
 
-def part1(puzzle: str) -> int:
-    list0, list1 = parse_input(puzzle)
-    list0.sort()
-    list1.sort()
-    return sum(abs(a - b) for a, b in zip(list0, list1))
+def part1_parsed(lists: tuple[tuple[int, ...], tuple[int, ...]]) -> int:
+    list0, list1 = lists
+    return sum(abs(a - b) for a, b in zip(sorted(list0), sorted(list1)))
 
 
-def part2(puzzle: str) -> int:
-    list0, list1 = parse_input(puzzle)
+def part2_parsed(lists: tuple[tuple[int, ...], tuple[int, ...]]) -> int:
+    list0, list1 = lists
     counts = Counter(list1)
     return sum(a * counts.get(a, 0) for a in list0)
 
 
+def part1(puzzle: str) -> int:
+    return part1_parsed(parse_input(puzzle))
+
+
+def part2(puzzle: str) -> int:
+    return part2_parsed(parse_input(puzzle))
+
+
+def columns(puzzle: str | bytes) -> tuple[np.ndarray, np.ndarray]:
+    """Both lists as int64 arrays"""
+    pairs = fixed_columns(puzzle, 2)
+    if pairs is None:
+        # not laid out in neat columns, so find the numbers the slow way
+        pairs = ints(puzzle, columns=2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def total(*factors: np.ndarray) -> int:
+    """The sum of the factors multiplied together, exactly, even when that
+    would be too big for int64"""
+    bound = math.prod(float(np.abs(factor).max(initial=0)) for factor in factors)
+    if bound * len(factors[0]) < 2**63:
+        return int(reduce(np.multiply, factors).sum())
+    return sum(math.prod(term) for term in zip(*(f.tolist() for f in factors)))
+
+
+@engine("part 1", "numpy")
+def part1_numpy(puzzle: str) -> int:
+    left, right = columns(puzzle)
+    # sorted copies, which leaves room to work out the distances in place
+    left, right = np.sort(left), np.sort(right)
+    left -= right
+    return total(np.abs(left, out=left))
+
+
+@engine("part 2", "numpy")
+def part2_numpy(puzzle: str) -> int:
+    left, right = columns(puzzle)
+    values, left_counts = np.unique(left, return_counts=True)
+    right_values, right_counts = np.unique(right, return_counts=True)
+    # where each number on the left would be among the ones on the right
+    found = np.minimum(np.searchsorted(right_values, values), len(right_values) - 1)
+    matches = right_values[found] == values
+    return total(values[matches], left_counts[matches], right_counts[found[matches]])
+
+
+@contextmanager
+def sorted_columns(
+    buffer: InputBuffer,
+) -> Iterator[tuple[Iterator[np.ndarray], Iterator[np.ndarray]]]:
+    """Both lists, each streamed back in order a block at a time. Anything too
+    big to sort in memory goes through run files in a temporary directory,
+    which is gone once the block ends."""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directory:
+        left = external.RunWriter(Path(directory), "left")
+        right = external.RunWriter(Path(directory), "right")
+        for chunk in buffer.chunks():
+            left_chunk, right_chunk = columns(chunk)
+            left.add(left_chunk)
+            right.add(right_chunk)
+        yield external.merge(left.finish()), external.merge(right.finish())
+
+
+def part1_stream(buffer: InputBuffer) -> int:
+    # both lists come back in blocks of the same length, so the nth blocks
+    # line up
+    with sorted_columns(buffer) as (left, right):
+        return sum(total(np.abs(a - b)) for a, b in zip(left, right, strict=True))
+
+
+def part2_stream(buffer: InputBuffer) -> int:
+    # a merge join: walk both sorted lists together, a block of distinct values
+    # at a time, and pair up the counts of the values on both sides
+    with sorted_columns(buffer) as (left, right):
+        left_counts = external.counted(left)
+        right_counts = external.counted(right)
+        score = 0
+        left_values = left_times = right_values = right_times = np.zeros(0, int)
+        while True:
+            # once either side runs out, what's left of the other has nothing
+            # to match
+            if not len(left_values):
+                if (pair := next(left_counts, None)) is None:
+                    return score
+                left_values, left_times = pair
+            if not len(right_values):
+                if (pair := next(right_counts, None)) is None:
+                    return score
+                right_values, right_times = pair
+            # one side or the other gets used up each time round
+            bound = min(left_values[-1], right_values[-1])
+            left_end = np.searchsorted(left_values, bound, side="right")
+            right_end = np.searchsorted(right_values, bound, side="right")
+            common, left_index, right_index = np.intersect1d(
+                left_values[:left_end],
+                right_values[:right_end],
+                assume_unique=True,
+                return_indices=True,
+            )
+            score += total(common, left_times[left_index], right_times[right_index])
+            left_values, left_times = left_values[left_end:], left_times[left_end:]
+            right_values, right_times = (
+                right_values[right_end:],
+                right_times[right_end:],
+            )
+
+
 def main():
     test_result = part1(TEST_INPUT)
     assert test_result == 11, test_result
@@ -1,4 +1,8 @@
 from pathlib import Path
+from typing import Iterator
+
+from aoc.inputs import InputBuffer
+from aoc.parsing import int_lines
 
 TEST_INPUT = """7 6 4 2 1
 1 2 7 8 9
@@ -9,7 +13,7 @@ TEST_INPUT = """7 6 4 2 1
 
 
 def parse_input(puzzle: str) -> list[list[int]]:
-    return [[int(char) for char in line.split()] for line in puzzle.splitlines()]
+    return int_lines(puzzle)
 
 
 def is_safe(level: list[int]) -> bool:
@@ -26,19 +30,32 @@ def part_one(puzzle: str) -> int:
     return sum(is_safe(level) for level in readings)
 
 
+def is_safe_with_dampener(level: list[int]) -> bool:
+    if is_safe(level):
+        return True
+    for index in range(0, len(level) + 1):
+        if is_safe(level[:index] + level[index + 1 :]):
+            return True
+    return False
+
+
 def part_two(puzzle: str) -> int:
     readings = parse_input(puzzle=puzzle)
-    total = 0
-    for level in readings:
-        if is_safe(level):
-            total += 1
-            continue
-        for index in range(0, len(level) + 1):
-            if is_safe(level[:index] + level[index + 1 :]):
-                total += 1
-                break
-
-    return total
+    return sum(is_safe_with_dampener(level) for level in readings)
+
+
+def stream_readings(buffer: InputBuffer) -> Iterator[list[int]]:
+    for line in buffer.lines():
+        if line:
+            yield [int(reading) for reading in line.split()]
+
+
+def part_one_stream(buffer: InputBuffer) -> int:
+    return sum(is_safe(level) for level in stream_readings(buffer))
+
+
+def part_two_stream(buffer: InputBuffer) -> int:
+    return sum(is_safe_with_dampener(level) for level in stream_readings(buffer))
 
 
 def main():
@@ -1,7 +1,11 @@
 import re
 from pathlib import Path
 
+from aoc.inputs import InputBuffer
+
 MUL_REGEX = re.compile(r"mul\((\d\d?\d?),(\d\d?\d?)\)")
+# the same thing plus the switches, for scanning bytes in one pass
+INSTRUCTION_REGEX = re.compile(rb"mul\((\d\d?\d?),(\d\d?\d?)\)|do\(\)|don't\(\)")
 
 
 TEST_INPUT = "xmul(2,4)%&mul[3,7]!@^do_not_mul(5,5)+mul(32,64]then(mul(11,8)mul(8,5))"
@@ -38,6 +42,27 @@ def part2(puzzle: str) -> int:
     return part1(stripped)
 
 
+def part1_stream(buffer: InputBuffer) -> int:
+    total = 0
+    for match in INSTRUCTION_REGEX.finditer(buffer.data):
+        if match[1] is not None:
+            total += int(match[1]) * int(match[2])
+    return total
+
+
+def part2_stream(buffer: InputBuffer) -> int:
+    total = 0
+    enabled = True
+    for match in INSTRUCTION_REGEX.finditer(buffer.data):
+        if match[0] == b"do()":
+            enabled = True
+        elif match[0] == b"don't()":
+            enabled = False
+        elif enabled:
+            total += int(match[1]) * int(match[2])
+    return total
+
+
 def main():
     test_result = part1(puzzle=TEST_INPUT)
     assert test_result == 161, test_result
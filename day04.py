@@ -1,5 +1,9 @@
 from pathlib import Path
 
+import numpy as np
+
+from aoc.grid import Grid, shift
+
 TEST_INPUT = """MMMSXXMASM
 MSAMXMSMSA
 AMXSXMAAMM
@@ -12,85 +16,44 @@ MAMMMXMMMM
 MXMXAXMASX"""
 
 
-def find_horizontal(lines: list[str]) -> int:
-    return sum(line.count("XMAS") + line.count("SAMX") for line in lines)
-
-
-def find_vertical(lines: list[str]) -> int:
-    transposed = ["".join(line[y] for line in lines) for y in range(len(lines[0]))]
-
-    return find_horizontal(transposed)
-
-
-def find_diagonal(lines: list[str]) -> int:
-    min_x = 0
-    min_y = 0
-    max_x = len(lines[0])
-    max_y = len(lines)
-    ok_x = range(min_x, max_x)
-    ok_y = range(min_y, max_y)
-    total = 0
-    for y, line in enumerate(lines):
-        if "X" in line:
-            for x, char in enumerate(line):
-                if char == "X":
-                    for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1)]:
-                        if (
-                            (d2x := x + dx) in ok_x
-                            and (d2y := y + dy) in ok_y
-                            and lines[d2y][d2x] == "M"
-                            and (d3x := d2x + dx) in ok_x
-                            and (d3y := d2y + dy) in ok_y
-                            and lines[d3y][d3x] == "A"
-                            and (d4x := d3x + dx) in ok_x
-                            and (d4y := d3y + dy) in ok_y
-                            and lines[d4y][d4x] == "S"
-                        ):
-                            total += 1
-    return total
+def count_word(grid: Grid, word: str, dx: int, dy: int) -> np.ndarray:
+    """Boolean array of where the word starts reading in the given direction"""
+    found = np.ones_like(grid.array, dtype=bool)
+    for distance, char in enumerate(word):
+        found &= shift(grid.array, dx * distance, dy * distance) == ord(char)
+    return found
 
 
 def part_one(puzzle: str) -> int:
-    grid = puzzle.splitlines()
-    return find_horizontal(grid) + find_vertical(grid) + find_diagonal(grid)
+    grid = Grid.from_str(puzzle)
+    return sum(
+        int(count_word(grid, "XMAS", dx, dy).sum())
+        for dx, dy in [
+            (1, 0),
+            (-1, 0),
+            (0, 1),
+            (0, -1),
+            (1, 1),
+            (1, -1),
+            (-1, 1),
+            (-1, -1),
+        ]
+    )
 
 
 def part_two(puzzle: str) -> int:
-    lines = puzzle.splitlines()
-    min_x = 0
-    min_y = 0
-    max_x = len(lines[0])
-    max_y = len(lines)
-    ok_x = range(min_x, max_x)
-    ok_y = range(min_y, max_y)
-    total = 0
-    match_patterns = {"MMSS", "SSMM", "MSMS", "SMSM"}
-    for y, line in enumerate(lines):
-        if "A" in line:
-            for x, char in enumerate(line):
-                if char == "A":
-                    xw = x - 1
-                    xe = x + 1
-                    yn = y - 1
-                    ys = y + 1
-                    if (
-                        xw in ok_x
-                        and xe in ok_x
-                        and yn in ok_x
-                        and ys in ok_y
-                        and "".join(
-                            (
-                                lines[yn][xw],
-                                lines[yn][xe],
-                                lines[ys][xw],
-                                lines[ys][xe],
-                            )
-                        )
-                        in match_patterns
-                    ):
-                        total += 1
-
-    return total
+    grid = Grid.from_str(puzzle)
+    # corners read NW, NE, SW, SE
+    corners = np.stack(
+        [shift(grid.array, dx, dy) for dx, dy in [(-1, -1), (1, -1), (-1, 1), (1, 1)]],
+        axis=-1,
+    )
+    found = np.zeros_like(grid.array, dtype=bool)
+    for pattern in ["MMSS", "SSMM", "MSMS", "SMSM"]:
+        found |= np.all(
+            corners == np.frombuffer(pattern.encode(), dtype=np.uint8), axis=-1
+        )
+    return int((found & (grid.array == ord("A"))).sum())
 
 
 def main():
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from aoc.parsing import int_lines, ints
+
 TEST_INPUT = """47|53
 97|13
 97|61
@@ -32,11 +34,8 @@ TEST_INPUT = """47|53
 
 def parse_input(puzzle: str) -> tuple[set[tuple[int, int]], list[list[int]]]:
     prereqs, raw_pages = puzzle.split("\n\n")
-    pages = [[int(i) for i in line.split(",")] for line in raw_pages.splitlines()]
-    graph = set()
-    for line in prereqs.splitlines():
-        source, dest = (int(i) for i in line.split("|"))
-        graph.add((source, dest))
+    pages = int_lines(raw_pages)
+    graph = {(source, dest) for source, dest in ints(prereqs, columns=2).tolist()}
     return graph, pages
 
 
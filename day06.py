@@ -1,5 +1,11 @@
 from pathlib import Path
 
+import numpy as np
+
+from aoc import counters, jit, workers
+from aoc.engines import engine
+from aoc.grid import EAST, NORTH, SOUTH, WEST, Grid
+
 TEST_IHPUT = """....#.....
 .........#
 ..........
@@ -12,82 +18,189 @@ TEST_IHPUT = """....#.....
 ......#..."""
 
 
-# returns grid, position, bearing, max_x, min_y
-def parse_input(puzzle: str) -> tuple[set[complex], complex, complex, int, int]:
-    grid = set()
-    max_x = 0
-    max_y = 0
-    for y, line in enumerate(puzzle.splitlines()):
-        if y > max_y:
-            max_y = y
-        for x, char in enumerate(line):
-            if x > max_x:
-                max_x = x
-            if char == "#":
-                grid.add(x - 1j * y)
-            elif char == "^":
-                # up
-                bearing = 1j
-                position = x - 1j * y
-            elif char == ">":
-                bearing = 1j
-                position = x - 1j * y
-            elif char == "<":
-                bearing = -1 + 0j
-                position = x - 1j * y
-            elif char == "v":
-                bearing = -1j
-                position = x - 1j * y
-    return grid, position, bearing, max_x, -max_y
-
-
-def turn_right(bearing: complex) -> complex:
-    return bearing * -1j
-
-
-def part_one(
-    puzzle: str, added_obstacle: complex | None = None
-) -> tuple[int, set[complex]]:
-    grid, position, bearing, max_x, min_y = parse_input(puzzle)
-    if added_obstacle:
-        grid.add(added_obstacle)
-    min_x = max_y = 0
-    ok_x = range(min_x, max_x + 1)
-    ok_y = range(min_y, max_y + 1)
-    positions_seen: set[tuple[complex, complex]] = set()
-    while int(position.real) in ok_x and int(position.imag) in ok_y:
+BEARINGS = {"^": NORTH, ">": EAST, "v": SOUTH, "<": WEST}
+
+
+# returns grid (read-only), position, bearing
+def parse_input(puzzle: str) -> tuple[Grid, int, int]:
+    grid = Grid.from_str(puzzle)
+    (position,) = grid.find("".join(BEARINGS))
+    bearing = BEARINGS[grid.char(position)]
+    return grid.freeze(), int(position), bearing
+
+
+def turn_right(bearing: int) -> int:
+    return (bearing + 1) % 4
+
+
+def walk(grid: Grid, position: int, bearing: int, blocked: np.ndarray) -> set[int]:
+    """Every square the guard visits before leaving the grid"""
+    can_step = grid.can_step
+    offsets = [int(offset) for offset in grid.offsets]
+    # one flag per square and bearing, much cheaper than a set of tuples
+    positions_seen = bytearray(grid.size * 4)
+    while True:
         # is there something in front of us?
-        while position + bearing in grid:
+        while can_step[bearing, position] and blocked[position + offsets[bearing]]:
             # note in part 2 there can be corners, so we need to check multiple turns in a row
             bearing = turn_right(bearing)
-        if (position, bearing) in positions_seen:
+        state = position * 4 + bearing
+        if positions_seen[state]:
             raise InfiniteLoopError()
-        positions_seen.add((position, bearing))
-        position += bearing
-    locations = set(pos for pos, _ in positions_seen)
-    return len(locations), locations
+        positions_seen[state] = 1
+        if not can_step[bearing, position]:
+            break
+        position += offsets[bearing]
+    if counters.ENABLED:
+        # every step lands on a new square and bearing
+        counters.add("day06.steps", sum(positions_seen))
+    seen = np.frombuffer(positions_seen, dtype=np.uint8).reshape(-1, 4).any(axis=1)
+    return set(np.flatnonzero(seen).tolist())
 
 
-def part_two(puzzle: str, places_visited_in_part_one: set[complex]) -> int:
-    _, position, _, _, _ = parse_input(puzzle)
-    candidates = set()
-    for candidate in places_visited_in_part_one:
-        if candidate == position:
-            continue
+def loops_among(lab: tuple[Grid, int, int], candidates: list[int]) -> int:
+    grid, position, bearing = lab
+    # our own copy, since the model's grid is shared (with other workers too)
+    blocked = grid.mask("#")
+    loops = 0
+    for candidate in candidates:
+        blocked[candidate] = True
         try:
-            part_one(puzzle, candidate)
+            walk(grid, position, bearing, blocked)
         except InfiniteLoopError:
-            candidates.add(candidate)
-    # if puzzle == TEST_IHPUT:
-    #     print(candidates)
-    return len(candidates)
+            loops += 1
+        blocked[candidate] = False
+    return loops
+
+
+def count_loops(lab: tuple[Grid, int, int], candidates: set[int]) -> int:
+    _, position, _ = lab
+    # every candidate can be checked on its own, and a process pool gets the
+    # grid through shared memory rather than a copy with every chunk
+    return sum(workers.map_shared(loops_among, lab, sorted(candidates - {position})))
+
+
+def part_one_parsed(lab: tuple[Grid, int, int]) -> int:
+    grid, position, bearing = lab
+    return len(walk(grid, position, bearing, grid.mask("#")))
+
+
+def part_two_parsed(lab: tuple[Grid, int, int]) -> int:
+    grid, position, bearing = lab
+    # only squares on the guard's original route are worth blocking
+    return count_loops(lab, walk(grid, position, bearing, grid.mask("#")))
+
+
+def part_one(puzzle: str, added_obstacle: int | None = None) -> tuple[int, set[int]]:
+    grid, position, bearing = parse_input(puzzle)
+    blocked = grid.mask("#")
+    if added_obstacle is not None:
+        blocked[added_obstacle] = True
+    locations = walk(grid, position, bearing, blocked)
+    return len(locations), locations
+
+
+def part_two(puzzle: str, places_visited_in_part_one: set[int]) -> int:
+    return count_loops(parse_input(puzzle), places_visited_in_part_one)
+
+
+@engine(
+    "part 2",
+    "parallel",
+    min_size=workers.MIN_PARALLEL_SIZE,
+    available=workers.can_help,
+)
+def part_two_parallel(puzzle: str) -> int:
+    with workers.using():
+        return part_two_parsed(parse_input(puzzle))
+
+
+# The same walks as above, over arrays only, so numba can compile them. They
+# can't call each other (a kernel is only compiled once it's called), which is
+# why the loop counter has its own copy of the walk.
+@jit.njit
+def walk_kernel(
+    can_step: np.ndarray,
+    offsets: np.ndarray,
+    blocked: np.ndarray,
+    position: int,
+    bearing: int,
+) -> np.ndarray:
+    """seen[square * 4 + bearing] for every square and bearing the guard
+    passes through on the way out"""
+    seen = np.zeros(blocked.size * 4, dtype=np.bool_)
+    while True:
+        while can_step[bearing, position] and blocked[position + offsets[bearing]]:
+            bearing = (bearing + 1) % 4
+        state = position * 4 + bearing
+        if seen[state]:
+            # a loop, which part one never has
+            return seen
+        seen[state] = True
+        if not can_step[bearing, position]:
+            return seen
+        position += offsets[bearing]
+
+
+@jit.njit
+def loops_kernel(
+    can_step: np.ndarray,
+    offsets: np.ndarray,
+    blocked: np.ndarray,
+    position: int,
+    bearing: int,
+    candidates: np.ndarray,
+) -> int:
+    # which candidate's walk last went through each square and bearing, so the
+    # flags never need clearing
+    seen = np.zeros(blocked.size * 4, dtype=np.int64)
+    loops = 0
+    for turn in range(candidates.size):
+        blocked[candidates[turn]] = True
+        square = position
+        facing = bearing
+        while True:
+            while can_step[facing, square] and blocked[square + offsets[facing]]:
+                facing = (facing + 1) % 4
+            state = square * 4 + facing
+            if seen[state] == turn + 1:
+                loops += 1
+                break
+            seen[state] = turn + 1
+            if not can_step[facing, square]:
+                break
+            square += offsets[facing]
+        blocked[candidates[turn]] = False
+    return loops
+
+
+def visited_by_kernel(lab: tuple[Grid, int, int]) -> np.ndarray:
+    grid, position, bearing = lab
+    seen = walk_kernel(grid.can_step, grid.offsets, grid.mask("#"), position, bearing)
+    return np.flatnonzero(seen.reshape(-1, 4).any(axis=1))
+
+
+@engine("part 1", "numba", available=jit.available)
+def part_one_numba(puzzle: str) -> int:
+    return len(visited_by_kernel(parse_input(puzzle)))
+
+
+@engine("part 2", "numba", available=jit.available)
+def part_two_numba(puzzle: str) -> int:
+    lab = parse_input(puzzle)
+    grid, position, bearing = lab
+    visited = visited_by_kernel(lab)
+    candidates = visited[visited != position]
+    return loops_kernel(
+        grid.can_step, grid.offsets, grid.mask("#"), position, bearing, candidates
+    )
 
 
 def main():
-    assert turn_right(1j) == 1 + 0j
-    assert turn_right(1 + 0j) == -1j
-    assert turn_right(-1j) == -1 + 0j
-    assert turn_right(-1 + 0j) == 1j
+    assert turn_right(NORTH) == EAST
+    assert turn_right(EAST) == SOUTH
+    assert turn_right(SOUTH) == WEST
+    assert turn_right(WEST) == NORTH
     part_one_test_result, paths_seen_test = part_one(TEST_IHPUT)
     assert part_one_test_result == 41, part_one_test_result
     real_input = Path("day06.txt").read_text()
@@ -1,6 +1,13 @@
+from functools import partial
 from itertools import product
 from operator import mul, add
 from pathlib import Path
+from typing import Iterable, Iterator
+
+from aoc import counters, workers
+from aoc.engines import engine
+from aoc.inputs import InputBuffer
+from aoc.parsing import int_lines
 
 TEST_INPUT = """190: 10 19
 3267: 81 40 27
@@ -17,50 +24,85 @@ def concat(a: int, b: int) -> int:
     return int(str(a) + str(b))
 
 
-def part_one(puzzle: str) -> int:
-    total = 0
-    operators = [mul, add]
-    for line in puzzle.splitlines():
-        result, operands = line.split(": ")
-        result = int(result)
-        operands = [int(i) for i in operands.split()]
-        for operations in product(operators, repeat=len(operands) - 1):
-            running_total = 0
-            for index, operator in enumerate(operations):
-                if index:
-                    running_total = operator(running_total, operands[index + 1])
-                else:
-                    running_total = operator(operands[0], operands[1])
-                if running_total > result:
-                    break
-            if running_total == result:
-                total += result
-                # don't try other options for this line
+def parse_input(puzzle: str) -> list[tuple[int, list[int]]]:
+    return [(result, operands) for result, *operands in int_lines(puzzle)]
+
+
+def can_make(result: int, operands: list[int], operators: list) -> bool:
+    found = False
+    tried = 0
+    for operations in product(operators, repeat=len(operands) - 1):
+        tried += 1
+        running_total = 0
+        for index, operator in enumerate(operations):
+            if index:
+                running_total = operator(running_total, operands[index + 1])
+            else:
+                running_total = operator(operands[0], operands[1])
+            if running_total > result:
                 break
-    return total
+        if running_total == result:
+            # don't try other options for this line
+            found = True
+            break
+    if counters.ENABLED:
+        counters.add("day07.combinations", tried)
+    return found
+
+
+def solvable_total(operators, equations: Iterable[tuple[int, list[int]]]) -> int:
+    return sum(
+        result
+        for result, operands in equations
+        if can_make(result, operands, operators)
+    )
+
+
+def calibration_total(equations: Iterable[tuple[int, list[int]]], operators) -> int:
+    # every line is independent of the others
+    return sum(workers.map_chunks(partial(solvable_total, operators), equations))
+
+
+def stream_equations(buffer: InputBuffer) -> Iterator[tuple[int, list[int]]]:
+    for line in buffer.lines():
+        if line:
+            result, operands = line.split(b": ")
+            yield int(result), [int(i) for i in operands.split()]
+
+
+def part_one_parsed(equations: list[tuple[int, list[int]]]) -> int:
+    return calibration_total(equations, [mul, add])
+
+
+def part_two_parsed(equations: list[tuple[int, list[int]]]) -> int:
+    return calibration_total(equations, [mul, add, concat])
+
+
+def part_one(puzzle: str) -> int:
+    return part_one_parsed(parse_input(puzzle))
 
 
 def part_two(puzzle: str) -> int:
-    total = 0
-    operators = [mul, add, concat]
-    for line in puzzle.splitlines():
-        result, operands = line.split(": ")
-        result = int(result)
-        operands = [int(i) for i in operands.split()]
-        for operations in product(operators, repeat=len(operands) - 1):
-            running_total = 0
-            for index, operator in enumerate(operations):
-                if index:
-                    running_total = operator(running_total, operands[index + 1])
-                else:
-                    running_total = operator(operands[0], operands[1])
-                if running_total > result:
-                    break
-            if running_total == result:
-                total += result
-                # don't try other options for this line
-                break
-    return total
+    return part_two_parsed(parse_input(puzzle))
+
+
+@engine(
+    "part 2",
+    "parallel",
+    min_size=workers.MIN_PARALLEL_SIZE,
+    available=workers.can_help,
+)
+def part_two_parallel(puzzle: str) -> int:
+    with workers.using():
+        return part_two(puzzle)
+
+
+def part_one_stream(buffer: InputBuffer) -> int:
+    return calibration_total(stream_equations(buffer), [mul, add])
+
+
+def part_two_stream(buffer: InputBuffer) -> int:
+    return calibration_total(stream_equations(buffer), [mul, add, concat])
 
 
 def main():
@@ -1,5 +1,10 @@
 from pathlib import Path
 
+import numpy as np
+
+from aoc import render
+from aoc.grid import Grid
+
 TEST_INPUT = """............
 ........0...
 .....0......
@@ -15,104 +20,50 @@ TEST_INPUT = """............
 """
 
 
-def display_grid_with_antinodes(
-    grid: dict[str, list[tuple[int, int]]], antinodes: set[tuple[int, int]]
-):
-
-    max_y = max(y for _, y in antinodes)
-    max_x = max(x for x, _ in antinodes)
-    base_displays: dict[tuple[int, int], str] = {}
-    for char, nodes in grid.items():
-        max_x = max(max_x, max(x for x, _ in nodes))
-        max_y = max(max_y, max(y for _, y in nodes))
-        for node in nodes:
-            base_displays[node] = char
-    for y in range(max_y + 1):
-        print("")
-        for x in range(max_x + 1):
-            print(
-                base_displays.get((x, y), "#" if (x, y) in antinodes else "."),
-                end="",
-            )
-    print("")
+def parse_input(puzzle: str) -> tuple[Grid, dict[str, np.ndarray]]:
+    """The grid plus an (n, 2) array of x, y coordinates for each frequency"""
+    grid = Grid.from_str(puzzle)
+    antennas: dict[str, np.ndarray] = {}
+    for value in np.unique(grid.cells):
+        char = chr(value)
+        if char not in "#.":
+            ys, xs = np.nonzero(grid.array == value)
+            antennas[char] = np.stack([xs, ys], axis=1)
+    return grid, antennas
 
 
-def parse_input(puzzle: str) -> tuple[int, int, dict[str, list[tuple[int, int]]]]:
-    grid: dict[str, list[tuple[int, int]]] = {}
-    max_y = 0
-    max_x = 0
-    for y, line in enumerate(puzzle.splitlines()):
-        if y > max_y:
-            max_y = y
-        for x, char in enumerate(line):
-            if x > max_x:
-                max_x = x
-            if char not in "#.":
-                try:
-                    grid[char].append((x, y))
-                except KeyError:
-                    grid[char] = [(x, y)]
-    return max_x, max_y, grid
+def mark(antinodes: np.ndarray, points: np.ndarray) -> None:
+    height, width = antinodes.shape
+    xs, ys = points[..., 0].ravel(), points[..., 1].ravel()
+    on_grid = (0 <= xs) & (xs < width) & (0 <= ys) & (ys < height)
+    antinodes[ys[on_grid], xs[on_grid]] = True
 
 
 def part_one(puzzle: str) -> int:
-    max_x, max_y, grid = parse_input(puzzle)
-    ok_x = range(max_x + 1)
-    ok_y = range(max_y + 1)
-    antinodes: set[tuple[int, int]] = set()
-    for _, nodes in grid.items():
-        for index, (x, y) in enumerate(nodes):
-            other_nodes = nodes[index + 1 :]
-            for xa, ya in other_nodes:
-                dx = xa - x
-                dy = ya - y
-                xb = x + dx * 2
-                yb = y + dy * 2
-                xc = xa - dx * 2
-                yc = ya - dy * 2
-                if xb in ok_x and yb in ok_y:
-                    antinodes.add((xb, yb))
-                if xc in ok_x and yc in ok_y:
-                    antinodes.add((xc, yc))
-    if puzzle == TEST_INPUT:
-        display_grid_with_antinodes(grid, antinodes)
-    return len(antinodes)
+    grid, antennas = parse_input(puzzle)
+    antinodes = np.zeros_like(grid.array, dtype=bool)
+    for nodes in antennas.values():
+        # every ordered pair of antennas, including each one with itself
+        # (which lands back on the antenna, so skip those)
+        points = 2 * nodes[None, :, :] - nodes[:, None, :]
+        points = points[~np.eye(len(nodes), dtype=bool)]
+        mark(antinodes, points)
+    render.show(grid, {"#": antinodes.ravel() & grid.mask(".")}, "day08")
+    return int(antinodes.sum())
 
 
 def part_two(puzzle: str) -> int:
-    max_x, max_y, grid = parse_input(puzzle)
-    ok_x = range(max_x + 1)
-    ok_y = range(max_y + 1)
-    antinodes: set[tuple[int, int]] = set()
-    for _, nodes in grid.items():
-        for index, (x, y) in enumerate(nodes):
-            other_nodes = nodes[index + 1 :]
-            for xa, ya in other_nodes:
-                dx = xa - x
-                dy = ya - y
-                xb = x + dx
-                yb = y + dy
-                xc = xa - dx
-                yc = ya - dy
-                while True:
-                    if xb in ok_x and yb in ok_y:
-                        antinodes.add((xb, yb))
-                    if xc in ok_x and yc in ok_y:
-                        antinodes.add((xc, yc))
-                    xb += dx
-                    yb += dy
-                    xc -= dx
-                    yc -= dy
-                    if (
-                        xb not in ok_x
-                        and yb not in ok_y
-                        and xc not in ok_x
-                        and yc not in ok_y
-                    ):
-                        break
-    if puzzle == TEST_INPUT:
-        display_grid_with_antinodes(grid, antinodes)
-    return len(antinodes)
+    grid, antennas = parse_input(puzzle)
+    antinodes = np.zeros_like(grid.array, dtype=bool)
+    # enough steps in either direction to run off any side of the grid
+    steps = np.arange(-max(grid.width, grid.height), max(grid.width, grid.height) + 1)
+    for nodes in antennas.values():
+        for index, start in enumerate(nodes):
+            deltas = nodes[index + 1 :] - start
+            points = start + steps[:, None, None] * deltas[None, :, :]
+            mark(antinodes, points)
+    render.show(grid, {"#": antinodes.ravel() & grid.mask(".")}, "day08")
+    return int(antinodes.sum())
 
 
 def main():
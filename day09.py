@@ -80,9 +80,10 @@ def rearrange_whole_files(disk_layout: Sequence[int | None]) -> list[int | None]
     return checksum(disk_layout)
 
 
-def part_one(puzzle: str) -> int:
-    disk_layout = []
-    for index, char in enumerate(puzzle):
+def parse_input(puzzle: str) -> tuple[int | None, ...]:
+    """Each block on the disk: the number of the file in it, or None if it's free"""
+    disk_layout: list[int | None] = []
+    for index, char in enumerate(puzzle.strip()):
         value = int(char)
         is_free_space = bool(index % 2)
         file_number = index // 2
@@ -90,20 +91,25 @@ def part_one(puzzle: str) -> int:
             disk_layout += [None] * value
         else:
             disk_layout += [file_number] * value
-    return rearrange_individual_blocks(disk_layout)
+    return tuple(disk_layout)
+
+
+def part_one_parsed(disk_layout: tuple[int | None, ...]) -> int:
+    # rearranging moves blocks around in place, so it gets a copy of the layout
+    return rearrange_individual_blocks(list(disk_layout))
+
+
+def part_two_parsed(disk_layout: tuple[int | None, ...]) -> int:
+    # likewise
+    return rearrange_whole_files(list(disk_layout))
+
+
+def part_one(puzzle: str) -> int:
+    return part_one_parsed(parse_input(puzzle))
 
 
 def part_two(puzzle: str) -> int:
-    disk_layout = []
-    for index, char in enumerate(puzzle):
-        value = int(char)
-        is_free_space = bool(index % 2)
-        file_number = index // 2
-        if is_free_space:
-            disk_layout += [None] * value
-        else:
-            disk_layout += [file_number] * value
-    return rearrange_whole_files(disk_layout)
+    return part_two_parsed(parse_input(puzzle))
 
 
 def main():
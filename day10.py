@@ -1,6 +1,9 @@
 from pathlib import Path
 
-import networkx
+import numpy as np
+
+from aoc.grid import Grid
+from aoc.search import bfs, neighbor_table
 
 TEST_INPUT = """89010123
 78121874
@@ -13,38 +16,22 @@ TEST_INPUT = """89010123
 
 
 def run_puzzle(puzzle: str) -> tuple[int, int]:
-    grid = networkx.DiGraph()
-    zeroes: set[tuple[int, int]] = set()
-    nines: set[tuple[int, int]] = set()
-    ints = [[int(char) for char in line.strip()] for line in puzzle.splitlines()]
-    for y, line in enumerate(ints):
-        for x, value in enumerate(line):
-            if value == 0:
-                zeroes.add((x, y))
-            elif value == 9:
-                nines.add((x, y))
-            for x1, y1 in [
-                (x + 1, y),
-                (x - 1, y),
-                (x, y + 1),
-                (x, y - 1),
-            ]:
-                if x1 < 0 or y1 < 0:
-                    continue
-                try:
-                    if ints[y1][x1] - value == 1:
-                        grid.add_edge((x, y), (x1, y1))
-                except IndexError:
-                    pass
+    grid = Grid.from_str(puzzle)
+    heights = grid.cells.astype(np.int64) - ord("0")
+    # a trail only ever goes up by exactly one
+    uphill = neighbor_table(grid, heights[grid.step_targets] - heights[None, :] == 1)
+    zeroes = np.flatnonzero(heights == 0)
+    nines = heights == 9
     p1_total = 0
-    p2_total = 0
-    for x, y in zeroes:
-        for x1, y1 in nines:
-            paths = list(networkx.all_simple_paths(grid, (x, y), (x1, y1)))
-            # if puzzle == TEST_INPUT:
-            #     print(f"found {len(paths)} path(s) from {x}, {y} to {x1}, {y1}")
-            p2_total += len(paths)
-            p1_total += bool(paths)
+    for zero in zeroes:
+        p1_total += int((nines & (bfs(uphill, zero) >= 0)).sum())
+    # every step goes up, so count the ways to finish from the top down
+    paths = nines.astype(np.int64)
+    for height in range(8, -1, -1):
+        level = np.flatnonzero(heights == height)
+        steps = uphill[level]
+        paths[level] = np.where(steps >= 0, paths[steps], 0).sum(axis=1)
+    p2_total = int(paths[zeroes].sum())
     return p1_total, p2_total
 
 
@@ -1,18 +1,24 @@
 from collections import Counter, defaultdict
 from pathlib import Path
 
+from aoc.memo import memoize
+
 TEST_INPUT = """125 17"""
 
 
-def replace_stone(stone: int) -> list[int]:
+# cache our stone results so we know how repeat stones work. The cache has a
+# budget, so a bunch of distinct stones can't get us OOM killed; the worst that
+# happens is working some of them out twice
+@memoize()
+def replace_stone(stone: int) -> tuple[int, ...]:
     if stone == 0:
-        return [1]
+        return (1,)
     if (length := len(str(stone))) % 2 == 0:
 
         left = str(stone)[: length // 2]
         right = str(stone)[length // 2 :]
-        return [int(left), int(right)]
-    return [stone * 2024]
+        return int(left), int(right)
+    return (stone * 2024,)
 
 
 def part_one(puzzle: str, turns: int = 25) -> int:
@@ -22,20 +28,10 @@ def part_one(puzzle: str, turns: int = 25) -> int:
     # repeat, so if you have 20 seven times and 24 three times, you'd end up with
     # ten copies of 2, seven copies of 0, and three copies of 4
     stones = Counter(int(i) for i in puzzle.split())
-    # cache our stone results so we know how repeat stones work
-    # yeah I could use functools.lru_cache() on the replacement function but this ensures
-    # we'll keep everything even if we get a bunch of distinct stones at the risk of an OOM
-    # kill (didn't happen to me)
-    stone_map: dict[str, list[int]] = {}
     for _ in range(turns):
         new_stones = defaultdict(int)
         for stone, count in stones.items():
-            try:
-                replacements = stone_map[stone]
-            except KeyError:
-                stone_map[stone] = replace_stone(stone)
-                replacements = stone_map[stone]
-            for replacement in replacements:
+            for replacement in replace_stone(stone):
                 new_stones[replacement] += count
         stones = new_stones
     return sum(stones.values())
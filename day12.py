@@ -1,8 +1,9 @@
-from math import sqrt
-from collections import Counter, defaultdict
 from pathlib import Path
 
-import networkx
+import numpy as np
+
+from aoc.grid import DIRECTIONS, Grid, shift
+from aoc.search import connected_components, neighbor_table
 
 TEST_INPUT = """RRRRIICCFF
 RRRRIICCCF
@@ -16,113 +17,46 @@ MIIISIJEEE
 MMMISSJEEE"""
 
 
-def price(points: list[tuple[int, int]]) -> float:
-    per = 0
-    point_set = set(points)
-    for x, y in point_set:
-        point_perimeter = 4
-        for neighbor in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
-            if neighbor in point_set:
-                point_perimeter -= 1
-        per += point_perimeter
-    return per * len(points)
+def label_regions(grid: Grid) -> np.ndarray:
+    """2D array numbering each region from 1, so 0 can mean off the grid"""
+    same_plant = neighbor_table(
+        grid, grid.cells[grid.step_targets] == grid.cells[None, :]
+    )
+    return connected_components(same_plant).reshape(grid.height, grid.width)
+
+
+def same_region(labels: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    return shift(labels, dx, dy) == labels
+
+
+def total_price(labels: np.ndarray, edges: np.ndarray) -> int:
+    """Sum of area times the edges (perimeter or sides) of every region"""
+    area = np.bincount(labels.ravel())
+    per_region = np.bincount(labels.ravel(), weights=edges.ravel())
+    return int((area * per_region).sum())
 
 
 def part_one(puzzle: str) -> int:
-    grid = puzzle.splitlines()
-    graph = networkx.Graph()
-    polygons: list[tuple[str, list[tuple[int, int]]]] = []
-    for y, line in enumerate(grid):
-        for x, char in enumerate(line):
-            current_char = char
-            for x1, y1 in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
-                if x1 >= 0 and y1 >= 0:
-                    try:
-                        char2 = grid[y1][x1]
-                    except IndexError:
-                        continue
-                    if char2 != current_char:
-                        continue
-                    graph.add_edge((x1, y1), (x, y))
-    max_y = len(grid)
-    max_x = len(grid[0])
-    nodes_seen = set()
-    for y in range(max_y):
-        for x in range(max_x):
-            if (x, y) in nodes_seen:
-                continue
-            nodes_seen.add((x, y))
-            try:
-                polygon = networkx.descendants(graph, (x, y)) | {(x, y)}
-            except networkx.exception.NetworkXError as exc:
-                if "is not in the graph" not in str(exc):
-                    raise
-                polygon = {(x, y)}
-            nodes_seen |= polygon
-            polygons.append((grid[y][x], sorted(polygon)))
-    prices = defaultdict(int)
-    for char, polygon in polygons:
-        prices[char] += price(polygon)
-    total = sum(prices.values())
-    return total
-
-
-def sides(points: set[tuple[int, int]], x: int, y: int) -> int:
-    result = 0
-    # Outer corners
-    result += (x - 1, y) not in points and (x, y - 1) not in points
-    result += (x + 1, y) not in points and (x, y - 1) not in points
-    result += (x - 1, y) not in points and (x, y + 1) not in points
-    result += (x + 1, y) not in points and (x, y + 1) not in points
-    # Inner corners
-    result += (
-        (x - 1, y) in points and (x, y - 1) in points and (x - 1, y - 1) not in points
-    )
-    result += (
-        (x + 1, y) in points and (x, y - 1) in points and (x + 1, y - 1) not in points
-    )
-    result += (
-        (x - 1, y) in points and (x, y + 1) in points and (x - 1, y + 1) not in points
-    )
-    result += (
-        (x + 1, y) in points and (x, y + 1) in points and (x + 1, y + 1) not in points
+    labels = label_regions(Grid.from_str(puzzle))
+    perimeter = 4 - sum(
+        same_region(labels, dx, dy).astype(np.int64) for dx, dy in DIRECTIONS
     )
-    return result
+    return total_price(labels, perimeter)
 
 
 def part_two(puzzle: str) -> int:
-    grid = puzzle.splitlines()
-    graph = networkx.Graph()
-    total = 0
-    for y, line in enumerate(grid):
-        for x, char in enumerate(line):
-            current_char = char
-            for x1, y1 in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
-                if x1 >= 0 and y1 >= 0:
-                    try:
-                        char2 = grid[y1][x1]
-                    except IndexError:
-                        continue
-                    if char2 != current_char:
-                        continue
-                    graph.add_edge((x1, y1), (x, y))
-    max_y = len(grid)
-    max_x = len(grid[0])
-    nodes_seen = set()
-    for y in range(max_y):
-        for x in range(max_x):
-            if (x, y) in nodes_seen:
-                continue
-            nodes_seen.add((x, y))
-            try:
-                polygon = networkx.descendants(graph, (x, y)) | {(x, y)}
-            except networkx.exception.NetworkXError as exc:
-                if "is not in the graph" not in str(exc):
-                    raise
-                polygon = {(x, y)}
-            nodes_seen |= polygon
-            total += sum(sides(polygon, x, y) for x, y in polygon) * len(polygon)
-    return total
+    labels = label_regions(Grid.from_str(puzzle))
+    # a region has as many sides as it has corners
+    corners = np.zeros_like(labels)
+    for dx, dy in [(-1, -1), (1, -1), (-1, 1), (1, 1)]:
+        beside = same_region(labels, dx, 0)
+        above_or_below = same_region(labels, 0, dy)
+        diagonal = same_region(labels, dx, dy)
+        # Outer corners
+        corners += ~beside & ~above_or_below
+        # Inner corners
+        corners += beside & above_or_below & ~diagonal
+    return total_price(labels, corners)
 
 
 def main():
@@ -4,6 +4,8 @@ from typing import Self
 
 import numpy as np
 
+from aoc.parsing import ints
+
 A_COST = 3
 B_COST = 1
 MAX_PRESSES = 100
@@ -38,34 +40,22 @@ class ClawGame:
 
     @classmethod
     def from_str(cls, puzzle: str, is_part_two: bool = False) -> Self:
-        lines = puzzle.splitlines()
-        kwargs = {}
-        for line in lines:
-            if line.startswith("Button "):
-                button_info, coords = line.split(": ")
-                button = button_info[-1].casefold()
-                x_movement, y_movement = coords.split(", ")
-                if x_movement[1] == "+":
-                    kwargs[f"{button}_x"] = int(x_movement[2:])
-                else:
-                    kwargs[f"{button}_x"] = int(x_movement[1:])
-                if y_movement[1] == "+":
-                    kwargs[f"{button}_y"] = int(y_movement[2:])
-                else:
-                    kwargs[f"{button}_y"] = int(y_movement[1:])
-            elif line.startswith("Prize:"):
-                prize_info = line.split(": ")[1]
-                x_prize, y_prize = prize_info.split(", ")
-                kwargs["prize_x"] = int(x_prize[2:]) + (10000000000000 * is_part_two)
-                kwargs["prize_y"] = int(y_prize[2:]) + (10000000000000 * is_part_two)
-            else:
-                raise ValueError(f"unknown line {line}")
-        assert set(kwargs) == {"a_x", "b_x", "a_y", "b_y", "prize_x", "prize_y"}, kwargs
-        return cls(**kwargs)
+        (numbers,) = ints(puzzle, columns=6).tolist()
+        return cls.from_ints(numbers, is_part_two)
+
+    @classmethod
+    def from_ints(cls, numbers: list[int], is_part_two: bool = False) -> Self:
+        a_x, a_y, b_x, b_y, prize_x, prize_y = numbers
+        prize_offset = 10000000000000 * is_part_two
+        return cls(a_x, a_y, b_x, b_y, prize_x + prize_offset, prize_y + prize_offset)
 
 
 def parse_input(puzzle: str, is_part_two: bool = False) -> list[ClawGame]:
-    return [ClawGame.from_str(group, is_part_two) for group in puzzle.split("\n\n")]
+    # Button A: X+94, Y+34 / Button B: X+22, Y+67 / Prize: X=8400, Y=5400
+    return [
+        ClawGame.from_ints(numbers, is_part_two)
+        for numbers in ints(puzzle, columns=6).tolist()
+    ]
 
 
 def part_one(puzzle: str, is_part_two: bool = False) -> int:
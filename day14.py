@@ -1,6 +1,10 @@
 from pathlib import Path
 
-from PIL import Image
+from aoc.lazy import lazy_import
+from aoc.parsing import ints
+
+# only part two draws anything
+Image = lazy_import("PIL.Image")
 
 TEST_INPUT = """p=0,4 v=3,-3
 p=6,3 v=-1,-3
@@ -23,13 +27,7 @@ REAL_HEIGHT = 103
 
 
 def parse_input(puzzle: str) -> list[tuple[tuple[int, int], tuple[int, int]]]:
-    result = []
-    for line in puzzle.splitlines():
-        p_info, v_info = line.split()
-        position = tuple(int(i) for i in p_info[2:].split(","))
-        velocity = tuple(int(i) for i in v_info[2:].split(","))
-        result.append((position, velocity))
-    return result
+    return [((x, y), (dx, dy)) for x, y, dx, dy in ints(puzzle, columns=4).tolist()]
 
 
 def move_robot(
@@ -46,10 +44,17 @@ def move_robot(
     return final_x, final_y
 
 
-def part_one(puzzle: str, turns: int = 100) -> int:
+def part_one(
+    puzzle: str,
+    turns: int = 100,
+    width: int | None = None,
+    height: int | None = None,
+) -> int:
     robots = parse_input(puzzle)
-    width = TEST_WIDTH if puzzle == TEST_INPUT else REAL_WIDTH
-    height = TEST_HEIGHT if puzzle == TEST_INPUT else REAL_HEIGHT
+    if width is None:
+        width = TEST_WIDTH if puzzle == TEST_INPUT else REAL_WIDTH
+    if height is None:
+        height = TEST_HEIGHT if puzzle == TEST_INPUT else REAL_HEIGHT
     positions_by_quadrant = {"nw": 0, "sw": 0, "ne": 0, "se": 0}
     mid_x = width // 2
     mid_y = height // 2
@@ -85,7 +90,12 @@ def part_one(puzzle: str, turns: int = 100) -> int:
     )
 
 
-def part_two(puzzle: str, turns: int = 10000) -> None:
+def part_two(
+    puzzle: str,
+    turns: int = 10000,
+    width: int = REAL_WIDTH,
+    height: int = REAL_HEIGHT,
+) -> None:
     robots = parse_input(puzzle)
     # use 1-based because we're rendering the state at the start of the next turn
     for turn in range(1, turns + 1):
@@ -93,11 +103,12 @@ def part_two(puzzle: str, turns: int = 10000) -> None:
         # new transparent image
         # render into a movie by running
         # ffmpeg -framerate 60 -pattern_type glob -i '*.png' -c:v libx264 -pix_fmt yuv420p day14.mp4
-        image = Image.new("RGBA", (104, 104), (255, 255, 255, 0))
+        side = max(width, height) + 1
+        image = Image.new("RGBA", (side, side), (255, 255, 255, 0))
         new_robots = []
         pixels_to_draw: set[tuple[int, int]] = set()
         for position, bearing in robots:
-            new_position = move_robot(position, bearing, REAL_WIDTH, REAL_HEIGHT, 1)
+            new_position = move_robot(position, bearing, width, height, 1)
             pixels_to_draw.add(new_position)
             new_robots.append((new_position, bearing))
         for pixel in pixels_to_draw:
@@ -1,11 +1,16 @@
 from pathlib import Path
 
+import numpy as np
+
+from aoc import jit, render
+from aoc.engines import engine
+from aoc.grid import EAST, NORTH, SOUTH, WEST, Grid
 
 MOVES = {
-    ">": (1, 0),
-    "<": (-1, 0),
-    "^": (0, -1),
-    "v": (0, 1),
+    ">": EAST,
+    "<": WEST,
+    "^": NORTH,
+    "v": SOUTH,
 }
 
 SMALL_INPUT = """########
@@ -53,274 +58,212 @@ vvv<<^>^v^^><<>>><>^<<><^vv^^<>vvv<>><^^v>^>vv<>v<<<<v<^v>^<^^>>>^<v<v
 v^^>>><<^^<>>^v^<v^vv<>v^<<>^<^v^v><^<<<><<^<v><v<>vv>>v><v^<vv<>v^<<^"""
 
 
-def parse_input(puzzle: str) -> tuple[
-    dict[tuple[int, int], str],
-    tuple[int, int],
-    list[tuple[int, int]],
-]:
-    raw_grid, raw_moves = puzzle.split("\n\n")
-    moves = [MOVES[char] for char in raw_moves if char in MOVES]
-    grid = {}
-    for y, row in enumerate(raw_grid.splitlines()):
-        for x, char in enumerate(row):
-            if char == "@":
-                robot = (x, y)
-            elif char == ".":
-                continue
-            else:
-                grid[x, y] = char
-    return grid, robot, moves
+BOX = ord("O")
+WALL = ord("#")
+EMPTY = ord(".")
+LEFT_EDGE = ord("[")
+RIGHT_EDGE = ord("]")
 
+# what each square turns into when everything but the robot is twice as wide
+WIDEN = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 2, axis=1)
+WIDEN[BOX] = [LEFT_EDGE, RIGHT_EDGE]
 
-def parse_input_p2(puzzle: str) -> tuple[
-    dict[tuple[int, int], str],
-    tuple[int, int],
-    list[tuple[int, int]],
-]:
+
+def parse_input(puzzle: str) -> tuple[Grid, int, tuple[int, ...]]:
+    """The warehouse (read-only, so copy it before moving anything), the robot's
+    square and its moves"""
     raw_grid, raw_moves = puzzle.split("\n\n")
-    moves = [MOVES[char] for char in raw_moves if char in MOVES]
-    grid = {}
-    for y, row in enumerate(raw_grid.splitlines()):
-        for x, char in enumerate(row):
-            if char == "@":
-                robot = (2 * x, y)
-            elif char == ".":
-                continue
-            else:
-                if char == "#":
-                    grid[2 * x, y] = "#"
-                    grid[2 * x + 1, y] = "#"
-                else:
-                    assert char == "O"
-                    grid[2 * x, y] = "["
-                    grid[2 * x + 1, y] = "]"
-    return grid, robot, moves
-
-
-def make_move(
-    grid: dict[tuple[int, int]],
-    robot_position: tuple[int, int],
-    next_move: tuple[int, int],
-) -> tuple[int, int]:
+    moves = tuple(MOVES[char] for char in raw_moves if char in MOVES)
+    grid = Grid.from_str(raw_grid)
+    robot = grid.find_one("@")
+    # the robot is tracked separately, so the square it's on is empty
+    grid.cells[robot] = EMPTY
+    return grid.freeze(), robot, moves
+
+
+def widen(grid: Grid, robot: int) -> tuple[Grid, int]:
+    wide = Grid(WIDEN[grid.array].reshape(grid.height, grid.width * 2))
+    x, y = grid.coords(robot)
+    return wide, wide.index(x * 2, y)
+
+
+def make_move(grid: Grid, robot_position: int, next_move: int) -> int:
     """Move the robot and any boxes adjacent to it in the given direction as long as it is possible"""
-    x, y = robot_position
-    dx, dy = next_move
-    next_char = grid.get((x + dx, y + dy))
-    if next_char is None:
+    offset = int(grid.offsets[next_move])
+    next_char = grid.cells[robot_position + offset]
+    if next_char == EMPTY:
         # yay empty space
-        return x + dx, y + dy
-    if next_char == "#":
+        return robot_position + offset
+    if next_char == WALL:
         # wall, do nothing
-        return x, y
-    if dy == 0:
-        if dx == -1:
-            return move_left(grid, robot_position, False), y
-        return move_right(grid, robot_position, False), y
-    if dy == -1:
-        return x, move_up(grid, robot_position, False)
-    return x, move_down(grid, robot_position, False)
-
-
-def move_left(
-    grid: dict[tuple[int, int], str],
-    robot: tuple[int, int],
-    dry_run: bool = False,
-) -> int:
-    x, y = robot
-    next_left = grid.get((x - 1, y))
-    if next_left is None:
-        # yay
-        return x - 1
-    if next_left == "#":
+        return robot_position
+    if next_move in (EAST, WEST):
+        return move_horizontal(grid.cells, robot_position, offset)
+    return move_vertical(grid.cells, robot_position, offset)
+
+
+def move_horizontal(cells: np.ndarray, robot: int, offset: int) -> int:
+    # walk past the whole row of boxes, big or small, to see what's behind it
+    end = robot + offset
+    while cells[end] in (BOX, LEFT_EDGE, RIGHT_EDGE):
+        end += offset
+    if cells[end] == WALL:
         # boo
-        return x
-    if next_left == "O":
-        # it's a block
-        pretend_move = move_left(grid, (x - 1, y), dry_run=True)
-        if pretend_move == x - 1:
-            # can't move
-            return x
-        if not dry_run:
-            move_left(grid, (x - 1, y), False)
-            del grid[x - 1, y]
-            grid[x - 2, y] = "O"
-        return x - 1
-    if next_left == "]":
-        # it's a big block
-        # look past that block and pretend the robot is there
-        pretend_move = move_left(grid, (x - 2, y), dry_run=True)
-        if pretend_move == x - 2:
-            # can't move
-            return x
-        if not dry_run:
-            move_left(grid, (x - 2, y), False)
-            # move the box
-            del grid[x - 2, y]
-            del grid[x - 1, y]
-            grid[x - 3, y] = "["
-            grid[x - 2, y] = "]"
-        return x - 1
-    raise ValueError("this should never happen")
-
-
-def move_right(
-    grid: dict[tuple[int, int], str],
-    robot: tuple[int, int],
-    dry_run: bool = False,
+        return robot
+    # slide every box one square along, starting from the far end
+    for index in range(end, robot + offset, -offset):
+        cells[index] = cells[index - offset]
+    cells[robot + offset] = EMPTY
+    return robot + offset
+
+
+def move_vertical(cells: np.ndarray, robot: int, offset: int) -> int:
+    # big boxes can push two boxes each, so work out everything that moves
+    # one row at a time before touching anything
+    to_move: list[int] = []
+    row = {robot}
+    while row:
+        next_row = set()
+        for index in row:
+            ahead = index + offset
+            char = cells[ahead]
+            if char == WALL:
+                # boo
+                return robot
+            if char == BOX:
+                next_row.add(ahead)
+            elif char == LEFT_EDGE:
+                next_row |= {ahead, ahead + 1}
+            elif char == RIGHT_EDGE:
+                next_row |= {ahead - 1, ahead}
+        to_move.extend(next_row)
+        row = next_row
+    # farthest boxes first so nothing gets overwritten
+    for index in reversed(to_move):
+        cells[index + offset] = cells[index]
+        cells[index] = EMPTY
+    return robot + offset
+
+
+@jit.njit
+def moves_kernel(
+    cells: np.ndarray, robot: int, offsets: np.ndarray, moves: np.ndarray
 ) -> int:
-    x, y = robot
-    next_right = grid.get((x + 1, y))
-    if next_right is None:
-        # yay
-        return x + 1
-    if next_right == "#":
-        # boo
-        return x
-    if next_right == "O":
-        # it's a block
-        pretend_move = move_right(grid, (x + 1, y), dry_run=True)
-        if pretend_move == x + 1:
-            # can't move
-            return x
-        if not dry_run:
-            move_right(grid, (x + 1, y), False)
-            del grid[x + 1, y]
-            grid[x + 2, y] = "O"
-        return x + 1
-    if next_right == "[":
-        # look two more right and pretend the robot is there
-        pretend_move = move_right(grid, (x + 2, y), dry_run=True)
-        if pretend_move == x + 2:
-            # can't move
-            return x
-        if not dry_run:
-            move_right(grid, (x + 2, y), False)
-            # move the box
-            del grid[x + 2, y]
-            del grid[x + 1, y]
-            grid[x + 2, y] = "["
-            grid[x + 3, y] = "]"
-        return x + 1
-    raise ValueError("this should never happen")
-
-
-def move_up(
-    grid: dict[tuple[int, int], str],
-    robot: tuple[int, int],
-    dry_run: bool = False,
-) -> int:
-    x, y = robot
-    next_up = grid.get((x, y - 1))
-    if next_up is None:
-        # yay
-        return y - 1
-    if next_up == "#":
-        # boo
-        return y
-    if next_up == "O":
-        # it's a block
-        pretend_move = move_up(grid, (x, y - 1), dry_run=True)
-        if pretend_move == y - 1:
-            # can't move
-            return y
-        if not dry_run:
-            move_up(grid, (x, y - 1), False)
-            del grid[x, y - 1]
-            grid[x, y - 2] = "O"
-        return y - 1
-    if next_up == "[":
-        # left edge, check both that spot and one to its right
-        spaces_to_check = [(x, y - 1), (x + 1, y - 1)]
-    else:
-        assert next_up == "]"
-        spaces_to_check = [(x - 1, y - 1), (x, y - 1)]
-    if set(move_up(grid, space, True) for space in spaces_to_check) == {y - 2}:
-        # yay we can move
-        if not dry_run:
-            for (x1, y1), char in zip(spaces_to_check, "[]"):
-                move_up(grid, (x1, y1), False)
-                del grid[x1, y1]
-                grid[x1, y1 - 1] = char
-        return y - 1
-    return y
-
-
-def move_down(
-    grid: dict[tuple[int, int], str],
-    robot: tuple[int, int],
-    dry_run: bool = False,
-) -> int:
-    x, y = robot
-    next_down = grid.get((x, y + 1))
-    if next_down is None:
-        # yay
-        return y + 1
-    if next_down == "#":
-        # boo
-        return y
-    if next_down == "O":
-        # it's a block
-        pretend_move = move_down(grid, (x, y + 1), dry_run=True)
-        if pretend_move == y + 1:
-            # can't move
-            return y
-
-        if not dry_run:
-            move_down(grid, (x, y + 1), False)
-            del grid[x, y + 1]
-            grid[x, y + 2] = "O"
-        return y + 1
-    if next_down == "[":
-        # left edge, check both that spot and one to its right
-        spaces_to_check = [(x, y + 1), (x + 1, y + 1)]
-    else:
-        assert next_down == "]"
-        spaces_to_check = [(x - 1, y + 1), (x, y + 1)]
-    if set(move_down(grid, space, True) for space in spaces_to_check) == {y + 2}:
-        # yay we can move
-        if not dry_run:
-            for (x1, y1), char in zip(spaces_to_check, "[]"):
-                move_down(grid, (x1, y1), False)
-                del grid[x1, y1]
-                grid[x1, y1 + 1] = char
-        return y + 1
-    return y
-
-
-def gps_score(grid: dict[tuple[int, int]]) -> int:
-    return sum(
-        (x + 100 * y) for (x, y), char in grid.items() if char == "O" or char == "["
-    )
-
-
-def part_one(puzzle: str) -> int:
-    grid, robot, moves = parse_input(puzzle)
+    """make_move() for every move, over arrays only so numba can compile it.
+    Returns where the robot ends up."""
+    # which move last queued each square, so a big box pushed by two boxes
+    # only moves once
+    queued = np.full(cells.size, -1, dtype=np.int64)
+    to_move = np.empty(cells.size, dtype=np.int64)
+    for turn in range(moves.size):
+        move = moves[turn]
+        offset = offsets[move]
+        ahead = robot + offset
+        if cells[ahead] == EMPTY:
+            robot = ahead
+            continue
+        if cells[ahead] == WALL:
+            continue
+        if move == EAST or move == WEST:
+            end = ahead
+            while (
+                cells[end] == BOX or cells[end] == LEFT_EDGE or cells[end] == RIGHT_EDGE
+            ):
+                end += offset
+            if cells[end] == WALL:
+                continue
+            for index in range(end, ahead, -offset):
+                cells[index] = cells[index - offset]
+            cells[ahead] = EMPTY
+            robot = ahead
+            continue
+        # breadth first from the robot, so to_move goes a row at a time and
+        # moving it backwards starts with the farthest boxes
+        count = 0
+        head = -1
+        blocked = False
+        while head < count:
+            index = robot if head < 0 else to_move[head]
+            head += 1
+            square = index + offset
+            char = cells[square]
+            if char == WALL:
+                blocked = True
+                break
+            if char == EMPTY:
+                continue
+            width = 1 if char == BOX else 2
+            if char == RIGHT_EDGE:
+                square -= 1
+            for half in range(square, square + width):
+                if queued[half] != turn:
+                    queued[half] = turn
+                    to_move[count] = half
+                    count += 1
+        if blocked:
+            continue
+        for position in range(count - 1, -1, -1):
+            index = to_move[position]
+            cells[index + offset] = cells[index]
+            cells[index] = EMPTY
+        robot = ahead
+    return robot
+
+
+def gps_score(grid: Grid) -> int:
+    boxes = grid.find("O[")
+    return int((boxes % grid.width + 100 * (boxes // grid.width)).sum())
+
+
+def part_one_parsed(warehouse: tuple[Grid, int, tuple[int, ...]]) -> int:
+    grid, robot, moves = warehouse
+    grid = grid.copy()
+    box_count = len(grid.find("O"))
     for move in moves:
-        original_length = len(grid)
         robot = make_move(grid, robot, move)
-        assert len(grid) == original_length, "oh no, lost a piece"
-    display_grid(grid, robot)
+    assert len(grid.find("O")) == box_count, "oh no, lost a piece"
+    render.show(grid, {"@": robot}, "day15")
     return gps_score(grid)
 
 
-def part_two(puzzle: str) -> int:
-    grid, robot, moves = parse_input_p2(puzzle)
+def part_two_parsed(warehouse: tuple[Grid, int, tuple[int, ...]]) -> int:
+    grid, robot, moves = warehouse
+    # widening makes a new grid, so there's nothing to copy
+    grid, robot = widen(grid, robot)
     for move in moves:
         robot = make_move(grid, robot, move)
-    display_grid(grid, robot)
+    render.show(grid, {"@": robot}, "day15")
+    return gps_score(grid)
+
+
+@engine("part 1", "numba", available=jit.available)
+def part_one_numba(puzzle: str) -> int:
+    grid, robot, moves = parse_input(puzzle)
+    grid = grid.copy()
+    robot = moves_kernel(
+        grid.cells, robot, grid.offsets, np.array(moves, dtype=np.int64)
+    )
+    render.show(grid, {"@": robot}, "day15")
     return gps_score(grid)
 
 
-def display_grid(grid: dict[tuple[int, int], str], robot: tuple[int, int]):
-    min_x = min_y = 0
-    max_x, max_y = max(grid)
-    for y in range(min_y, max_y + 1):
-        for x in range(min_x, max_x + 1):
-            if (x, y) == robot:
-                print("@", end="")
-            else:
-                print(grid.get((x, y), "."), end="")
-        print("")
+@engine("part 2", "numba", available=jit.available)
+def part_two_numba(puzzle: str) -> int:
+    grid, robot, moves = parse_input(puzzle)
+    grid, robot = widen(grid, robot)
+    robot = moves_kernel(
+        grid.cells, robot, grid.offsets, np.array(moves, dtype=np.int64)
+    )
+    render.show(grid, {"@": robot}, "day15")
+    return gps_score(grid)
+
+
+def part_one(puzzle: str) -> int:
+    return part_one_parsed(parse_input(puzzle))
+
+
+def part_two(puzzle: str) -> int:
+    return part_two_parsed(parse_input(puzzle))
 
 
 def main():
@@ -1,8 +1,10 @@
-from itertools import permutations
 from pathlib import Path
-from typing import TypedDict
 
-import networkx
+import numpy as np
+
+from aoc import render
+from aoc.grid import DIRECTIONS, EAST, NORTH, SOUTH, WEST, Grid
+from aoc.search import dijkstra, on_shortest_paths
 
 TEST_INPUT = """###############
 #.......#....E#
@@ -21,93 +23,49 @@ TEST_INPUT = """###############
 ###############"""
 
 
-class CostDict(TypedDict):
-    cost: int
-
-
-def display_grid(graph: networkx.DiGraph, start: tuple[int, int], end: tuple[int, int]):
-    nodes = sorted((x, y) for (x, y, _, _) in graph.nodes)
-    min_x, min_y = nodes[0]
-    max_x, max_y = nodes[-1]
-    node_set = set(nodes)
-    for y in range(min_y - 1, max_y + 2):
-        for x in range(min_x - 1, max_x + 2):
-            if (x, y) not in node_set:
-                print("#", end="")
-            else:
-                if (x, y) == start:
-                    print("S", end="")
-                elif (x, y) == end:
-                    print("E", end="")
-                else:
-                    print(".", end="")
-        print("")
-
-
-def parse_input(
-    puzzle: str,
-) -> tuple[networkx.DiGraph, tuple[int, int], tuple[int, int]]:
-    graph = networkx.DiGraph()
-    lines = puzzle.splitlines()
-    start = ()
-    end = ()
-    for y, line in enumerate(lines):
-        for x, char in enumerate(line):
-            if char == "S":
-                start = (x, y)
-            if char == "E":
-                end = (x, y)
-                # don't add edges leaving this node
-                continue
-            if char == "#":
-                continue
-            # add edges representing each possible turn
-            for (dx1, dy1), (dx2, dy2) in permutations(
-                [(1, 0), (0, 1), (-1, 0), (0, -1)], 2
-            ):
-                graph.add_edge((x, y, dx1, dy1), (x, y, dx2, dy2), cost=1000)
-            for x1, y1 in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
-                if x1 >= 0 and y1 >= 0:
-                    dx = x1 - x
-                    dy = y1 - y
-                    try:
-                        if lines[y1][x1] != "#":
-                            graph.add_edge((x, y, dx, dy), (x1, y1, dx, dy), cost=1)
-                    except IndexError:
-                        continue
-    return graph, start, end
-
-
-def cost(
-    start: tuple[int, int, int, int],
-    end: tuple[int, int, int, int],
-    attrs: CostDict,
-) -> int:
-    return attrs["cost"]
+# the order the ends are checked in, which decides the answer when more than
+# one of them can be reached
+END_BEARINGS = [EAST, SOUTH, WEST, NORTH]
+
+
+def parse_input(puzzle: str) -> tuple[np.ndarray, np.ndarray, Grid, int, int]:
+    """Neighbor and cost tables where nodes are square * 4 + the direction the
+    reindeer is facing"""
+    grid = Grid.from_str(puzzle)
+    start = grid.find_one("S")
+    end = grid.find_one("E")
+    open_cells = ~grid.mask("#")
+    # don't add edges leaving the end
+    leaving = open_cells.copy()
+    leaving[end] = False
+    squares = np.arange(grid.size)[:, None]
+    directions = np.arange(4)[None, :]
+    neighbors = np.full((grid.size, 4, 4), -1, dtype=np.int64)
+    # the first three edges turn to each other direction, the last one moves
+    for turn in range(1, 4):
+        neighbors[:, :, turn - 1] = squares * 4 + (directions + turn) % 4
+    moves = leaving[None, :] & open_cells[grid.step_targets] & grid.can_step
+    neighbors[:, :, 3] = np.where(moves, grid.step_targets * 4 + directions.T, -1).T
+    neighbors[~leaving] = -1
+    costs = np.broadcast_to(np.array([1000, 1000, 1000, 1]), neighbors.shape)
+    return neighbors.reshape(-1, 4), costs.reshape(-1, 4), grid, start, end
 
 
 def run_puzzle(puzzle: str) -> tuple[int, int]:
-    graph, start, end = parse_input(puzzle)
-    display_grid(graph, start, end)
-    x_start, y_start = start
-    x_end, y_end = end
+    neighbors, costs, grid, start, end = parse_input(puzzle)
+    render.show(grid, name="day16")
+    scores = dijkstra(neighbors, costs, start * 4 + EAST)
     best_score = 10000000000000000000000000000
-    for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
-        try:
-            score = networkx.shortest_path_length(
-                graph, (x_start, y_start, 1, 0), (x_end, y_end, dx, dy), weight=cost
-            )
-        except (networkx.exception.NodeNotFound, networkx.exception.NetworkXNoPath):
-            print(f"no way to enter the end using direction {dx}, {dy}")
+    for direction in END_BEARINGS:
+        score = int(scores[end * 4 + direction])
+        if score < 0:
+            print(f"no way to enter the end using direction {DIRECTIONS[direction]}")
         else:
             if score < best_score:
                 print("new winner", score)
             best_score = score
-            nodes_hit = set()
-            for path in networkx.all_shortest_paths(
-                graph, (x_start, y_start, 1, 0), (x_end, y_end, dx, dy), weight=cost
-            ):
-                nodes_hit |= {(x, y) for (x, y, _, _) in path}
+            on_path = on_shortest_paths(neighbors, costs, scores, end * 4 + direction)
+            nodes_hit = set(np.flatnonzero(on_path.reshape(-1, 4).any(axis=1)))
 
     return best_score, len(nodes_hit)
 
@@ -1,5 +1,12 @@
 from pathlib import Path
 
+from aoc import counters, jit
+from aoc.engines import engine
+from aoc.lazy import lazy_import
+
+# only the numba engine needs numpy
+np = lazy_import("numpy")
+
 TEST_INPUT = """Register A: 729
 Register B: 0
 Register C: 0
@@ -66,12 +73,16 @@ class CPU:
         )
 
     def run(self) -> list[int]:
+        executed = 0
         while True:
             try:
                 instruction = self.program[self.instruction_pointer]
                 operand = self.program[self.instruction_pointer + 1]
             except IndexError:
+                if counters.ENABLED:
+                    counters.add("day17.instructions", executed)
                 return self.outputs
+            executed += 1
             match instruction:
                 case 0:
                     self.adv(operand)
@@ -134,6 +145,94 @@ class CPU:
         return output
 
 
+# numba's registers are 64 bits, so anything bigger stays in Python
+WIDEST_REGISTER = 2**63 - 1
+
+
+@jit.njit
+def run_kernel(program: "np.ndarray", a: int, b: int, c: int) -> list[int]:
+    """CPU.run() over an array and three ints, so numba can compile it"""
+    outputs = []
+    instruction_pointer = 0
+    while instruction_pointer + 1 < program.size:
+        instruction = program[instruction_pointer]
+        operand = program[instruction_pointer + 1]
+        combo = operand
+        if operand == 4:
+            combo = a
+        elif operand == 5:
+            combo = b
+        elif operand == 6:
+            combo = c
+        # dividing by 2 ** combo, without the shift overflowing
+        shifted = a >> combo if combo < 64 else 0
+        if instruction == 0:
+            a = shifted
+        elif instruction == 1:
+            b = b ^ operand
+        elif instruction == 2:
+            b = combo % 8
+        elif instruction == 3 and a != 0:
+            instruction_pointer = operand - 2
+        elif instruction == 4:
+            b = b ^ c
+        elif instruction == 5:
+            outputs.append(combo % 8)
+        elif instruction == 6:
+            b = shifted
+        elif instruction == 7:
+            c = shifted
+        instruction_pointer += 2
+    return outputs
+
+
+def fits_kernel(cpu: CPU) -> bool:
+    return max(cpu.registers.values()) <= WIDEST_REGISTER
+
+
+def lowest_quine(candidates: list[int]) -> int:
+    """The smallest A that makes the program output itself. Both engines fail
+    the same way when there isn't one, so check can compare them."""
+    if not candidates:
+        raise ValueError("no quine found")
+    return min(candidates)
+
+
+@engine("part 1", "numba", available=jit.available)
+def part_one_numba(puzzle: str) -> list[int]:
+    cpu = CPU(puzzle)
+    if not fits_kernel(cpu):
+        return cpu.run()
+    registers = cpu.registers
+    outputs = run_kernel(
+        np.array(cpu.program, dtype=np.int64),
+        registers["A"],
+        registers["B"],
+        registers["C"],
+    )
+    return [int(output) for output in outputs]
+
+
+@engine("part 2", "numba", available=jit.available)
+def part_two_numba(puzzle: str) -> int:
+    """part_two()'s search, running each candidate through the kernel"""
+    cpu = CPU(puzzle)
+    program = np.array(cpu.program, dtype=np.int64)
+    registers = cpu.registers
+    candidates = []
+    values_to_check = [(1, 0)]
+    for depth, initial_a in values_to_check:
+        for a in range(initial_a, initial_a + 8):
+            if a > WIDEST_REGISTER:
+                break
+            outputs = run_kernel(program, a, registers["B"], registers["C"])
+            if outputs == cpu.program[-depth:]:
+                values_to_check += [(depth + 1, a * 8)]
+                if depth == len(cpu.program):
+                    candidates.append(a)
+    return lowest_quine(candidates)
+
+
 def part_one(puzzle: str) -> str:
     cpu = CPU(puzzle=puzzle)
     print("---")
@@ -166,7 +265,7 @@ def part_two(puzzle: str) -> int:
                 if depth == output_length:
                     # yay we got the whole program out
                     candidates.append(a)
-    return min(candidates)
+    return lowest_quine(candidates)
 
 
 def main():
@@ -1,6 +1,7 @@
 from pathlib import Path
 
-import networkx
+from aoc.grid import Grid
+from aoc.search import bfs, open_neighbors
 
 TEST_INPUT = """5,4
 4,2
@@ -29,36 +30,23 @@ TEST_INPUT = """5,4
 2,0"""
 
 
-def part_one(puzzle: str, turns: int = 1024) -> int:
-    max_x = max_y = 6 if puzzle == TEST_INPUT else 70
-    grid = networkx.Graph()
-    corrupted_blocks = set()
+def part_one(puzzle: str, turns: int = 1024, size: int | None = None) -> int:
+    if size is None:
+        size = 6 if puzzle == TEST_INPUT else 70
+    grid = Grid.blank(size + 1, size + 1)
     for line in puzzle.splitlines()[:turns]:
         x, y = line.split(",")
-        corrupted_blocks.add((int(x), int(y)))
+        grid.array[int(y), int(x)] = ord("#")
 
     if puzzle == TEST_INPUT:
-        assert (4, 2) in corrupted_blocks, corrupted_blocks
-    for y in range(max_y + 1):
-        for x in range(max_x + 1):
-            if (x, y) in corrupted_blocks:
-                continue
-            for x1, y1 in [
-                (x + 1, y),
-                (x - 1, y),
-                (x, y + 1),
-                (x, y - 1),
-            ]:
-                if (
-                    0 <= x1 <= max_x
-                    and 0 <= y1 <= max_y
-                    and (x1, y1) not in corrupted_blocks
-                ):
-                    grid.add_edge((x, y), (x1, y1))
-    return networkx.shortest_path_length(grid, (0, 0), (max_x, max_y))
+        assert grid.array[2, 4] == ord("#"), grid
+    distances = bfs(open_neighbors(grid, grid.cells == ord(".")), 0)
+    if distances[-1] < 0:
+        raise NoPathError(f"No way to reach {size},{size}")
+    return int(distances[-1])
 
 
-def part_two(puzzle: str) -> str:
+def part_two(puzzle: str, size: int | None = None) -> str:
     lines = puzzle.splitlines()
     start = 0
     end = len(lines)
@@ -67,8 +55,8 @@ def part_two(puzzle: str) -> str:
         # do a rough bisecting search
         turns = (end - start) // 2 + start
         try:
-            part_one(puzzle, turns=turns)
-        except networkx.exception.NetworkXNoPath:
+            part_one(puzzle, turns=turns, size=size)
+        except NoPathError:
             # didn't make it. that means the end of the search region is here
             end = turns
             if end == start:
@@ -90,5 +78,9 @@ def main():
     print(part_two(puzzle))
 
 
+class NoPathError(Exception):
+    pass
+
+
 if __name__ == "__main__":
     main()
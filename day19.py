@@ -1,6 +1,10 @@
-from functools import lru_cache
+from functools import partial
 from pathlib import Path
 
+from aoc import workers
+from aoc.engines import engine
+from aoc.memo import memoize
+
 TEST_INPUT = """r, wr, b, g, bwu, rb, gb, br
 
 brwrr
@@ -20,7 +24,9 @@ def parse_input(puzzle: str) -> tuple[frozenset[str], list[str]]:
     return towels, combos
 
 
-@lru_cache(maxsize=None)
+# the towels are the same all the way through a puzzle, so they scope the cache
+# rather than being hashed into every key
+@memoize(scope="towels")
 def is_possible(
     pattern: str,
     towels: frozenset[str],
@@ -31,12 +37,14 @@ def is_possible(
         if len(towel) > len(pattern):
             continue
         if pattern.startswith(towel):
-            if is_possible(pattern[len(towel) :], towels=towels):
+            if is_possible(pattern[len(towel) :], towels):
                 return True
     return False
 
 
-@lru_cache(maxsize=None)
+# the towels are the same all the way through a puzzle, so they scope the cache
+# rather than being hashed into every key
+@memoize(scope="towels")
 def possible_combos(pattern: str, towels: frozenset[str]) -> int:
     options = 0
     if not pattern:
@@ -46,19 +54,39 @@ def possible_combos(pattern: str, towels: frozenset[str]) -> int:
         if len(towel) > len(pattern):
             continue
         if pattern.startswith(towel):
-            if result := possible_combos(pattern[len(towel) :], towels=towels):
+            if result := possible_combos(pattern[len(towel) :], towels):
                 options += result
     return options
 
 
+def count_possible(towels: frozenset[str], combos: list[str]) -> int:
+    return sum(is_possible(combination, towels) for combination in combos)
+
+
+def count_combos(towels: frozenset[str], combos: list[str]) -> int:
+    return sum(possible_combos(combination, towels) for combination in combos)
+
+
 def part_one(puzzle: str) -> int:
     towels, combos = parse_input(puzzle)
-    return sum(is_possible(combination, towels=towels) for combination in combos)
+    # each design is independent of the others
+    return sum(workers.map_chunks(partial(count_possible, towels), combos))
 
 
 def part_two(puzzle: str) -> int:
     towels, combos = parse_input(puzzle)
-    return sum(possible_combos(combination, towels=towels) for combination in combos)
+    return sum(workers.map_chunks(partial(count_combos, towels), combos))
+
+
+@engine(
+    "part 2",
+    "parallel",
+    min_size=workers.MIN_PARALLEL_SIZE,
+    available=workers.can_help,
+)
+def part_two_parallel(puzzle: str) -> int:
+    with workers.using():
+        return part_two(puzzle)
 
 
 def main():
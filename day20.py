@@ -1,6 +1,10 @@
 from pathlib import Path
 
-import networkx
+import numpy as np
+
+from aoc import render
+from aoc.grid import Grid, shift
+from aoc.search import bfs, on_shortest_paths, open_neighbors
 
 TEST_INPUT = """###############
 #...#...#.....#
@@ -19,60 +23,10 @@ TEST_INPUT = """###############
 ###############"""
 
 
-def display_grid(graph: networkx.Graph, start: tuple[int, int], end: tuple[int, int]):
-    nodes = sorted(graph.nodes)
-    (min_x, *_, max_x) = sorted(x for (x, _) in nodes)
-    (min_y, *_, max_y) = sorted(y for (_, y) in nodes)
-    node_set = set(nodes)
-    for y in range(min_y - 1, max_y + 2):
-        for x in range(min_x - 1, max_x + 2):
-            if (x, y) not in node_set:
-                print("#", end="")
-            else:
-                if (x, y) == start:
-                    print("S", end="")
-                elif (x, y) == end:
-                    print("E", end="")
-                else:
-                    print(".", end="")
-        print("")
-
-
-def parse_input(
-    puzzle: str,
-) -> tuple[networkx.Graph, tuple[int, int], tuple[int, int]]:
-    graph = networkx.Graph()
-    lines = puzzle.splitlines()
-    start = ()
-    end = ()
-    for y, line in enumerate(lines):
-        for x, char in enumerate(line):
-            if char == "S":
-                start = (x, y)
-            if char == "E":
-                end = (x, y)
-                # don't add edges leaving this node
-                continue
-            if char == "#":
-                continue
-            for x1, y1 in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
-                if x1 >= 0 and y1 >= 0:
-                    try:
-                        if lines[y1][x1] != "#":
-                            graph.add_edge((x, y), (x1, y1))
-                    except IndexError:
-                        continue
-    return graph, start, end
-
-
-def run_race(
-    graph: networkx.Graph, start: tuple[int, int], end: tuple[int, int]
-) -> int:
-    x_start, y_start = start
-    x_end, y_end = end
-    score = networkx.shortest_path_length(graph, (x_start, y_start), (x_end, y_end))
-
-    return score
+def parse_input(puzzle: str) -> tuple[np.ndarray, Grid, int, int]:
+    grid = Grid.from_str(puzzle)
+    neighbors = open_neighbors(grid, ~grid.mask("#"))
+    return neighbors, grid, grid.find_one("S"), grid.find_one("E")
 
 
 def manhattan_circle(x: int, y: int, radius: int):
@@ -84,51 +38,46 @@ def manhattan_circle(x: int, y: int, radius: int):
         yield tuple(x + y for x, y in zip((x, y), d))
 
 
-def cheat_within_circle(
-    position: tuple[int, int],
-    threshold: int,
-    path: dict[tuple[int, int], int],
-    start_index: int,
-    radius: int,
-) -> bool:
-    try:
-        return path[position] - start_index - radius >= threshold
-    except KeyError:
-        return False
-
-
-def part_one(puzzle: str, threshold: int = 100) -> int:
-    graph, start, end = parse_input(puzzle)
-    display_grid(graph, start, end)
-    base_result = run_race(graph, start, end)
+def race_distances(puzzle: str) -> np.ndarray:
+    """2D array of how far along the track each square is, -1 for walls"""
+    neighbors, grid, start, end = parse_input(puzzle)
+    distances = bfs(neighbors, start)
+    render.show(grid, name="day20")
     if puzzle == TEST_INPUT:
+        base_result = int(distances[end])
         assert base_result == 84, base_result
-    raw_path = networkx.shortest_path(graph, start, end)
-    path = {point: index for index, point in enumerate(raw_path)}
+    # only squares on the way to the end count as track
+    on_track = on_shortest_paths(neighbors, 1, distances, end)
+    distances[~on_track] = -1
+    return distances.reshape(grid.height, grid.width)
+
+
+def cheats_within_circle(distances: np.ndarray, radius: int, threshold: int) -> int:
+    """How many cheats of exactly this length save at least threshold"""
     saves_enough = 0
-    radius = 2
-    for index, (x, y) in enumerate(raw_path):
-        for position in manhattan_circle(x, y, radius):
-            if cheat_within_circle(position, threshold, path, index, radius):
-                saves_enough += 1
+    on_track = distances >= 0
+    for dx, dy in manhattan_circle(0, 0, radius):
+        # shift() fills with 0 off the edge, and a cheat back to the start never
+        # saves anything, so that can't be mistaken for a shortcut
+        landing = shift(distances, dx, dy)
+        saves_enough += int(
+            (on_track & (landing - distances - radius >= threshold)).sum()
+        )
     return saves_enough
 
 
+def part_one(puzzle: str, threshold: int = 100) -> int:
+    distances = race_distances(puzzle)
+    return cheats_within_circle(distances, 2, threshold)
+
+
 def part_two(puzzle: str, threshold: int = 100) -> int:
-    graph, start, end = parse_input(puzzle)
-    base_result = run_race(graph, start, end)
-    if puzzle == TEST_INPUT:
-        assert base_result == 84, base_result
-    raw_path = networkx.shortest_path(graph, start, end)
-    path = {point: index for index, point in enumerate(raw_path)}
-    saves_enough = 0
+    distances = race_distances(puzzle)
     max_radius = 20
-    for index, (x, y) in enumerate(raw_path):
-        for radius in range(2, max_radius + 1):
-            for position in manhattan_circle(x, y, radius):
-                if cheat_within_circle(position, threshold, path, index, radius):
-                    saves_enough += 1
-    return saves_enough
+    return sum(
+        cheats_within_circle(distances, radius, threshold)
+        for radius in range(2, max_radius + 1)
+    )
 
 
 def main():
@@ -1,8 +1,10 @@
 from collections import deque
-from functools import lru_cache
+from functools import partial
 from itertools import pairwise
 from pathlib import Path
 
+from aoc import counters, workers
+from aoc.memo import memoize
 
 TEST_INPUT = """029A
 980A
@@ -38,8 +40,10 @@ def bfs(a: str, b: str, keypad: dict[str, list[tuple[str, str]]]) -> list[str]:
     seen = {a}
     shortest = None
     result = []
+    pops = 0
     while q:
         current_button, path = q.popleft()
+        pops += 1
         if current_button == b:
             if shortest is None:
                 shortest = len(path)
@@ -51,10 +55,12 @@ def bfs(a: str, b: str, keypad: dict[str, list[tuple[str, str]]]) -> list[str]:
         for neighbor, direction in keypad[current_button]:
             seen.add(neighbor)
             q.append((neighbor, path + [direction]))
+    if counters.ENABLED:
+        counters.add("day21.bfs.pops", pops)
     return result
 
 
-@lru_cache(maxsize=None)
+@memoize()
 def dfs(code: str, number_of_robots: int, keypad_index: int = 0) -> int:
     keypad = keypads[keypad_index]
     result = 0
@@ -68,17 +74,21 @@ def dfs(code: str, number_of_robots: int, keypad_index: int = 0) -> int:
     return result
 
 
-def part_one(puzzle: str) -> int:
-    codes = puzzle.splitlines()
+def complexity(number_of_robots: int, codes: list[str]) -> int:
     score = 0
     for code in codes:
-        result = dfs(code, 2)
+        result = dfs(code, number_of_robots)
         score += result * int(code[:-1])
     return score
 
 
+def part_one(puzzle: str) -> int:
+    # each code is independent of the others
+    return sum(workers.map_chunks(partial(complexity, 2), puzzle.splitlines()))
+
+
 def part_two(puzzle: str) -> int:
-    return sum(dfs(code, 25) * int(code[:-1]) for code in puzzle.splitlines())
+    return sum(workers.map_chunks(partial(complexity, 25), puzzle.splitlines()))
 
 
 def main():
@@ -1,6 +1,13 @@
 from collections import deque, defaultdict
 from pathlib import Path
+from typing import Iterable
 
+import numpy as np
+
+from aoc import jit, workers
+from aoc.engines import engine
+from aoc.inputs import InputBuffer
+from aoc.parsing import ints
 
 EXAMPLE_INPUT = 123
 
@@ -47,12 +54,81 @@ def calculate_price(secret: int) -> int:
 
 
 def run_puzzle(puzzle: str) -> tuple[int, int]:
+    return run_buyers(ints(puzzle).tolist())
+
+
+@engine(
+    "parts 1+2",
+    "parallel",
+    min_size=workers.MIN_PARALLEL_SIZE,
+    available=workers.can_help,
+)
+def run_puzzle_parallel(puzzle: str) -> tuple[int, int]:
+    with workers.using():
+        return run_puzzle(puzzle)
+
+
+@jit.njit
+def buyers_kernel(secrets: np.ndarray) -> tuple[int, int]:
+    """buyer_totals() over arrays only, so numba can compile it. A sequence of
+    four changes, each from -9 to 9, is a number in base 19 that indexes the
+    bananas it would get."""
+    bananas = np.zeros(19**4, dtype=np.int64)
+    # which buyer last sold at each sequence, since only the first sale counts
+    sold_by = np.full(19**4, -1, dtype=np.int64)
+    part_one_result = 0
+    for buyer in range(secrets.size):
+        secret = secrets[buyer]
+        ones = secret % 10
+        sequence = 0
+        for turn in range(2000):
+            # calculate_price(), with the mixing and pruning done inline
+            secret = (secret ^ (secret * 64)) % 16777216
+            secret = (secret ^ (secret // 32)) % 16777216
+            secret = (secret ^ (secret * 2048)) % 16777216
+            next_ones = secret % 10
+            # drop the oldest change and shift the new one in
+            sequence = (sequence * 19 + next_ones - ones + 9) % 19**4
+            if turn > 3 and sold_by[sequence] != buyer:
+                sold_by[sequence] = buyer
+                bananas[sequence] += next_ones
+            ones = next_ones
+        part_one_result += secret
+    return part_one_result, bananas.max()
+
+
+@engine("parts 1+2", "numba", available=jit.available)
+def run_puzzle_numba(puzzle: str) -> tuple[int, int]:
+    part_one_result, part_two_result = buyers_kernel(ints(puzzle).astype(np.int64))
+    return int(part_one_result), int(part_two_result)
+
+
+def run_puzzle_stream(buffer: InputBuffer) -> tuple[int, int]:
+    return run_buyers(int(line) for line in buffer.lines() if line)
+
+
+def run_buyers(secrets: Iterable[int]) -> tuple[int, int]:
+    # every buyer is independent, so their totals can be worked out separately
+    # and added up at the end
+    part_one_result = 0
+    part_two_result: dict[tuple[int, int, int, int], int] = defaultdict(int)
+    for final_secrets, bananas in workers.map_chunks(buyer_totals, secrets):
+        part_one_result += final_secrets
+        for changes, total in bananas.items():
+            part_two_result[changes] += total
+    return part_one_result, max(part_two_result.values())
+
+
+def buyer_totals(
+    secrets: Iterable[int],
+) -> tuple[int, dict[tuple[int, int, int, int], int]]:
+    """The sum of the buyers' 2000th secrets, and the bananas each sequence of
+    changes would get from them"""
     part_two_result: dict[tuple[int, int, int, int], int] = defaultdict(int)
     part_one_result = 0
-    for line in puzzle.splitlines():
+    for secret in secrets:
         consecutives: dict[tuple[int, int], int] = {}
-        secret = int(line)
-        ones = int(line) % 10
+        ones = secret % 10
         my_changes = deque(maxlen=4)
         for turn in range(2000):
             next_secret = calculate_price(secret)
@@ -65,7 +141,7 @@ def run_puzzle(puzzle: str) -> tuple[int, int]:
         for changes, bananas in consecutives.items():
             part_two_result[changes] += bananas
         part_one_result += secret
-    return part_one_result, max(part_two_result.values())
+    return part_one_result, part_two_result
 
 
 def main():
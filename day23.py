@@ -1,7 +1,9 @@
 from itertools import combinations
 from pathlib import Path
 
-import networkx
+from aoc.lazy import lazy_import
+
+networkx = lazy_import("networkx")
 
 
 TEST_INPUT = """kh-tc
@@ -38,7 +40,7 @@ tb-vc
 td-yn"""
 
 
-def parse_input(puzzle: str) -> networkx.Graph:
+def parse_input(puzzle: str) -> "networkx.Graph":
     graph = networkx.Graph()
     for line in puzzle.splitlines():
         a, b = line.split("-")
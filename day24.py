@@ -60,29 +60,40 @@ tgd XOR rvg -> z12
 tnw OR pbm -> gnj"""
 
 
-def part_one(puzzle: str) -> int:
+Gate = tuple[str, str, str, str]
+# the preset wires with their values, and the gates
+Circuit = tuple[tuple[tuple[str, int], ...], tuple[Gate, ...]]
+
+
+def parse_input(puzzle: str) -> Circuit:
+    """Each gate is (input, operation, input, output)"""
     presets, conditionals = puzzle.split("\n\n")
-    nodes: dict[str, int] = {}
+    wires = []
     for line in presets.splitlines():
         node, value = line.split(": ")
-        nodes[node] = int(value)
+        wires.append((node, int(value)))
+    gates = []
+    for line in conditionals.splitlines():
+        node1, op, node2, _, dest = line.split()
+        gates.append((node1, op, node2, dest))
+    return tuple(wires), tuple(gates)
+
+
+def part_one_parsed(circuit: Circuit) -> int:
+    presets, gates = circuit
+    nodes: dict[str, int] = dict(presets)
 
     nodes_set_this_round = True
     while nodes_set_this_round:
         nodes_set_this_round = False
-        for line in conditionals.splitlines():
-            expr = line.split()
-            node1 = expr[0]
-            node2 = expr[2]
-            dest = expr[4]
-
+        for node1, op, node2, dest in gates:
             if (
                 dest not in nodes
                 and (a := nodes.get(node1)) is not None
                 and (b := nodes.get(node2)) is not None
             ):
                 # we can go ahead and resolve it
-                match (expr[1]):
+                match op:
                     case "AND":
                         nodes[dest] = a & b
                     case "OR":
@@ -90,7 +101,7 @@ def part_one(puzzle: str) -> int:
                     case "XOR":
                         nodes[dest] = a ^ b
                     case _:
-                        raise ValueError(f"Unknown expr {line}")
+                        raise ValueError(f"Unknown expr {node1} {op} {node2} -> {dest}")
                 nodes_set_this_round = True
     z_nodes = sorted(
         ((key, val) for (key, val) in nodes.items() if key.startswith("z")),
@@ -101,18 +112,10 @@ def part_one(puzzle: str) -> int:
     return result
 
 
-def part_two(puzzle: str) -> str:
-    operations = []
+def part_two_parsed(circuit: Circuit) -> str:
+    _, operations = circuit
     highest_z = "z00"
-    presets, conditionals = puzzle.split("\n\n")
-    nodes: dict[str, int] = {}
-    for line in presets.splitlines():
-        node, value = line.split(": ")
-        nodes[node] = int(value)
-
-    for line in conditionals.splitlines():
-        node1, op, node2, _, dest = line.split()
-        operations.append((node1, op, node2, dest))
+    for _, _, _, dest in operations:
         if dest[0] == "z" and int(dest[1:]) > int(highest_z[1:]):
             highest_z = dest
 
@@ -145,6 +148,14 @@ def part_two(puzzle: str) -> str:
     return ",".join(sorted(wrong))
 
 
+def part_one(puzzle: str) -> int:
+    return part_one_parsed(parse_input(puzzle))
+
+
+def part_two(puzzle: str) -> str:
+    return part_two_parsed(parse_input(puzzle))
+
+
 def main():
     assert (part_one_result := part_one(SMALL_INPUT)) == 4, part_one_result
     assert (part_one_result := part_one(TEST_INPUT)) == 2024, part_one_result
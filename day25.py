@@ -1,6 +1,9 @@
 """Day 25: lock picking"""
 
 from pathlib import Path
+from typing import Iterable
+
+from aoc.inputs import InputBuffer
 
 TEST_INPUT = """#####
 .####
@@ -43,23 +46,24 @@ TEST_INPUT = """#####
 #####"""
 
 
+def parse_group(group: str) -> tuple[bool, list[int]]:
+    lines = [list(line) for line in group.splitlines()]
+    is_lock = set(lines[0]) == {"#"}
+    max_reaches = []
+    for x in range(len(lines[0])):
+        iter = range(len(lines))
+        max_y = 0
+        for y in iter:
+            if lines[y][x] == ("#" if is_lock else "."):
+                max_y = y
+            else:
+                max_reaches.append(max_y)
+                break
+    return is_lock, max_reaches
+
+
 def parse_input(puzzle: str) -> list[tuple[bool, list[int]]]:
-    groups = []
-    for group in puzzle.split("\n\n"):
-        lines = [list(line) for line in group.splitlines()]
-        is_lock = set(lines[0]) == {"#"}
-        max_reaches = []
-        for x in range(len(lines[0])):
-            iter = range(len(lines))
-            max_y = 0
-            for y in iter:
-                if lines[y][x] == ("#" if is_lock else "."):
-                    max_y = y
-                else:
-                    max_reaches.append(max_y)
-                    break
-        groups.append((is_lock, max_reaches))
-    return groups
+    return [parse_group(group) for group in puzzle.split("\n\n")]
 
 
 def is_candidate(lock: list[list[int]], key: list[list[int]]) -> bool:
@@ -67,7 +71,16 @@ def is_candidate(lock: list[list[int]], key: list[list[int]]) -> bool:
 
 
 def part_one(puzzle: str) -> int:
-    groups = parse_input(puzzle)
+    return count_candidates(parse_input(puzzle))
+
+
+def part_one_stream(buffer: InputBuffer) -> int:
+    # the text of each schematic is thrown away as soon as it's been measured
+    return count_candidates(parse_group(record.decode()) for record in buffer.records())
+
+
+def count_candidates(groups: Iterable[tuple[bool, list[int]]]) -> int:
+    groups = list(groups)
     locks = [group for is_lock, group in groups if is_lock]
     keys = [group for is_lock, group in groups if not is_lock]
     candidates = sum(is_candidate(lock, key) for key in keys for lock in locks)
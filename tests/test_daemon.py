@@ -0,0 +1,11 @@
+import sys
+
+from aoc import lazy
+from aoc.daemon import SolverServer
+
+
+def test_server_has_nothing_left_to_import(tmp_path):
+    with SolverServer(tmp_path / "aoc.sock"):
+        assert lazy.pending() == []
+        assert "networkx" in sys.modules
+        assert "PIL.Image" in sys.modules
@@ -0,0 +1,22 @@
+from aoc.memo import memoize
+
+
+def test_tuple_argument_and_separate_arguments_are_different_calls():
+    @memoize(name="test_memo.pair")
+    def pair(*args):
+        return len(args)
+
+    assert pair(1, 2) == 2
+    assert pair((1, 2)) == 1
+    assert pair.cache_info().misses == 2
+
+
+def test_scoped_tuple_argument_and_separate_arguments_are_different_calls():
+    @memoize(name="test_memo.scoped", scope="scope")
+    def scoped(scope, *args):
+        return len(args)
+
+    scope = object()
+    assert scoped(scope, 1, 2) == 2
+    assert scoped(scope, (1, 2)) == 1
+    assert scoped.cache_info().misses == 2
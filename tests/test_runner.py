@@ -0,0 +1,9 @@
+from aoc.runner import InputSource, run_day
+
+
+def test_run_day_skips_phases_that_write_files(tmp_path, monkeypatch):
+    # day 14 part two saves a PNG per turn into the current directory
+    monkeypatch.chdir(tmp_path)
+    measurements = run_day(14, InputSource(use_example=True))
+    assert [result.phase for result in measurements] == ["parse", "part 1"]
+    assert not list(tmp_path.iterdir())
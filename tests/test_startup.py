@@ -0,0 +1,9 @@
+import pytest
+
+from aoc.startup import DEFAULT_BUDGET, import_report
+
+
+@pytest.mark.parametrize("day", range(1, 26))
+def test_day_imports_within_budget(day):
+    report = import_report(day)
+    assert report.cumulative <= DEFAULT_BUDGET, report.heaviest